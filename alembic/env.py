@@ -8,6 +8,8 @@ from app.database import Base
 
 from app.models.loan import Loan
 from app.models.amortization_schedule import AmortizationSchedule
+from app.models.rate_index import RateIndex, RateIndexValue
+from app.models.payment import Payment
 
 config = context.config
 
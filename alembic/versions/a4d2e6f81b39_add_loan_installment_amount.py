@@ -0,0 +1,51 @@
+"""Add loan installment amount
+
+Revision ID: a4d2e6f81b39
+Revises: f3c61d8e2a57
+Create Date: 2026-10-17 18:42:10.517203
+
+"""
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d2e6f81b39'
+down_revision: Union[str, Sequence[str], None] = 'f3c61d8e2a57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CENT = Decimal("0.01")
+
+
+def _installment(principal, annual_rate, months, insurance_monthly) -> Decimal:
+    P = Decimal(str(principal))
+    r = Decimal(str(annual_rate)) / 100 / 12
+    if r == 0:
+        base_payment = (P / months).quantize(CENT, ROUND_HALF_UP)
+    else:
+        base_payment = (P * (r * (1 + r) ** months) / ((1 + r) ** months - 1)).quantize(CENT, ROUND_HALF_UP)
+    return (base_payment + Decimal(str(insurance_monthly or 0))).quantize(CENT, ROUND_HALF_UP)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('loans', sa.Column('installment_amount', sa.Numeric(precision=19, scale=2), nullable=True))
+
+    bind = op.get_bind()
+    loans = bind.execute(sa.text(
+        "SELECT id, principal, annual_rate, months, insurance_monthly FROM loans WHERE months > 0"
+    )).fetchall()
+    if loans:
+        bind.execute(
+            sa.text("UPDATE loans SET installment_amount = :installment_amount WHERE id = :id"),
+            [{"id": row.id, "installment_amount": _installment(*row[1:])} for row in loans]
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('loans', 'installment_amount')
@@ -0,0 +1,51 @@
+"""Add payments
+
+Revision ID: b8e41c7d5f20
+Revises: a4d2e6f81b39
+Create Date: 2026-10-17 20:05:47.118362
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e41c7d5f20'
+down_revision: Union[str, Sequence[str], None] = 'a4d2e6f81b39'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('amortization_schedule', sa.Column('paid_amount', sa.Numeric(precision=19, scale=2), server_default='0', nullable=False))
+    op.create_table('payments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('loan_id', sa.Integer(), nullable=False),
+    sa.Column('amortization_schedule_id', sa.Integer(), nullable=True),
+    sa.Column('reference', sa.String(length=100), nullable=False),
+    sa.Column('payment_date', sa.Date(), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=19, scale=2), nullable=False),
+    sa.Column('applied_amount', sa.Numeric(precision=19, scale=2), server_default='0', nullable=False),
+    sa.Column('status', sa.String(length=50), server_default='received', nullable=False),
+    sa.Column('ingestion_id', sa.String(length=36), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['amortization_schedule_id'], ['amortization_schedule.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['loan_id'], ['loans.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('reference')
+    )
+    op.create_index(op.f('ix_payments_id'), 'payments', ['id'], unique=False)
+    op.create_index('ix_payments_ingestion_id', 'payments', ['ingestion_id'], unique=False)
+    op.create_index('ix_payments_loan_id_payment_date', 'payments', ['loan_id', 'payment_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_payments_loan_id_payment_date', table_name='payments')
+    op.drop_index('ix_payments_ingestion_id', table_name='payments')
+    op.drop_index(op.f('ix_payments_id'), table_name='payments')
+    op.drop_table('payments')
+    op.drop_column('amortization_schedule', 'paid_amount')
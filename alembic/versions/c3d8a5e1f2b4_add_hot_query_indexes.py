@@ -0,0 +1,47 @@
+"""Add hot query indexes
+
+Revision ID: c3d8a5e1f2b4
+Revises: 4bfb41112b1d
+Create Date: 2026-10-17 09:12:41.503218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d8a5e1f2b4'
+down_revision: Union[str, Sequence[str], None] = '4bfb41112b1d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UNPAID_CONDITION = sa.text("status IN ('pending', 'partial', 'overdue')")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_amortization_schedule_loan_id_payment_number', 'amortization_schedule', ['loan_id', 'payment_number'], unique=True)
+    op.create_index('ix_amortization_schedule_loan_id_status_due_date', 'amortization_schedule', ['loan_id', 'status', 'due_date'], unique=False)
+    op.create_index(
+        'ix_amortization_schedule_unpaid_due_date',
+        'amortization_schedule',
+        ['due_date', 'loan_id'],
+        unique=False,
+        postgresql_where=UNPAID_CONDITION,
+        sqlite_where=UNPAID_CONDITION
+    )
+    op.create_index('ix_loans_user_id_is_deleted_status', 'loans', ['user_id', 'is_deleted', 'status'], unique=False)
+    op.create_index('ix_loans_user_id_created_at_id', 'loans', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_loans_created_at_id', 'loans', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_loans_created_at_id', table_name='loans')
+    op.drop_index('ix_loans_user_id_created_at_id', table_name='loans')
+    op.drop_index('ix_loans_user_id_is_deleted_status', table_name='loans')
+    op.drop_index('ix_amortization_schedule_unpaid_due_date', table_name='amortization_schedule')
+    op.drop_index('ix_amortization_schedule_loan_id_status_due_date', table_name='amortization_schedule')
+    op.drop_index('ix_amortization_schedule_loan_id_payment_number', table_name='amortization_schedule')
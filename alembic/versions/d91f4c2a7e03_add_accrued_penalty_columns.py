@@ -0,0 +1,30 @@
+"""Add accrued penalty columns
+
+Revision ID: d91f4c2a7e03
+Revises: c3d8a5e1f2b4
+Create Date: 2026-10-17 10:41:07.268135
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd91f4c2a7e03'
+down_revision: Union[str, Sequence[str], None] = 'c3d8a5e1f2b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('amortization_schedule', sa.Column('accrued_penalty', sa.Numeric(precision=19, scale=2), server_default='0', nullable=False))
+    op.add_column('amortization_schedule', sa.Column('penalty_as_of', sa.Date(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('amortization_schedule', 'penalty_as_of')
+    op.drop_column('amortization_schedule', 'accrued_penalty')
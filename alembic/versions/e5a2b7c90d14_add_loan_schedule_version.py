@@ -0,0 +1,28 @@
+"""Add loan schedule version
+
+Revision ID: e5a2b7c90d14
+Revises: d91f4c2a7e03
+Create Date: 2026-10-17 12:03:55.917402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a2b7c90d14'
+down_revision: Union[str, Sequence[str], None] = 'd91f4c2a7e03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('loans', sa.Column('schedule_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('loans', 'schedule_version')
@@ -0,0 +1,59 @@
+"""Add rate indexes
+
+Revision ID: f3c61d8e2a57
+Revises: e5a2b7c90d14
+Create Date: 2026-10-17 15:21:08.334716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c61d8e2a57'
+down_revision: Union[str, Sequence[str], None] = 'e5a2b7c90d14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('rate_indexes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('code', sa.String(length=50), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('code')
+    )
+    op.create_index(op.f('ix_rate_indexes_id'), 'rate_indexes', ['id'], unique=False)
+    op.create_table('rate_index_values',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('rate_index_id', sa.Integer(), nullable=False),
+    sa.Column('effective_date', sa.Date(), nullable=False),
+    sa.Column('value', sa.Numeric(precision=8, scale=4), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['rate_index_id'], ['rate_indexes.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_rate_index_values_id'), 'rate_index_values', ['id'], unique=False)
+    op.create_index('ix_rate_index_values_rate_index_id_effective_date', 'rate_index_values', ['rate_index_id', 'effective_date'], unique=True)
+    op.add_column('loans', sa.Column('rate_index_id', sa.Integer(), nullable=True))
+    op.add_column('loans', sa.Column('rate_margin', sa.Numeric(precision=8, scale=4), server_default='0', nullable=False))
+    op.create_foreign_key('fk_loans_rate_index_id_rate_indexes', 'loans', 'rate_indexes', ['rate_index_id'], ['id'])
+    op.create_index('ix_loans_rate_index_id_rate_type', 'loans', ['rate_index_id', 'rate_type'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_loans_rate_index_id_rate_type', table_name='loans')
+    op.drop_constraint('fk_loans_rate_index_id_rate_indexes', 'loans', type_='foreignkey')
+    op.drop_column('loans', 'rate_margin')
+    op.drop_column('loans', 'rate_index_id')
+    op.drop_index('ix_rate_index_values_rate_index_id_effective_date', table_name='rate_index_values')
+    op.drop_index(op.f('ix_rate_index_values_id'), table_name='rate_index_values')
+    op.drop_table('rate_index_values')
+    op.drop_index(op.f('ix_rate_indexes_id'), table_name='rate_indexes')
+    op.drop_table('rate_indexes')
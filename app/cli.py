@@ -0,0 +1,42 @@
+import argparse
+from datetime import date
+
+from app.services.overdue_service import run_overdue_sweep
+from app.services.penalty_service import run_penalty_accrual
+from app.services.repricing_service import run_repricing
+from app.services.payment_service import run_payment_ingestion
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="MeLoan maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    sweep = commands.add_parser("sweep-overdue", help="Mark past-due pending/partial installments as overdue")
+    sweep.add_argument("--date", type=date.fromisoformat, default=None, help="Reference date (YYYY-MM-DD), defaults to today")
+    sweep.add_argument("--chunk-size", type=int, default=None)
+    
+    penalties = commands.add_parser("accrue-penalties", help="Compute late penalties for every overdue installment")
+    penalties.add_argument("--date", type=date.fromisoformat, default=None, help="Reference date (YYYY-MM-DD), defaults to today")
+    penalties.add_argument("--chunk-size", type=int, default=None)
+    penalties.add_argument("--dry-run", action="store_true", help="Compute totals without writing them")
+    
+    reprice = commands.add_parser("reprice", help="Re-amortize variable-rate loans tied to a rate index")
+    reprice.add_argument("--index", type=int, required=True, help="Rate index id")
+    reprice.add_argument("--date", type=date.fromisoformat, default=None, help="Reference date (YYYY-MM-DD), defaults to today")
+    reprice.add_argument("--chunk-size", type=int, default=None)
+    
+    payments = commands.add_parser("ingest-payments", help="Apply a bank-feed CSV (loan_id, reference, payment_date, amount) to the schedules")
+    payments.add_argument("file", help="Path to the CSV file")
+    payments.add_argument("--chunk-size", type=int, default=None)
+    
+    args = parser.parse_args()
+    if args.command == "sweep-overdue":
+        run_overdue_sweep(today=args.date, chunk_size=args.chunk_size)
+    elif args.command == "accrue-penalties":
+        run_penalty_accrual(today=args.date, chunk_size=args.chunk_size, persist=not args.dry_run)
+    elif args.command == "reprice":
+        run_repricing(args.index, as_of=args.date, chunk_size=args.chunk_size)
+    elif args.command == "ingest-payments":
+        run_payment_ingestion(args.file, chunk_size=args.chunk_size)
+
+if __name__ == "__main__":
+    main()
@@ -12,10 +12,52 @@ class Settings:
         "DATABASE_URL",
     )
     
+    DATABASE_REPLICA_URL: str = os.getenv("DATABASE_REPLICA_URL", "")
+    REPLICA_READ_AFTER_WRITE_SECONDS: float = float(os.getenv("REPLICA_READ_AFTER_WRITE_SECONDS", "5"))
+    
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "False").lower() == "true"
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+    
     SECRET_KEY: str = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7
     
+    THREADPOOL_SIZE: int = int(os.getenv("THREADPOOL_SIZE", "40"))
+    
+    SCHEDULE_CACHE_SIZE: int = int(os.getenv("SCHEDULE_CACHE_SIZE", "1024"))
+    PAYMENT_CACHE_SIZE: int = int(os.getenv("PAYMENT_CACHE_SIZE", "4096"))
+    ANNUITY_CACHE_SIZE: int = int(os.getenv("ANNUITY_CACHE_SIZE", "8192"))
+    
+    SIMULATION_WORKERS: int = int(os.getenv("SIMULATION_WORKERS", str(os.cpu_count() or 1)))
+    SIMULATION_BATCH_MAX_ITEMS: int = int(os.getenv("SIMULATION_BATCH_MAX_ITEMS", "5000"))
+    SIMULATION_CHUNK_SIZE: int = int(os.getenv("SIMULATION_CHUNK_SIZE", "50"))
+    PREPAYMENT_MAX_SCENARIOS: int = int(os.getenv("PREPAYMENT_MAX_SCENARIOS", "200"))
+    
+    OVERDUE_SWEEP_INTERVAL_MINUTES: int = int(os.getenv("OVERDUE_SWEEP_INTERVAL_MINUTES", "0"))
+    OVERDUE_SWEEP_CHUNK_SIZE: int = int(os.getenv("OVERDUE_SWEEP_CHUNK_SIZE", "5000"))
+    PENALTY_CHUNK_SIZE: int = int(os.getenv("PENALTY_CHUNK_SIZE", "10000"))
+    
+    REPRICE_CHUNK_SIZE: int = int(os.getenv("REPRICE_CHUNK_SIZE", "1000"))
+    REPRICE_WORKER_BATCH: int = int(os.getenv("REPRICE_WORKER_BATCH", "50"))
+    RATE_ADMIN_ENABLED: bool = os.getenv("RATE_ADMIN_ENABLED", "False").lower() == "true"
+    
+    PAYMENT_INGEST_CHUNK_SIZE: int = int(os.getenv("PAYMENT_INGEST_CHUNK_SIZE", "5000"))
+    PAYMENT_BULK_MAX_ITEMS: int = int(os.getenv("PAYMENT_BULK_MAX_ITEMS", "50000"))
+    
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "2000"))
+    EXPORT_PORTFOLIO_ENABLED: bool = os.getenv("EXPORT_PORTFOLIO_ENABLED", "False").lower() == "true"
+    
+    RESPONSE_CACHE_URL: str = os.getenv("RESPONSE_CACHE_URL", "memory://")
+    RESPONSE_CACHE_TTL: int = int(os.getenv("RESPONSE_CACHE_TTL", "300"))
+    RESPONSE_CACHE_SIZE: int = int(os.getenv("RESPONSE_CACHE_SIZE", "10000"))
+    
+    QUERY_DEBUG: bool = os.getenv("QUERY_DEBUG", "False").lower() == "true"
+    QUERY_DEBUG_REPEAT_THRESHOLD: int = int(os.getenv("QUERY_DEBUG_REPEAT_THRESHOLD", "5"))
+    
     ALLOWED_ORIGINS: list = [
         "http://localhost:5173",
         "http://localhost:3000",
@@ -1,14 +1,148 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool
 from app.config import settings
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True, echo=False)
+class InstrumentedQueuePool(QueuePool):
+    # Checkout wait includes opening a new connection when the pool has to grow,
+    # which is the latency a request actually sees.
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self._checkouts += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            checkouts = self._checkouts
+            timeouts = self._timeouts
+            wait_total = self._wait_total
+            wait_max = self._wait_max
+        return {
+            "pool": type(self).__name__,
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "wait_ms_total": round(wait_total * 1000, 2),
+            "wait_ms_avg": round(wait_total * 1000 / checkouts, 3) if checkouts else 0.0,
+            "wait_ms_max": round(wait_max * 1000, 2)
+        }
+
+def engine_options(url: str) -> Dict:
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING, "echo": False}
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend == "sqlite":
+        # Sizing and recycling do not apply to SQLite; file databases still get checkout metrics.
+        if url.database not in (None, "", ":memory:"):
+            options["poolclass"] = InstrumentedQueuePool
+        return options
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE
+    )
+    if backend == "postgresql" and settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        options["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+class RecentWrites:
+    # Users who committed within the window read from the primary, so they see their own
+    # writes even while the replica lags. Tracked per process: keep the window above the
+    # replica's usual lag, or route a user's requests to the same worker.
+    def __init__(self, window_seconds: float):
+        self.window = window_seconds
+        self._lock = threading.Lock()
+        self._last_write: Dict[int, float] = {}
+
+    def record(self, user_id: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._last_write[user_id] = now
+            if len(self._last_write) > 10000:
+                self._last_write = {
+                    user: written for user, written in self._last_write.items()
+                    if now - written < self.window
+                }
+
+    def is_recent(self, user_id: int) -> bool:
+        with self._lock:
+            written = self._last_write.get(user_id)
+        return written is not None and time.monotonic() - written < self.window
+
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_engine(settings.DATABASE_REPLICA_URL, **engine_options(settings.DATABASE_REPLICA_URL))
+else:
+    replica_engine = engine
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
 Base = declarative_base()
 
+recent_writes = RecentWrites(settings.REPLICA_READ_AFTER_WRITE_SECONDS)
+
+@event.listens_for(SessionLocal, "after_commit")
+def _record_write(session: Session) -> None:
+    user_id = session.info.get("user_id")
+    if user_id is not None:
+        recent_writes.record(user_id)
+
+@contextmanager
+def session_scope(read_only: bool = False, user_id: Optional[int] = None) -> Iterator[Session]:
+    # The only place sessions are opened and closed; request dependencies and
+    # background jobs both go through here.
+    if read_only and replica_engine is not engine and not (user_id is not None and recent_writes.is_recent(user_id)):
+        db = ReadSessionLocal()
+    else:
+        db = SessionLocal()
+    db.info["user_id"] = user_id
+    try:
+        yield db
+    finally:
+        db.close()
+
+def _pool_stats(pool) -> Dict:
+    if isinstance(pool, InstrumentedQueuePool):
+        return pool.stats()
+    return {"pool": type(pool).__name__, "status": pool.status()}
+
+def pool_stats() -> Dict:
+    if replica_engine is engine:
+        return _pool_stats(engine.pool)
+    return {"primary": _pool_stats(engine.pool), "replica": _pool_stats(replica_engine.pool)}
+
 def create_tables():
     Base.metadata.create_all(bind=engine)
 
 def drop_tables():
-    Base.metadata.drop_all(bind=engine)
\ No newline at end of file
+    Base.metadata.drop_all(bind=engine)
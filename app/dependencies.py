@@ -1,48 +1,51 @@
 from typing import Generator
+from fastapi import Depends
 from sqlalchemy.orm import Session
 
-from app.database import SessionLocal
+from app.database import session_scope
 from app.repositories.loan_repository import LoanRepository
 from app.repositories.amortization_repository import AmortizationRepository
 from app.services.loan_service import LoanService
 from app.services.calculation_service import CalculationService
 
-def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
-    try:
+def get_current_user():
+    class DummyUser:
+        id = 1
+        email = "test@example.com"
+    return DummyUser()
+
+def get_db(current_user=Depends(get_current_user)) -> Generator[Session, None, None]:
+    with session_scope(user_id=current_user.id) as db:
+        yield db
+
+def get_read_db(current_user=Depends(get_current_user)) -> Generator[Session, None, None]:
+    # Replica session, unless this user wrote recently and could read a stale replica.
+    with session_scope(read_only=True, user_id=current_user.id) as db:
         yield db
-    finally:
-        db.close()
 
-def get_loan_repository(db: Session = None) -> LoanRepository:
-    if db is None:
-        db = next(get_db())
+def get_loan_repository(db: Session = Depends(get_db)) -> LoanRepository:
     return LoanRepository(db=db)
 
-def get_amortization_repository(db: Session = None) -> AmortizationRepository:
-    if db is None:
-        db = next(get_db())
+def get_amortization_repository(db: Session = Depends(get_db)) -> AmortizationRepository:
     return AmortizationRepository(db=db)
 
 def get_calculation_service() -> CalculationService:
     return CalculationService()
 
-def get_loan_service(db: Session = None) -> LoanService:
-    if db is None:
-        db = next(get_db())
-    
-    loan_repo = get_loan_repository(db)
-    amortization_repo = get_amortization_repository(db)
-    calc_service = get_calculation_service()
-    
+def get_loan_service(
+    loan_repo: LoanRepository = Depends(get_loan_repository),
+    amortization_repo: AmortizationRepository = Depends(get_amortization_repository),
+    calc_service: CalculationService = Depends(get_calculation_service)
+) -> LoanService:
     return LoanService(
         loan_repository=loan_repo,
         amortization_repository=amortization_repo,
         calculation_service=calc_service
     )
 
-def get_current_user():
-    class DummyUser:
-        id = 1
-        email = "test@example.com"
-    return DummyUser()
\ No newline at end of file
+def get_read_loan_service(db: Session = Depends(get_read_db)) -> LoanService:
+    return LoanService(
+        loan_repository=LoanRepository(db=db),
+        amortization_repository=AmortizationRepository(db=db),
+        calculation_service=get_calculation_service()
+    )
@@ -1,10 +1,21 @@
-from fastapi import FastAPI
+import asyncio
+import anyio.to_thread
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
-from app.database import create_tables
+from app.database import create_tables, pool_stats
+from app.metrics import REGISTRY, CONTENT_TYPE, MetricsMiddleware
+from app.query_debug import QueryDebugMiddleware
 from app.routes.loans import router as loans_router
 from app.routes.amortization import router as amortization_router
+from app.routes.simulation import router as simulation_router
+from app.routes.portfolio import router as portfolio_router
+from app.routes.exports import router as exports_router
+from app.routes.rates import router as rates_router
+from app.routes.payments import router as payments_router
+from app.services.simulation_service import shutdown_executor
+from app.services.overdue_service import overdue_sweep_loop
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -14,6 +25,9 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+app.add_middleware(MetricsMiddleware)
+if settings.QUERY_DEBUG:
+    app.add_middleware(QueryDebugMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.ALLOWED_ORIGINS,
@@ -25,16 +39,28 @@ app.add_middleware(
 @app.on_event("startup")
 async def startup_event():
     print(f"🚀 Starting {settings.APP_NAME} v{settings.APP_VERSION} in port: 8000")
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
     if settings.DEBUG:
         print("📊 Creating DB tables...")
         create_tables()
+    if settings.OVERDUE_SWEEP_INTERVAL_MINUTES > 0:
+        app.state.overdue_sweep = asyncio.create_task(overdue_sweep_loop(settings.OVERDUE_SWEEP_INTERVAL_MINUTES))
 
 @app.on_event("shutdown")
 async def shutdown_event():
     print("👋 Closing application")
+    overdue_sweep = getattr(app.state, "overdue_sweep", None)
+    if overdue_sweep is not None:
+        overdue_sweep.cancel()
+    shutdown_executor()
 
 app.include_router(loans_router)
 app.include_router(amortization_router)
+app.include_router(simulation_router)
+app.include_router(portfolio_router)
+app.include_router(exports_router)
+app.include_router(rates_router)
+app.include_router(payments_router)
 
 @app.get("/", tags=["root"])
 async def root():
@@ -49,12 +75,25 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/pool", tags=["health"])
+async def pool_health():
+    return pool_stats()
+
+@app.get("/metrics", tags=["health"], include_in_schema=False)
+async def metrics():
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
 @app.get("/api/test", tags=["test"])
 async def test():
     return {
         "message": "API working correctly",
         "endpoints": {
             "loans": "/api/loans",
+            "simulate": "/api/simulate",
+            "prepayments": "/api/simulate/prepayments",
+            "portfolio": "/api/portfolio/summary",
+            "rates": "/api/rates/indexes",
+            "payments": "/api/payments/bulk",
             "docs": "/docs"
         }
     }
\ No newline at end of file
@@ -0,0 +1,262 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series: Dict[Tuple, List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    le = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                    lines.append(f"{self.name}_bucket{le} {cumulative}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._caches: Dict[str, Callable[[], Dict]] = {}
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_cache(self, name: str, stats: Callable[[], Dict]) -> None:
+        # Caches keep their own hit/miss counters; they are read when /metrics is scraped.
+        self._caches[name] = stats
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        lines.extend(self._render_caches())
+        return "\n".join(lines) + "\n"
+
+    def _render_caches(self) -> List[str]:
+        stats = {name: collect() for name, collect in sorted(self._caches.items())}
+        lines = []
+        for field, kind, documentation in (
+            ("hits", "counter", "Cache lookups that found an entry."),
+            ("misses", "counter", "Cache lookups that found nothing."),
+            ("evictions", "counter", "Entries evicted to stay within the size bound."),
+            ("size", "gauge", "Entries currently held."),
+            ("hit_rate", "gauge", "Hits over lookups since start.")
+        ):
+            name = f"meloan_cache_{field}_total" if kind == "counter" else f"meloan_cache_{field}"
+            samples = [(cache, values[field]) for cache, values in stats.items() if field in values]
+            if not samples:
+                continue
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for cache, value in samples:
+                lines.append(f"{name}{_format_labels(('cache',), (cache,))} {_format_value(value)}")
+        return lines
+
+
+REGISTRY = Registry()
+
+http_request_duration = REGISTRY.histogram(
+    "meloan_http_request_duration_seconds",
+    "Time from request start to the last response byte.",
+    ("method", "route", "status")
+)
+db_queries_per_request = REGISTRY.histogram(
+    "meloan_db_queries_per_request",
+    "SQL statements executed while serving one request.",
+    ("method", "route"),
+    buckets=COUNT_BUCKETS
+)
+db_time_per_request = REGISTRY.histogram(
+    "meloan_db_time_per_request_seconds",
+    "Time spent executing SQL while serving one request.",
+    ("method", "route")
+)
+db_statements = REGISTRY.counter(
+    "meloan_db_statements_total",
+    "SQL statements executed, including background jobs.",
+    ("source",)
+)
+schedule_generation = REGISTRY.histogram(
+    "meloan_schedule_generation_seconds",
+    "Amortization schedule generation time by code path.",
+    ("path",)
+)
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds", "statements")
+
+    def __init__(self, track_statements: bool = False):
+        self.queries = 0
+        self.db_seconds = 0.0
+        # (statement, parameters) -> executions, only kept when query debugging is on.
+        self.statements: Optional[Dict[Tuple[str, str], int]] = {} if track_statements else None
+
+
+# Set per request by MetricsMiddleware; sync handlers run in the threadpool with a copy of
+# the context, so they see (and mutate) the same RequestStats object.
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    stats = current_request.get()
+    if stats is None:
+        db_statements.inc(source="background")
+        return
+    db_statements.inc(source="request")
+    stats.queries += 1
+    stats.db_seconds += time.perf_counter() - started
+    if stats.statements is not None:
+        key = (statement, f"<{len(parameters)} rows>" if executemany else repr(parameters))
+        stats.statements[key] = stats.statements.get(key, 0) + 1
+
+
+def route_label(scope: Dict) -> str:
+    # The route template keeps label cardinality bounded; unmatched paths share one label.
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        # QueryDebugMiddleware, when enabled, wraps this one and has already set up the stats.
+        stats = current_request.get()
+        token = None
+        if stats is None:
+            stats = RequestStats()
+            token = current_request.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = route_label(scope)
+            method = scope["method"]
+            http_request_duration.observe(time.perf_counter() - started, method=method, route=route, status=status_code)
+            db_queries_per_request.observe(stats.queries, method=method, route=route)
+            db_time_per_request.observe(stats.db_seconds, method=method, route=route)
+            if token is not None:
+                current_request.reset(token)
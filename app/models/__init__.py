@@ -1,3 +1,5 @@
 from app.models.loan import Loan
+from app.models.rate_index import RateIndex, RateIndexValue
+from app.models.payment import Payment
 
-__all__ = ["Loan", "AmortizationSchedule"]
\ No newline at end of file
+__all__ = ["Loan", "AmortizationSchedule", "RateIndex", "RateIndexValue", "Payment"]
\ No newline at end of file
@@ -1,12 +1,25 @@
-from sqlalchemy import Column, Integer, Date, Numeric, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, Date, Numeric, String, DateTime, Boolean, ForeignKey, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
 from datetime import date as date_type
 from decimal import Decimal
 
+UNPAID_CONDITION = text("status IN ('pending', 'partial', 'overdue')")
+
 class AmortizationSchedule(Base):
     __tablename__ = "amortization_schedule"
+    __table_args__ = (
+        Index("ix_amortization_schedule_loan_id_payment_number", "loan_id", "payment_number", unique=True),
+        Index("ix_amortization_schedule_loan_id_status_due_date", "loan_id", "status", "due_date"),
+        Index(
+            "ix_amortization_schedule_unpaid_due_date",
+            "due_date",
+            "loan_id",
+            postgresql_where=UNPAID_CONDITION,
+            sqlite_where=UNPAID_CONDITION
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     loan_id = Column(Integer, ForeignKey("loans.id"), nullable=False, index=True)
@@ -25,10 +38,15 @@ class AmortizationSchedule(Base):
     
     is_grace_period = Column(Boolean, default=False, nullable=False)
     
+    paid_amount = Column(Numeric(19, 2), default=0, server_default="0", nullable=False)
+    
+    accrued_penalty = Column(Numeric(19, 2), default=0, server_default="0", nullable=False)
+    penalty_as_of = Column(Date, nullable=True)
+    
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     loan = relationship("Loan", back_populates="amortization_schedule")
-    # payments = relationship("Payment", back_populates="payment_schedule")
+    payments = relationship("Payment", back_populates="payment_schedule")
     
     def __repr__(self):
         return f"<AmortizationSchedule(loan_id={self.loan_id}, #={self.payment_number}, status={self.status})>"
@@ -1,10 +1,16 @@
-from sqlalchemy import Column, Integer, String, Numeric, Boolean, DateTime, Date
+from sqlalchemy import Column, Integer, String, Numeric, Boolean, DateTime, Date, Index, ForeignKey
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 class Loan(Base):
     __tablename__ = "loans"
+    __table_args__ = (
+        Index("ix_loans_user_id_is_deleted_status", "user_id", "is_deleted", "status"),
+        Index("ix_loans_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_loans_created_at_id", "created_at", "id"),
+        Index("ix_loans_rate_index_id_rate_type", "rate_index_id", "rate_type"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False, index=True)
@@ -24,8 +30,11 @@ class Loan(Base):
     payment_frequency = Column(String(50), default="monthly", nullable=False)
     origination_fee = Column(Numeric(19, 2), default=0, nullable=False)
     insurance_monthly = Column(Numeric(19, 2), default=0, nullable=False)
+    installment_amount = Column(Numeric(19, 2), nullable=True)
     
     rate_type = Column(String(50), default="fixed", nullable=False) 
+    rate_index_id = Column(Integer, ForeignKey("rate_indexes.id"), nullable=True)
+    rate_margin = Column(Numeric(8, 4), default=0, server_default="0", nullable=False)
     interest_calculation_method = Column(String(50), default="30/360", nullable=False)
     grace_period_months = Column(Integer, default=0, nullable=False)
     late_payment_penalty_rate = Column(Numeric(8, 4), default=0, nullable=False)
@@ -34,24 +43,24 @@ class Loan(Base):
     deleted_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    schedule_version = Column(Integer, default=0, server_default="0", nullable=False)
     
     amortization_schedule = relationship("AmortizationSchedule", back_populates="loan", cascade="all, delete-orphan")
+    payments = relationship("Payment", back_populates="loan", cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<Loan(id={self.id}, name='{self.name}', principal={self.principal})>"
     
     @property
     def monthly_payment(self) -> float:
-        from decimal import Decimal, ROUND_HALF_UP
-        P = Decimal(str(self.principal))
-        r = Decimal(str(self.annual_rate)) / 100 / 12
-        n = self.months
-        insurance = Decimal(str(self.insurance_monthly))
+        if self.installment_amount is not None:
+            return float(self.installment_amount)
         
-        if r == 0:
-            base_payment = P / n
-        else:
-            base_payment = P * (r * (1 + r) ** n) / ((1 + r) ** n - 1)
-        
-        total = (base_payment + insurance).quantize(Decimal('0.01'), ROUND_HALF_UP)
-        return float(total)
\ No newline at end of file
+        from decimal import Decimal
+        from app.services.calculation_service import CalculationService
+        return float(CalculationService.calculate_monthly_payment(
+            Decimal(str(self.principal)),
+            Decimal(str(self.annual_rate)),
+            self.months,
+            Decimal(str(self.insurance_monthly))
+        ))
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, Numeric, Date, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+class Payment(Base):
+    __tablename__ = "payments"
+    __table_args__ = (
+        Index("ix_payments_ingestion_id", "ingestion_id"),
+        Index("ix_payments_loan_id_payment_date", "loan_id", "payment_date"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    loan_id = Column(Integer, ForeignKey("loans.id"), nullable=False)
+    amortization_schedule_id = Column(Integer, ForeignKey("amortization_schedule.id", ondelete="SET NULL"), nullable=True)
+    
+    reference = Column(String(100), nullable=False, unique=True)
+    payment_date = Column(Date, nullable=False)
+    amount = Column(Numeric(19, 2), nullable=False)
+    applied_amount = Column(Numeric(19, 2), default=0, server_default="0", nullable=False)
+    
+    status = Column(String(50), default="received", server_default="received", nullable=False)
+    ingestion_id = Column(String(36), nullable=True)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    loan = relationship("Loan", back_populates="payments")
+    payment_schedule = relationship("AmortizationSchedule", back_populates="payments")
+    
+    def __repr__(self):
+        return f"<Payment(id={self.id}, loan_id={self.loan_id}, reference='{self.reference}', amount={self.amount})>"
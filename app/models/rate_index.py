@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, Numeric, Date, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+class RateIndex(Base):
+    __tablename__ = "rate_indexes"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    code = Column(String(50), nullable=False, unique=True)
+    name = Column(String(255), nullable=False)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    values = relationship("RateIndexValue", back_populates="rate_index", cascade="all, delete-orphan")
+    
+    def __repr__(self):
+        return f"<RateIndex(id={self.id}, code='{self.code}')>"
+
+class RateIndexValue(Base):
+    __tablename__ = "rate_index_values"
+    __table_args__ = (
+        Index("ix_rate_index_values_rate_index_id_effective_date", "rate_index_id", "effective_date", unique=True),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    rate_index_id = Column(Integer, ForeignKey("rate_indexes.id"), nullable=False)
+    effective_date = Column(Date, nullable=False)
+    value = Column(Numeric(8, 4), nullable=False)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    rate_index = relationship("RateIndex", back_populates="values")
+    
+    def __repr__(self):
+        return f"<RateIndexValue(rate_index_id={self.rate_index_id}, effective_date={self.effective_date}, value={self.value})>"
@@ -0,0 +1,58 @@
+import time
+from typing import Dict, List, Tuple
+
+from starlette.datastructures import MutableHeaders
+
+from app.config import settings
+from app.metrics import RequestStats, current_request
+
+
+def repeated_statements(stats: RequestStats, threshold: int) -> Tuple[List[Tuple[str, int]], List[Tuple[str, int]]]:
+    # Duplicates ran more than once with the same parameters: the result was already at hand.
+    # Repeats are one statement text run `threshold` times or more with varying parameters,
+    # the usual shape of an N+1 loop.
+    duplicates = [(statement, count) for (statement, _), count in stats.statements.items() if count > 1]
+    by_text: Dict[str, int] = {}
+    for (statement, _), count in stats.statements.items():
+        by_text[statement] = by_text.get(statement, 0) + count
+    repeats = [(statement, count) for statement, count in by_text.items() if count >= threshold]
+    return duplicates, repeats
+
+
+class QueryDebugMiddleware:
+    def __init__(self, app, repeat_threshold: int = settings.QUERY_DEBUG_REPEAT_THRESHOLD):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(track_statements=True)
+        token = current_request.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_headers(message):
+            # Streamed bodies may keep querying after the headers are sent; those
+            # statements still show up in the log line below.
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-Query-Count"] = str(stats.queries)
+                headers["X-DB-Time"] = f"{stats.db_seconds * 1000:.2f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            current_request.reset(token)
+            self._report(scope, stats, time.perf_counter() - started)
+
+    def _report(self, scope, stats: RequestStats, elapsed: float) -> None:
+        request = f"{scope['method']} {scope['path']}"
+        print(f"🔎 {request}: {stats.queries} queries, {stats.db_seconds * 1000:.2f} ms in DB, {elapsed * 1000:.2f} ms total")
+        duplicates, repeats = repeated_statements(stats, self.repeat_threshold)
+        for statement, count in duplicates:
+            print(f"⚠️ {request}: identical statement ran {count}x: {' '.join(statement.split())[:200]}")
+        for statement, count in repeats:
+            print(f"⚠️ {request}: possible N+1, statement ran {count}x: {' '.join(statement.split())[:200]}")
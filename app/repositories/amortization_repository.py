@@ -1,6 +1,37 @@
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple, Iterator
+from datetime import date
+from decimal import Decimal
+from sqlalchemy import insert, select, update, delete, func, or_
 from sqlalchemy.orm import Session
-from app.models.amortization_schedule import AmortizationSchedule
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models.amortization_schedule import AmortizationSchedule, UNPAID_CONDITION
+from app.models.loan import Loan
+
+PENDING_STATUSES = ["pending", "partial", "overdue"]
+OVERDUE_CANDIDATE_STATUSES = ["pending", "partial"]
+
+ROW_COLUMNS = (
+    AmortizationSchedule.id,
+    AmortizationSchedule.loan_id,
+    AmortizationSchedule.payment_number,
+    AmortizationSchedule.due_date,
+    AmortizationSchedule.scheduled_payment,
+    AmortizationSchedule.scheduled_principal,
+    AmortizationSchedule.scheduled_interest,
+    AmortizationSchedule.insurance_amount,
+    AmortizationSchedule.remaining_balance,
+    AmortizationSchedule.status
+)
+
+UPSERT_COLUMNS = (
+    "due_date",
+    "scheduled_payment",
+    "scheduled_principal",
+    "scheduled_interest",
+    "insurance_amount",
+    "remaining_balance",
+    "is_grace_period"
+)
 
 class AmortizationRepository:
     def __init__(self, db: Session):
@@ -34,20 +65,21 @@ class AmortizationRepository:
                 AmortizationSchedule.loan_id == loan_id,
                 AmortizationSchedule.status == "pending"
             )
-            .order_by(AmortizationSchedule.payment_number)
+            # Due dates rise with payment_number, so ordering by due_date first lets the
+            # planner walk (loan_id, status, due_date) instead of the payment_number index.
+            .order_by(AmortizationSchedule.due_date, AmortizationSchedule.payment_number)
             .all()
         )
     
     def get_overdue(self, loan_id: int) -> List[AmortizationSchedule]:
-        from datetime import date
         return (
             self.db.query(AmortizationSchedule)
             .filter(
                 AmortizationSchedule.loan_id == loan_id,
-                AmortizationSchedule.status.in_(["pending", "partial"]),
+                AmortizationSchedule.status.in_(PENDING_STATUSES),
                 AmortizationSchedule.due_date < date.today()
             )
-            .order_by(AmortizationSchedule.payment_number)
+            .order_by(AmortizationSchedule.due_date, AmortizationSchedule.payment_number)
             .all()
         )
     
@@ -64,14 +96,201 @@ class AmortizationRepository:
             self.db.refresh(schedule)
         return schedules
     
+    def bulk_create(self, rows: List[Dict]) -> int:
+        if not rows:
+            return 0
+        self.db.execute(insert(AmortizationSchedule.__table__), rows)
+        self.db.commit()
+        return len(rows)
+    
     def update_status(self, id: int, status: str) -> Optional[AmortizationSchedule]:
         schedule = self.get_by_id(id)
         if not schedule:
             return None
         schedule.status = status
+        self._bump_schedule_version(select(Loan.id).where(Loan.id == schedule.loan_id))
         self.db.commit()
         self.db.refresh(schedule)
         return schedule
     
+    def mark_overdue_chunk(self, today: date, chunk_size: int) -> int:
+        ids = self.db.execute(
+            select(AmortizationSchedule.id)
+            .where(
+                # Repeats the partial index predicate verbatim: SQLite only uses
+                # ix_amortization_schedule_unpaid_due_date when the query contains it.
+                UNPAID_CONDITION,
+                AmortizationSchedule.status.in_(OVERDUE_CANDIDATE_STATUSES),
+                AmortizationSchedule.due_date < today
+            )
+            .limit(chunk_size)
+        ).scalars().all()
+        if not ids:
+            return 0
+        result = self.db.execute(
+            update(AmortizationSchedule)
+            .where(AmortizationSchedule.id.in_(ids))
+            .values(status="overdue")
+            .execution_options(synchronize_session=False)
+        )
+        self._bump_schedule_version(
+            select(AmortizationSchedule.loan_id).where(AmortizationSchedule.id.in_(ids)).distinct()
+        )
+        self.db.commit()
+        return result.rowcount
+    
+    def get_penalty_candidates(self, today: date, after_id: int, limit: int) -> List[Tuple]:
+        return self.db.execute(
+            select(
+                AmortizationSchedule.id,
+                AmortizationSchedule.scheduled_payment,
+                AmortizationSchedule.due_date,
+                Loan.late_payment_penalty_rate
+            )
+            .join(Loan, Loan.id == AmortizationSchedule.loan_id)
+            .where(
+                AmortizationSchedule.id > after_id,
+                AmortizationSchedule.status.in_(PENDING_STATUSES),
+                AmortizationSchedule.due_date < today,
+                Loan.is_deleted == False,
+                Loan.late_payment_penalty_rate > 0
+            )
+            .order_by(AmortizationSchedule.id)
+            .limit(limit)
+        ).all()
+    
+    def bulk_update_penalties(self, rows: List[Dict]) -> int:
+        if not rows:
+            return 0
+        self.db.execute(update(AmortizationSchedule), rows)
+        self.db.commit()
+        return len(rows)
+    
+    def get_schedule_state(self, loan_id: int) -> List[Tuple]:
+        return self.db.execute(
+            select(*ROW_COLUMNS, AmortizationSchedule.is_grace_period)
+            .where(AmortizationSchedule.loan_id == loan_id)
+            .order_by(AmortizationSchedule.payment_number)
+        ).all()
+    
+    def apply_diff(self, updates: List[Dict], inserts: List[Dict], delete_ids: List[int]) -> None:
+        # No commit here: the caller commits so the diff lands in the same transaction
+        # as the change that caused it.
+        if delete_ids:
+            self.db.execute(
+                delete(AmortizationSchedule)
+                .where(AmortizationSchedule.id.in_(delete_ids))
+                .execution_options(synchronize_session=False)
+            )
+        if updates:
+            self.db.execute(update(AmortizationSchedule), updates)
+        if inserts:
+            self.db.execute(insert(AmortizationSchedule.__table__), inserts)
+    
+    def get_schedule_state_for_loans(self, loan_ids: List[int]) -> Dict[int, List[Tuple]]:
+        rows = self.db.execute(
+            select(*ROW_COLUMNS, AmortizationSchedule.is_grace_period)
+            .where(AmortizationSchedule.loan_id.in_(loan_ids))
+            .order_by(AmortizationSchedule.loan_id, AmortizationSchedule.payment_number)
+        ).all()
+        by_loan = {loan_id: [] for loan_id in loan_ids}
+        for row in rows:
+            by_loan[row.loan_id].append(row)
+        return by_loan
+    
+    def upsert_schedule(self, rows: List[Dict], delete_ids: List[int]) -> None:
+        # Like apply_diff, this leaves the commit to the caller. Rows settled since the plan
+        # was built are neither rewritten nor deleted; spelled out as ORs because an
+        # expanding IN cannot be bound once per row of an executemany.
+        unpaid = or_(*(AmortizationSchedule.status == status for status in PENDING_STATUSES))
+        if delete_ids:
+            self.db.execute(
+                delete(AmortizationSchedule)
+                .where(AmortizationSchedule.id.in_(delete_ids), unpaid)
+                .execution_options(synchronize_session=False)
+            )
+        if not rows:
+            return
+        dialect = postgresql if self.db.get_bind().dialect.name == "postgresql" else sqlite
+        stmt = dialect.insert(AmortizationSchedule.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["loan_id", "payment_number"],
+            set_={column: stmt.excluded[column] for column in UPSERT_COLUMNS},
+            where=unpaid
+        )
+        self.db.execute(stmt, rows)
+    
+    def lock_unpaid(self, loan_ids: List[int]) -> None:
+        # Held until the caller commits, so two feeds cannot allocate the same installment.
+        if not loan_ids:
+            return
+        self.db.execute(
+            select(AmortizationSchedule.id)
+            .where(AmortizationSchedule.loan_id.in_(loan_ids), AmortizationSchedule.status.in_(PENDING_STATUSES))
+            .order_by(AmortizationSchedule.id)
+            .with_for_update()
+        )
+    
+    def apply_payments(self, rows: List[Dict], loan_ids: List[int]) -> None:
+        # Like apply_diff, this leaves the commit to the caller.
+        if not rows:
+            return
+        self.db.execute(update(AmortizationSchedule), rows)
+        self._bump_schedule_version(loan_ids)
+    
+    def get_rows_by_loan(self, loan_id: int) -> List[Tuple]:
+        return self.db.execute(
+            select(*ROW_COLUMNS)
+            .where(AmortizationSchedule.loan_id == loan_id)
+            .order_by(AmortizationSchedule.payment_number)
+        ).all()
+    
+    def iter_rows(
+        self,
+        loan_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Tuple]:
+        stmt = (
+            select(*ROW_COLUMNS)
+            .join(Loan, Loan.id == AmortizationSchedule.loan_id)
+            .where(Loan.is_deleted == False)
+            .order_by(AmortizationSchedule.loan_id, AmortizationSchedule.payment_number)
+            .execution_options(yield_per=batch_size)
+        )
+        if loan_id is not None:
+            stmt = stmt.where(AmortizationSchedule.loan_id == loan_id)
+        if user_id is not None:
+            stmt = stmt.where(Loan.user_id == user_id)
+        for partition in self.db.execute(stmt).partitions():
+            yield from partition
+    
     def count_by_loan(self, loan_id: int) -> int:
-        return self.db.query(AmortizationSchedule).filter(AmortizationSchedule.loan_id == loan_id).count()
\ No newline at end of file
+        return self.db.query(AmortizationSchedule).filter(AmortizationSchedule.loan_id == loan_id).count()
+    
+    def get_summary(self, loan_id: int) -> Dict:
+        is_paid = AmortizationSchedule.status == "paid"
+        is_pending = AmortizationSchedule.status.in_(PENDING_STATUSES)
+        payment = AmortizationSchedule.scheduled_payment
+        zero = Decimal("0")
+        row = self.db.execute(
+            select(
+                func.count().label("total_payments"),
+                func.coalesce(func.sum(payment), zero).label("total_to_pay"),
+                func.coalesce(func.sum(AmortizationSchedule.scheduled_interest), zero).label("total_interest"),
+                func.coalesce(func.sum(AmortizationSchedule.scheduled_principal), zero).label("total_principal"),
+                func.count().filter(is_paid).label("payments_made"),
+                func.coalesce(func.sum(payment).filter(is_paid), zero).label("amount_paid"),
+                func.count().filter(is_pending).label("payments_pending"),
+                func.coalesce(func.sum(payment).filter(is_pending), zero).label("amount_pending")
+            ).where(AmortizationSchedule.loan_id == loan_id)
+        ).one()
+        return dict(row._mapping)
+    
+    def _bump_schedule_version(self, loan_ids) -> None:
+        self.db.execute(
+            update(Loan)
+            .where(Loan.id.in_(loan_ids))
+            .values(schedule_version=Loan.schedule_version + 1)
+            .execution_options(synchronize_session=False)
+        )
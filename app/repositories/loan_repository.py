@@ -1,9 +1,17 @@
-from typing import Optional, List
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from datetime import datetime
+from typing import Optional, List, Dict, Set, Tuple
+from decimal import Decimal
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import and_, select, update, func, literal, cast, tuple_, Date, Numeric
+from datetime import datetime, date
 
 from app.models.loan import Loan
+from app.models.amortization_schedule import AmortizationSchedule
+from app.repositories.amortization_repository import PENDING_STATUSES
+from app.repositories.sql_functions import days_between, clamp
+
+# Same bounds LoanBase validates, so a repriced loan still reads back through LoanResponse.
+MIN_ANNUAL_RATE = Decimal("0.0001")
+MAX_ANNUAL_RATE = Decimal("100")
 
 class LoanRepository:
     def __init__(self, db: Session):
@@ -15,12 +23,46 @@ class LoanRepository:
             query = query.filter(Loan.is_deleted == False)
         return query.first()
     
+    def get_cache_validators(self, id: int):
+        return self.db.execute(
+            select(Loan.user_id, Loan.updated_at, Loan.schedule_version)
+            .where(Loan.id == id, Loan.is_deleted == False)
+        ).first()
+    
     def get_all(self, skip: int = 0, limit: int = 100, include_deleted: bool = False) -> List[Loan]:
         query = self.db.query(Loan)
         if not include_deleted:
             query = query.filter(Loan.is_deleted == False)
         return query.offset(skip).limit(limit).all()
     
+    def get_page(
+        self,
+        limit: int,
+        user_id: Optional[int] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+        skip: int = 0,
+        include_deleted: bool = False
+    ) -> List[Loan]:
+        query = self.db.query(Loan)
+        if user_id is not None:
+            query = query.filter(Loan.user_id == user_id)
+        if not include_deleted:
+            query = query.filter(Loan.is_deleted == False)
+        if after is not None:
+            # Compare against the anchor row's stored created_at rather than the decoded one:
+            # SQLite keeps server-default timestamps without microseconds, so a bound value
+            # never equals them and rows sharing the anchor's second would be skipped.
+            anchor = aliased(Loan)
+            anchor_created_at = select(anchor.created_at).where(anchor.id == after[1]).scalar_subquery()
+            query = query.filter(tuple_(Loan.created_at, Loan.id) > tuple_(
+                func.coalesce(anchor_created_at, literal(after[0], Loan.created_at.type)),
+                literal(after[1], Loan.id.type)
+            ))
+        query = query.order_by(Loan.created_at, Loan.id)
+        if skip:
+            query = query.offset(skip)
+        return query.limit(limit).all()
+    
     def create(self, loan: Loan) -> Loan:
         self.db.add(loan)
         self.db.commit()
@@ -31,6 +73,9 @@ class LoanRepository:
         loan = self.get_by_id(id)
         if not loan:
             return None
+        return self.apply_update(loan, loan_data)
+    
+    def apply_update(self, loan: Loan, loan_data: dict) -> Loan:
         for key, value in loan_data.items():
             if value is not None and hasattr(loan, key):
                 setattr(loan, key, value)
@@ -43,6 +88,9 @@ class LoanRepository:
         loan = self.db.query(Loan).filter(Loan.id == id).first()
         if not loan:
             return False
+        return self.delete_loan(loan)
+    
+    def delete_loan(self, loan: Loan) -> bool:
         self.db.delete(loan)
         self.db.commit()
         return True
@@ -51,6 +99,11 @@ class LoanRepository:
         loan = self.get_by_id(id)
         if not loan:
             return False
+        return self.mark_deleted(loan)
+    
+    def mark_deleted(self, loan: Loan) -> bool:
+        if loan.is_deleted:
+            return False
         loan.is_deleted = True
         loan.deleted_at = datetime.utcnow()
         self.db.commit()
@@ -58,7 +111,12 @@ class LoanRepository:
     
     def restore(self, id: int) -> bool:
         loan = self.get_by_id(id, include_deleted=True)
-        if not loan or not loan.is_deleted:
+        if not loan:
+            return False
+        return self.mark_restored(loan)
+    
+    def mark_restored(self, loan: Loan) -> bool:
+        if not loan.is_deleted:
             return False
         loan.is_deleted = False
         loan.deleted_at = None
@@ -78,9 +136,121 @@ class LoanRepository:
         return query.all()
     
     def get_active_by_user(self, user_id: int) -> List[Loan]:
-        return self.db.query(Loan).filter(
-            and_(Loan.user_id == user_id, Loan.is_deleted == False, Loan.status.in_(["simulation", "active"]))
+        return self.db.query(Loan).filter(self._active_by_user(user_id)).all()
+    
+    def get_portfolio_summary(self, user_id: int, today: date) -> List[Dict]:
+        schedule = AmortizationSchedule
+        unpaid = schedule.status.in_(PENDING_STATUSES)
+        overdue = and_(unpaid, schedule.due_date < today)
+        penalty = func.round(
+            schedule.scheduled_payment * Loan.late_payment_penalty_rate / 100
+            * days_between(schedule.due_date, literal(today, Date)),
+            2
+        )
+        zero = Decimal("0")
+        
+        per_loan = (
+            select(
+                Loan.id.label("loan_id"),
+                Loan.name,
+                Loan.type,
+                Loan.status,
+                func.coalesce(func.sum(schedule.scheduled_principal).filter(unpaid), zero).label("outstanding_balance"),
+                func.min(schedule.payment_number).filter(unpaid).label("next_payment_number"),
+                func.count(schedule.id).filter(overdue).label("overdue_payments"),
+                func.coalesce(func.sum(schedule.scheduled_payment).filter(overdue), zero).label("overdue_amount"),
+                cast(func.coalesce(func.sum(penalty).filter(overdue), zero), Numeric(19, 2)).label("accrued_penalties")
+            )
+            .select_from(Loan)
+            .outerjoin(schedule, schedule.loan_id == Loan.id)
+            .where(self._active_by_user(user_id))
+            .group_by(Loan.id, Loan.name, Loan.type, Loan.status)
+            .subquery()
+        )
+        
+        next_payment = aliased(AmortizationSchedule)
+        rows = self.db.execute(
+            select(
+                per_loan,
+                next_payment.due_date.label("next_due_date"),
+                next_payment.scheduled_payment.label("next_due_amount")
+            )
+            .outerjoin(
+                next_payment,
+                and_(
+                    next_payment.loan_id == per_loan.c.loan_id,
+                    next_payment.payment_number == per_loan.c.next_payment_number
+                )
+            )
+            .order_by(per_loan.c.loan_id)
         ).all()
+        return [dict(row._mapping) for row in rows]
+    
+    def get_repricing_candidates(self, rate_index_id: int, index_value: Decimal, after_id: int, limit: int) -> List[Tuple]:
+        # target_rate is computed here only, so a loan written with it never matches again.
+        target_rate = func.round(
+            clamp(literal(index_value, Numeric(8, 4)) + Loan.rate_margin, MIN_ANNUAL_RATE, MAX_ANNUAL_RATE),
+            4,
+            type_=Numeric(8, 4)
+        )
+        return self.db.execute(
+            select(
+                Loan.id,
+                Loan.principal,
+                Loan.annual_rate,
+                Loan.months,
+                Loan.start_date,
+                Loan.payment_day,
+                Loan.payment_frequency,
+                Loan.insurance_monthly,
+                Loan.grace_period_months,
+                Loan.interest_calculation_method,
+                Loan.rate_margin,
+                Loan.schedule_version,
+                target_rate.label("target_rate")
+            )
+            .where(
+                Loan.id > after_id,
+                Loan.rate_type == "variable",
+                Loan.rate_index_id == rate_index_id,
+                Loan.is_deleted == False,
+                Loan.status.in_(["simulation", "active"]),
+                Loan.annual_rate != target_rate
+            )
+            .order_by(Loan.id)
+            .limit(limit)
+        ).all()
+    
+    def claim_versions(self, versions: Dict[int, int]) -> Set[int]:
+        # Bumps schedule_version only where it still holds the value read, and returns the
+        # loans that matched; their rows stay locked until the caller commits.
+        if not versions:
+            return set()
+        return set(self.db.execute(
+            update(Loan)
+            .where(tuple_(Loan.id, Loan.schedule_version).in_(list(versions.items())))
+            .values(schedule_version=Loan.schedule_version + 1)
+            .returning(Loan.id)
+            .execution_options(synchronize_session=False)
+        ).scalars())
+    
+    def bulk_update_rates(self, rows: List[Dict]) -> int:
+        if not rows:
+            return 0
+        self.db.execute(update(Loan), rows)
+        self.db.commit()
+        return len(rows)
+    
+    def get_existing_ids(self, ids: List[int], user_id: Optional[int] = None, for_update: bool = False) -> Set[int]:
+        if not ids:
+            return set()
+        stmt = select(Loan.id).where(Loan.id.in_(ids), Loan.is_deleted == False)
+        if user_id is not None:
+            stmt = stmt.where(Loan.user_id == user_id)
+        if for_update:
+            # Id order keeps concurrent lockers from deadlocking on each other.
+            stmt = stmt.order_by(Loan.id).with_for_update()
+        return set(self.db.execute(stmt).scalars())
     
     def count_total(self, include_deleted: bool = False) -> int:
         query = self.db.query(Loan)
@@ -92,4 +262,7 @@ class LoanRepository:
         query = self.db.query(Loan).filter(Loan.user_id == user_id)
         if not include_deleted:
             query = query.filter(Loan.is_deleted == False)
-        return query.count()
\ No newline at end of file
+        return query.count()
+    
+    def _active_by_user(self, user_id: int):
+        return and_(Loan.user_id == user_id, Loan.is_deleted == False, Loan.status.in_(["simulation", "active"]))
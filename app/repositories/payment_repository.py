@@ -0,0 +1,78 @@
+from typing import List, Dict, Tuple
+from sqlalchemy import select, update, func
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.models.payment import Payment
+from app.models.amortization_schedule import AmortizationSchedule
+from app.repositories.amortization_repository import PENDING_STATUSES
+
+class PaymentRepository:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def stage(self, rows: List[Dict]) -> None:
+        # References already ingested are skipped, so replaying a bank file is harmless.
+        # No commit here: staging, matching and applying a chunk share one transaction.
+        if not rows:
+            return
+        dialect = postgresql if self.db.get_bind().dialect.name == "postgresql" else sqlite
+        stmt = dialect.insert(Payment.__table__).on_conflict_do_nothing(index_elements=["reference"])
+        self.db.execute(stmt, rows)
+    
+    def get_staged(self, ingestion_id: str) -> List[Tuple]:
+        return self.db.execute(
+            select(Payment.id, Payment.loan_id, Payment.amount)
+            .where(Payment.ingestion_id == ingestion_id)
+            .order_by(Payment.loan_id, Payment.payment_date, Payment.id)
+        ).all()
+    
+    def get_allocation_targets(self, ingestion_id: str) -> List[Tuple]:
+        # Only the unpaid installments a chunk can actually reach are loaded: per loan, the
+        # ones whose outstanding amount starts before the total received for that loan.
+        incoming = (
+            select(Payment.loan_id, func.sum(Payment.amount).label("amount"))
+            .where(Payment.ingestion_id == ingestion_id)
+            .group_by(Payment.loan_id)
+            .subquery()
+        )
+        outstanding = AmortizationSchedule.scheduled_payment - AmortizationSchedule.paid_amount
+        ranked = (
+            select(
+                AmortizationSchedule.id,
+                AmortizationSchedule.loan_id,
+                AmortizationSchedule.payment_number,
+                AmortizationSchedule.scheduled_payment,
+                AmortizationSchedule.paid_amount,
+                AmortizationSchedule.status,
+                (
+                    func.sum(outstanding).over(
+                        partition_by=AmortizationSchedule.loan_id,
+                        order_by=AmortizationSchedule.payment_number
+                    ) - outstanding
+                ).label("outstanding_before")
+            )
+            .join(incoming, incoming.c.loan_id == AmortizationSchedule.loan_id)
+            .where(AmortizationSchedule.status.in_(PENDING_STATUSES))
+            .subquery()
+        )
+        return self.db.execute(
+            select(
+                ranked.c.id,
+                ranked.c.loan_id,
+                ranked.c.payment_number,
+                ranked.c.scheduled_payment,
+                ranked.c.paid_amount,
+                ranked.c.status
+            )
+            .join(incoming, incoming.c.loan_id == ranked.c.loan_id)
+            .where(ranked.c.outstanding_before < incoming.c.amount)
+            .order_by(ranked.c.loan_id, ranked.c.payment_number)
+        ).all()
+    
+    def bulk_update(self, rows: List[Dict]) -> int:
+        if not rows:
+            return 0
+        self.db.execute(update(Payment), rows)
+        self.db.commit()
+        return len(rows)
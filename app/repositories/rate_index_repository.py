@@ -0,0 +1,60 @@
+from typing import Optional, List
+from datetime import date
+from sqlalchemy.orm import Session
+
+from app.models.rate_index import RateIndex, RateIndexValue
+
+class RateIndexRepository:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_by_id(self, id: int) -> Optional[RateIndex]:
+        return self.db.query(RateIndex).filter(RateIndex.id == id).first()
+    
+    def get_by_code(self, code: str) -> Optional[RateIndex]:
+        return self.db.query(RateIndex).filter(RateIndex.code == code).first()
+    
+    def get_all(self) -> List[RateIndex]:
+        return self.db.query(RateIndex).order_by(RateIndex.code).all()
+    
+    def create(self, rate_index: RateIndex) -> RateIndex:
+        self.db.add(rate_index)
+        self.db.commit()
+        self.db.refresh(rate_index)
+        return rate_index
+    
+    def get_value(self, rate_index_id: int, effective_date: date) -> Optional[RateIndexValue]:
+        return (
+            self.db.query(RateIndexValue)
+            .filter(
+                RateIndexValue.rate_index_id == rate_index_id,
+                RateIndexValue.effective_date == effective_date
+            )
+            .first()
+        )
+    
+    def save_value(self, rate_index_value: RateIndexValue) -> RateIndexValue:
+        self.db.add(rate_index_value)
+        self.db.commit()
+        self.db.refresh(rate_index_value)
+        return rate_index_value
+    
+    def get_values(self, rate_index_id: int, limit: int = 100) -> List[RateIndexValue]:
+        return (
+            self.db.query(RateIndexValue)
+            .filter(RateIndexValue.rate_index_id == rate_index_id)
+            .order_by(RateIndexValue.effective_date.desc())
+            .limit(limit)
+            .all()
+        )
+    
+    def get_value_as_of(self, rate_index_id: int, as_of: date) -> Optional[RateIndexValue]:
+        return (
+            self.db.query(RateIndexValue)
+            .filter(
+                RateIndexValue.rate_index_id == rate_index_id,
+                RateIndexValue.effective_date <= as_of
+            )
+            .order_by(RateIndexValue.effective_date.desc())
+            .first()
+        )
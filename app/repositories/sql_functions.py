@@ -0,0 +1,43 @@
+from sqlalchemy import Integer
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+class days_between(FunctionElement):
+    type = Integer()
+    name = "days_between"
+    inherit_cache = True
+
+@compiles(days_between)
+def _days_between(element, compiler, **kw):
+    start, end = list(element.clauses)
+    return "(%s - %s)" % (compiler.process(end, **kw), compiler.process(start, **kw))
+
+@compiles(days_between, "sqlite")
+def _days_between_sqlite(element, compiler, **kw):
+    start, end = list(element.clauses)
+    return "CAST(julianday(%s) - julianday(%s) AS INTEGER)" % (
+        compiler.process(end, **kw),
+        compiler.process(start, **kw)
+    )
+
+class clamp(FunctionElement):
+    name = "clamp"
+    inherit_cache = True
+
+@compiles(clamp)
+def _clamp(element, compiler, **kw):
+    value, low, high = list(element.clauses)
+    return "LEAST(GREATEST(%s, %s), %s)" % (
+        compiler.process(value, **kw),
+        compiler.process(low, **kw),
+        compiler.process(high, **kw)
+    )
+
+@compiles(clamp, "sqlite")
+def _clamp_sqlite(element, compiler, **kw):
+    value, low, high = list(element.clauses)
+    return "MIN(MAX(%s, %s), %s)" % (
+        compiler.process(value, **kw),
+        compiler.process(low, **kw),
+        compiler.process(high, **kw)
+    )
@@ -1,4 +1,9 @@
 from app.routes.loans import router as loans_router
 from app.routes.amortization import router as amortization_router
+from app.routes.simulation import router as simulation_router
+from app.routes.portfolio import router as portfolio_router
+from app.routes.exports import router as exports_router
+from app.routes.rates import router as rates_router
+from app.routes.payments import router as payments_router
 
-__all__ = ["loans_router", "amortization_router"]
\ No newline at end of file
+__all__ = ["loans_router", "amortization_router", "simulation_router", "portfolio_router", "exports_router", "rates_router", "payments_router"]
\ No newline at end of file
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from typing import List
-from decimal import Decimal
+from typing import List, Union
+from datetime import date
+import orjson
 
 from app.schemas.amortization import (
     AmortizationScheduleResponse,
@@ -10,150 +13,140 @@ from app.schemas.amortization import (
 )
 from app.repositories.amortization_repository import AmortizationRepository
 from app.repositories.loan_repository import LoanRepository
-from app.dependencies import get_db, get_current_user
+from app.services.export_service import ExportService, EXPORT_MEDIA_TYPES
+from app.services.response_cache import make_etag
+from app.dependencies import get_read_db, get_current_user
+from app.routes.caching import conditional_response
 
 router = APIRouter(prefix="/api/loans/{loan_id}/amortization", tags=["amortization"])
 
+schedule_list_adapter = TypeAdapter(List[AmortizationScheduleResponse])
 
-@router.get("/", response_model=AmortizationScheduleListResponse)
-async def get_amortization_schedule(
-    loan_id: int,
-    current_user=Depends(get_current_user),
-    db: Session = Depends(get_db)
-) -> AmortizationScheduleListResponse:
+
+def _get_schedule_etag(db: Session, loan_id: int, current_user, forbidden_status: int) -> str:
     loan_repo = LoanRepository(db)
-    loan = loan_repo.get_by_id(loan_id)
+    validators = loan_repo.get_cache_validators(loan_id)
     
-    if not loan:
+    if not validators:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Préstamo {loan_id} no encontrado"
         )
     
-    if loan.user_id != current_user.id:
+    if validators.user_id != current_user.id:
+        if forbidden_status == status.HTTP_403_FORBIDDEN:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="No tienes permiso para ver este préstamo"
+            )
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permiso para ver este préstamo"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Préstamo {loan_id} no encontrado"
         )
     
+    return make_etag("amortization", loan_id, validators.updated_at, validators.schedule_version, date.today())
+
+
+@router.get("/", response_model=AmortizationScheduleListResponse)
+def get_amortization_schedule(
+    loan_id: int,
+    request: Request,
+    export_format: str = Query("json", alias="format", pattern="^(json|ndjson|csv)$"),
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+) -> Union[Response, StreamingResponse]:
+    etag = _get_schedule_etag(db, loan_id, current_user, status.HTTP_403_FORBIDDEN)
+    
     amortization_repo = AmortizationRepository(db)
-    schedules = amortization_repo.get_by_loan(loan_id)
+    if export_format != "json":
+        return StreamingResponse(
+            ExportService.stream(amortization_repo.iter_rows(loan_id=loan_id), export_format, date.today()),
+            media_type=EXPORT_MEDIA_TYPES[export_format],
+            headers={"Content-Disposition": f'attachment; filename="loan_{loan_id}_amortization.{export_format}"'}
+        )
+    
+    def build() -> bytes:
+        today = date.today()
+        rows = amortization_repo.get_rows_by_loan(loan_id)
+        return orjson.dumps({
+            "items": [ExportService.response_record(row, today) for row in rows],
+            "total": len(rows),
+            "loan_id": loan_id
+        })
     
-    return AmortizationScheduleListResponse(
-        items=[AmortizationScheduleResponse.model_validate(s) for s in schedules],
-        total=len(schedules),
-        loan_id=loan_id
-    )
+    return conditional_response(request, loan_id, etag, build)
 
 
 @router.get("/summary", response_model=AmortizationSummary)
-async def get_amortization_summary(
+def get_amortization_summary(
     loan_id: int,
+    request: Request,
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db)
-) -> AmortizationSummary:
-    loan_repo = LoanRepository(db)
-    loan = loan_repo.get_by_id(loan_id)
+    db: Session = Depends(get_read_db)
+) -> Response:
+    etag = _get_schedule_etag(db, loan_id, current_user, status.HTTP_404_NOT_FOUND)
     
-    if not loan or loan.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Préstamo {loan_id} no encontrado"
-        )
+    def build() -> bytes:
+        amortization_repo = AmortizationRepository(db)
+        return AmortizationSummary(**amortization_repo.get_summary(loan_id)).model_dump_json().encode()
     
-    amortization_repo = AmortizationRepository(db)
-    schedules = amortization_repo.get_by_loan(loan_id)
-    
-    total_payments = len(schedules)
-    total_to_pay = sum(Decimal(str(s.scheduled_payment)) for s in schedules)
-    total_interest = sum(Decimal(str(s.scheduled_interest)) for s in schedules)
-    total_principal = sum(Decimal(str(s.scheduled_principal)) for s in schedules)
-    
-    paid_schedules = [s for s in schedules if s.status == "paid"]
-    payments_made = len(paid_schedules)
-    amount_paid = sum(Decimal(str(s.scheduled_payment)) for s in paid_schedules)
-    
-    pending_schedules = [s for s in schedules if s.status in ["pending", "partial", "overdue"]]
-    payments_pending = len(pending_schedules)
-    amount_pending = sum(Decimal(str(s.scheduled_payment)) for s in pending_schedules)
-    
-    return AmortizationSummary(
-        total_payments=total_payments,
-        total_to_pay=total_to_pay,
-        total_interest=total_interest,
-        total_principal=total_principal,
-        payments_made=payments_made,
-        payments_pending=payments_pending,
-        amount_paid=amount_paid,
-        amount_pending=amount_pending
-    )
+    return conditional_response(request, loan_id, etag, build)
 
 
 @router.get("/pending", response_model=List[AmortizationScheduleResponse])
-async def get_pending_payments(
+def get_pending_payments(
     loan_id: int,
+    request: Request,
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db)
-) -> List[AmortizationScheduleResponse]:
-    loan_repo = LoanRepository(db)
-    loan = loan_repo.get_by_id(loan_id)
+    db: Session = Depends(get_read_db)
+) -> Response:
+    etag = _get_schedule_etag(db, loan_id, current_user, status.HTTP_404_NOT_FOUND)
     
-    if not loan or loan.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Préstamo {loan_id} no encontrado"
-        )
+    def build() -> bytes:
+        amortization_repo = AmortizationRepository(db)
+        schedules = amortization_repo.get_pending(loan_id)
+        return schedule_list_adapter.dump_json([AmortizationScheduleResponse.model_validate(s) for s in schedules])
     
-    amortization_repo = AmortizationRepository(db)
-    schedules = amortization_repo.get_pending(loan_id)
-    
-    return [AmortizationScheduleResponse.model_validate(s) for s in schedules]
+    return conditional_response(request, loan_id, etag, build)
 
 
 @router.get("/overdue", response_model=List[AmortizationScheduleResponse])
-async def get_overdue_payments(
+def get_overdue_payments(
     loan_id: int,
+    request: Request,
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db)
-) -> List[AmortizationScheduleResponse]:
-    loan_repo = LoanRepository(db)
-    loan = loan_repo.get_by_id(loan_id)
+    db: Session = Depends(get_read_db)
+) -> Response:
+    etag = _get_schedule_etag(db, loan_id, current_user, status.HTTP_404_NOT_FOUND)
     
-    if not loan or loan.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Préstamo {loan_id} no encontrado"
-        )
+    def build() -> bytes:
+        amortization_repo = AmortizationRepository(db)
+        schedules = amortization_repo.get_overdue(loan_id)
+        return schedule_list_adapter.dump_json([AmortizationScheduleResponse.model_validate(s) for s in schedules])
     
-    amortization_repo = AmortizationRepository(db)
-    schedules = amortization_repo.get_overdue(loan_id)
-    
-    return [AmortizationScheduleResponse.model_validate(s) for s in schedules]
+    return conditional_response(request, loan_id, etag, build)
 
 
 @router.get("/{payment_number}", response_model=AmortizationScheduleResponse)
-async def get_payment_by_number(
+def get_payment_by_number(
     loan_id: int,
     payment_number: int,
+    request: Request,
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db)
-) -> AmortizationScheduleResponse:
-    loan_repo = LoanRepository(db)
-    loan = loan_repo.get_by_id(loan_id)
+    db: Session = Depends(get_read_db)
+) -> Response:
+    etag = _get_schedule_etag(db, loan_id, current_user, status.HTTP_404_NOT_FOUND)
     
-    if not loan or loan.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Préstamo {loan_id} no encontrado"
-        )
+    def build() -> bytes:
+        amortization_repo = AmortizationRepository(db)
+        schedule = amortization_repo.get_by_payment_number(loan_id, payment_number)
     
-    amortization_repo = AmortizationRepository(db)
-    schedule = amortization_repo.get_by_payment_number(loan_id, payment_number)
+        if not schedule:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Cuota #{payment_number} no encontrada"
+            )
     
-    if not schedule:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Cuota #{payment_number} no encontrada"
-        )
+        return AmortizationScheduleResponse.model_validate(schedule).model_dump_json().encode()
     
-    return AmortizationScheduleResponse.model_validate(schedule)
\ No newline at end of file
+    return conditional_response(request, loan_id, etag, build)
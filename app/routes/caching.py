@@ -0,0 +1,17 @@
+from typing import Callable
+from fastapi import Request, Response
+
+from app.services.response_cache import response_cache, etag_matches, ResponseCache
+
+
+def conditional_response(request: Request, loan_id: int, etag: str, build: Callable[[], bytes]) -> Response:
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    
+    key = ResponseCache.loan_key(loan_id, request.url.path, request.url.query, etag)
+    body = response_cache.get(key)
+    if body is None:
+        body = build()
+        response_cache.set(key, body)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from datetime import date
+
+from app.config import settings
+from app.repositories.amortization_repository import AmortizationRepository
+from app.services.export_service import ExportService, EXPORT_MEDIA_TYPES
+from app.dependencies import get_read_db, get_current_user
+
+router = APIRouter(prefix="/api/exports", tags=["exports"])
+
+
+@router.get("/amortization")
+def export_amortization_schedules(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    scope: str = Query("user", pattern="^(user|portfolio)$"),
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+) -> StreamingResponse:
+    if scope == "portfolio" and not settings.EXPORT_PORTFOLIO_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="La exportación de toda la cartera no está habilitada"
+        )
+    
+    amortization_repo = AmortizationRepository(db)
+    rows = amortization_repo.iter_rows(
+        user_id=current_user.id if scope == "user" else None,
+        batch_size=settings.EXPORT_BATCH_SIZE
+    )
+    return StreamingResponse(
+        ExportService.stream(rows, export_format, date.today()),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="amortization_{scope}.{export_format}"'}
+    )
@@ -1,15 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from typing import Optional
 
 from app.schemas.loan import LoanCreate, LoanUpdate, LoanResponse, LoanListResponse, LoanSummary
 from app.services.loan_service import LoanService
-from app.dependencies import get_db, get_loan_service, get_current_user
+from app.repositories.pagination import InvalidCursor
+from app.services.response_cache import make_etag
+from app.dependencies import get_loan_service, get_read_loan_service, get_current_user
+from app.routes.caching import conditional_response
 
 router = APIRouter(prefix="/api/loans", tags=["loans"])
 
 @router.post("/", response_model=LoanResponse, status_code=status.HTTP_201_CREATED)
-async def create_loan(loan_data: LoanCreate, current_user = Depends(get_current_user), db: Session = Depends(get_db)) -> LoanResponse:
-    service = get_loan_service(db)
+def create_loan(loan_data: LoanCreate, current_user = Depends(get_current_user), service: LoanService = Depends(get_loan_service)) -> LoanResponse:
     try:
         return service.create_loan(loan_data, user_id=current_user.id)
     except Exception as e:
@@ -25,53 +27,57 @@ async def create_loan(loan_data: LoanCreate, current_user = Depends(get_current_
         )
 
 @router.get("/", response_model=LoanListResponse)
-async def get_loans(skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=500), 
-                    current_user = Depends(get_current_user), db: Session = Depends(get_db)) -> LoanListResponse:
-    service = get_loan_service(db)
-    return service.get_all_loans(skip=skip, limit=limit, user_id=current_user.id)
+def get_loans(skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=500), 
+              cursor: Optional[str] = Query(None), include_total: bool = Query(True),
+              current_user = Depends(get_current_user), service: LoanService = Depends(get_read_loan_service)) -> LoanListResponse:
+    try:
+        return service.get_all_loans(skip=skip, limit=limit, user_id=current_user.id, cursor=cursor, include_total=include_total)
+    except InvalidCursor:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor de paginación inválido")
 
 @router.get("/active", response_model=list[LoanSummary])
-async def get_active_loans(current_user = Depends(get_current_user), db: Session = Depends(get_db)) -> list[LoanSummary]:
-    service = get_loan_service(db)
+def get_active_loans(current_user = Depends(get_current_user), service: LoanService = Depends(get_read_loan_service)) -> list[LoanSummary]:
     return service.get_active_user_loans(user_id=current_user.id)
 
 @router.get("/{loan_id}", response_model=LoanResponse)
-async def get_loan(loan_id: int, current_user = Depends(get_current_user), db: Session = Depends(get_db)) -> LoanResponse:
-    service = get_loan_service(db)
-    loan = service.get_loan_by_id(loan_id, user_id=current_user.id)
-    if not loan:
+def get_loan(loan_id: int, request: Request, current_user = Depends(get_current_user), service: LoanService = Depends(get_read_loan_service)) -> Response:
+    validators = service.get_loan_validators(loan_id, user_id=current_user.id)
+    if not validators:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Préstamo {loan_id} no encontrado")
-    return loan
+    
+    def build() -> bytes:
+        loan = service.get_loan_by_id(loan_id, user_id=current_user.id)
+        if not loan:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Préstamo {loan_id} no encontrado")
+        return loan.model_dump_json().encode()
+    
+    etag = make_etag("loan", loan_id, validators.updated_at, validators.schedule_version)
+    return conditional_response(request, loan_id, etag, build)
 
 @router.patch("/{loan_id}", response_model=LoanResponse)
-async def update_loan(loan_id: int, loan_data: LoanUpdate, current_user = Depends(get_current_user), db: Session = Depends(get_db)) -> LoanResponse:
-    service = get_loan_service(db)
+def update_loan(loan_id: int, loan_data: LoanUpdate, current_user = Depends(get_current_user), service: LoanService = Depends(get_loan_service)) -> LoanResponse:
     updated_loan = service.update_loan(loan_id, loan_data, user_id=current_user.id)
     if not updated_loan:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Préstamo {loan_id} no encontrado")
     return updated_loan
 
 @router.delete("/{loan_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_loan(loan_id: int, current_user = Depends(get_current_user), db: Session = Depends(get_db)):
-    service = get_loan_service(db)
+def delete_loan(loan_id: int, current_user = Depends(get_current_user), service: LoanService = Depends(get_loan_service)):
     success = service.delete_loan(loan_id, user_id=current_user.id, hard=False)
     if not success:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Préstamo {loan_id} no encontrado")
     return None
 
 @router.delete("/{loan_id}/hard", status_code=status.HTTP_204_NO_CONTENT)
-async def hard_delete_loan(loan_id: int, current_user = Depends(get_current_user), db: Session = Depends(get_db)):
-    service = get_loan_service(db)
+def hard_delete_loan(loan_id: int, current_user = Depends(get_current_user), service: LoanService = Depends(get_loan_service)):
     success = service.delete_loan(loan_id, user_id=current_user.id, hard=True)
     if not success:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Préstamo {loan_id} no encontrado")
     return None
 
 @router.post("/{loan_id}/restore", response_model=LoanResponse)
-async def restore_loan(loan_id: int, current_user = Depends(get_current_user), db: Session = Depends(get_db)) -> LoanResponse:
-    service = get_loan_service(db)
-    success = service.restore_loan(loan_id, user_id=current_user.id)
-    if not success:
+def restore_loan(loan_id: int, current_user = Depends(get_current_user), service: LoanService = Depends(get_loan_service)) -> LoanResponse:
+    loan = service.restore_loan(loan_id, user_id=current_user.id)
+    if not loan:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Préstamo {loan_id} no encontrado o no está eliminado")
-    loan = service.get_loan_by_id(loan_id, user_id=current_user.id)
     return loan
\ No newline at end of file
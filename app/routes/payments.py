@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.schemas.payment import PaymentBulkRequest, PaymentIngestionResult
+from app.repositories.payment_repository import PaymentRepository
+from app.repositories.amortization_repository import AmortizationRepository
+from app.repositories.loan_repository import LoanRepository
+from app.services.payment_service import PaymentService
+from app.dependencies import get_db, get_current_user
+
+router = APIRouter(prefix="/api/payments", tags=["payments"])
+
+
+@router.post("/bulk", response_model=PaymentIngestionResult)
+def ingest_payments(
+    request: PaymentBulkRequest,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> PaymentIngestionResult:
+    payment_service = PaymentService(PaymentRepository(db), AmortizationRepository(db), LoanRepository(db))
+    return PaymentIngestionResult(**payment_service.ingest(
+        (payment.model_dump() for payment in request.payments),
+        user_id=current_user.id
+    ))
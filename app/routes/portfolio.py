@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from datetime import date
+from decimal import Decimal
+
+from app.schemas.portfolio import PortfolioLoanSummary, PortfolioSummary
+from app.repositories.loan_repository import LoanRepository
+from app.dependencies import get_read_db, get_current_user
+
+router = APIRouter(prefix="/api/portfolio", tags=["portfolio"])
+
+
+@router.get("/summary", response_model=PortfolioSummary)
+def get_portfolio_summary(
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+) -> PortfolioSummary:
+    today = date.today()
+    loan_repo = LoanRepository(db)
+    loans = [PortfolioLoanSummary(**row) for row in loan_repo.get_portfolio_summary(current_user.id, today)]
+    due_dates = [loan.next_due_date for loan in loans if loan.next_due_date]
+    
+    return PortfolioSummary(
+        loans=loans,
+        total_loans=len(loans),
+        total_outstanding_balance=sum((loan.outstanding_balance for loan in loans), Decimal("0")),
+        total_overdue_payments=sum(loan.overdue_payments for loan in loans),
+        total_overdue_amount=sum((loan.overdue_amount for loan in loans), Decimal("0")),
+        total_accrued_penalties=sum((loan.accrued_penalties for loan in loans), Decimal("0")),
+        next_due_date=min(due_dates) if due_dates else None,
+        as_of=today
+    )
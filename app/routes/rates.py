@@ -0,0 +1,121 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import date
+
+from app.config import settings
+from app.models.rate_index import RateIndex, RateIndexValue
+from app.schemas.rate_index import (
+    RateIndexCreate,
+    RateIndexResponse,
+    RateIndexValueCreate,
+    RateIndexValueResponse,
+    RepricingResult
+)
+from app.repositories.rate_index_repository import RateIndexRepository
+from app.repositories.loan_repository import LoanRepository
+from app.repositories.amortization_repository import AmortizationRepository
+from app.services.repricing_service import RepricingService, run_repricing
+from app.dependencies import get_db, get_current_user
+
+router = APIRouter(prefix="/api/rates", tags=["rates"])
+
+
+def _get_rate_index(rate_index_repo: RateIndexRepository, index_id: int) -> RateIndex:
+    rate_index = rate_index_repo.get_by_id(index_id)
+    if not rate_index:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Índice de tasa {index_id} no encontrado"
+        )
+    return rate_index
+
+
+def _ensure_rate_admin() -> None:
+    # Index values reprice every linked loan of every user, so writes stay off unless enabled.
+    if not settings.RATE_ADMIN_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="La administración de índices de tasa no está habilitada"
+        )
+
+
+@router.get("/indexes", response_model=List[RateIndexResponse])
+def get_rate_indexes(
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> List[RateIndexResponse]:
+    rate_index_repo = RateIndexRepository(db)
+    return [RateIndexResponse.model_validate(rate_index) for rate_index in rate_index_repo.get_all()]
+
+
+@router.post("/indexes", response_model=RateIndexResponse, status_code=status.HTTP_201_CREATED)
+def create_rate_index(
+    index_data: RateIndexCreate,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> RateIndexResponse:
+    _ensure_rate_admin()
+    rate_index_repo = RateIndexRepository(db)
+    if rate_index_repo.get_by_code(index_data.code):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"El índice de tasa {index_data.code} ya existe"
+        )
+    rate_index = rate_index_repo.create(RateIndex(code=index_data.code, name=index_data.name))
+    return RateIndexResponse.model_validate(rate_index)
+
+
+@router.get("/indexes/{index_id}/values", response_model=List[RateIndexValueResponse])
+def get_rate_index_values(
+    index_id: int,
+    limit: int = Query(100, ge=1, le=1000),
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> List[RateIndexValueResponse]:
+    rate_index_repo = RateIndexRepository(db)
+    _get_rate_index(rate_index_repo, index_id)
+    return [RateIndexValueResponse.model_validate(value) for value in rate_index_repo.get_values(index_id, limit)]
+
+
+@router.post("/indexes/{index_id}/values", response_model=RateIndexValueResponse, status_code=status.HTTP_201_CREATED)
+def publish_rate_index_value(
+    index_id: int,
+    value_data: RateIndexValueCreate,
+    background_tasks: BackgroundTasks,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> RateIndexValueResponse:
+    _ensure_rate_admin()
+    rate_index_repo = RateIndexRepository(db)
+    _get_rate_index(rate_index_repo, index_id)
+    
+    rate_index_value = rate_index_repo.get_value(index_id, value_data.effective_date)
+    if rate_index_value:
+        rate_index_value.value = value_data.value
+    else:
+        rate_index_value = RateIndexValue(
+            rate_index_id=index_id,
+            effective_date=value_data.effective_date,
+            value=value_data.value
+        )
+    rate_index_value = rate_index_repo.save_value(rate_index_value)
+    
+    if value_data.reprice and value_data.effective_date <= date.today():
+        background_tasks.add_task(run_repricing, index_id)
+    
+    return RateIndexValueResponse.model_validate(rate_index_value)
+
+
+@router.post("/indexes/{index_id}/reprice", response_model=RepricingResult)
+def reprice_rate_index(
+    index_id: int,
+    as_of: Optional[date] = Query(None),
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> RepricingResult:
+    _ensure_rate_admin()
+    rate_index_repo = RateIndexRepository(db)
+    _get_rate_index(rate_index_repo, index_id)
+    repricing_service = RepricingService(LoanRepository(db), AmortizationRepository(db), rate_index_repo)
+    return RepricingResult(**repricing_service.reprice(index_id, as_of=as_of))
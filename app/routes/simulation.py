@@ -0,0 +1,42 @@
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from app.schemas.loan import LoanCreate
+from app.schemas.simulation import SimulationResponse, SimulationBatchRequest, SimulationBatchResult
+from app.schemas.prepayment import PrepaymentRequest, PrepaymentComparison
+from app.services.simulation_service import SimulationService
+from app.services.prepayment_service import PrepaymentService
+
+router = APIRouter(prefix="/api/simulate", tags=["simulation"])
+
+
+@router.post(
+    "",
+    response_class=StreamingResponse,
+    responses={200: {"model": SimulationResponse, "content": {"application/json": {}}}}
+)
+async def simulate_loan(loan_data: LoanCreate) -> StreamingResponse:
+    return StreamingResponse(SimulationService.iter_json(loan_data), media_type="application/json")
+
+
+@router.post(
+    "/batch",
+    response_class=StreamingResponse,
+    responses={200: {"model": SimulationBatchResult, "content": {"application/x-ndjson": {}}}}
+)
+async def simulate_batch(batch: SimulationBatchRequest) -> StreamingResponse:
+    return StreamingResponse(
+        SimulationService.iter_batch_ndjson(batch.items, batch.include_schedule),
+        media_type="application/x-ndjson"
+    )
+
+
+@router.post("/prepayments", response_model=PrepaymentComparison)
+def compare_prepayments(request: PrepaymentRequest) -> PrepaymentComparison:
+    try:
+        return PrepaymentService.compare(request.loan, request.scenarios)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Escenario de prepago inválido: {e}"
+        )
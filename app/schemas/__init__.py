@@ -4,8 +4,26 @@ from app.schemas.loan import (
 from app.schemas.amortization import (
     AmortizationScheduleResponse, AmortizationScheduleListResponse, AmortizationSummary
 )
+from app.schemas.simulation import (
+    SimulationSummary, SimulationScheduleItem, SimulationResponse,
+    SimulationBatchRequest, SimulationBatchResult
+)
+from app.schemas.portfolio import PortfolioLoanSummary, PortfolioSummary
+from app.schemas.prepayment import (
+    PrepaymentLumpSum, PrepaymentRecurring, PrepaymentScenario, PrepaymentRequest,
+    PrepaymentScenarioResult, PrepaymentComparison
+)
+from app.schemas.rate_index import (
+    RateIndexCreate, RateIndexResponse, RateIndexValueCreate, RateIndexValueResponse, RepricingResult
+)
 
 __all__ = [
     "LoanBase", "LoanCreate", "LoanUpdate", "LoanResponse", "LoanListResponse", "LoanSummary",
-    "AmortizationScheduleResponse", "AmortizationScheduleListResponse", "AmortizationSummary"
+    "AmortizationScheduleResponse", "AmortizationScheduleListResponse", "AmortizationSummary",
+    "SimulationSummary", "SimulationScheduleItem", "SimulationResponse",
+    "SimulationBatchRequest", "SimulationBatchResult",
+    "PortfolioLoanSummary", "PortfolioSummary",
+    "PrepaymentLumpSum", "PrepaymentRecurring", "PrepaymentScenario", "PrepaymentRequest",
+    "PrepaymentScenarioResult", "PrepaymentComparison",
+    "RateIndexCreate", "RateIndexResponse", "RateIndexValueCreate", "RateIndexValueResponse", "RepricingResult"
 ]
\ No newline at end of file
@@ -22,6 +22,8 @@ class LoanBase(BaseModel):
     insurance_monthly: Decimal = Field(default=Decimal("0"), ge=0)
     
     rate_type: str = Field(default="fixed")
+    rate_index_id: Optional[int] = None
+    rate_margin: Decimal = Field(default=Decimal("0"), ge=-100, le=100)
     interest_calculation_method: str = Field(default="30/360")
     grace_period_months: int = Field(default=0, ge=0)
     late_payment_penalty_rate: Decimal = Field(default=Decimal("0"), ge=0, le=100)
@@ -102,6 +104,8 @@ class LoanUpdate(BaseModel):
     insurance_monthly: Optional[Decimal] = Field(None, ge=0)
     
     rate_type: Optional[str] = None
+    rate_index_id: Optional[int] = None
+    rate_margin: Optional[Decimal] = Field(None, ge=-100, le=100)
     interest_calculation_method: Optional[str] = None
     grace_period_months: Optional[int] = Field(None, ge=0)
     late_payment_penalty_rate: Optional[Decimal] = Field(None, ge=0, le=100)
@@ -166,9 +170,10 @@ class LoanResponse(LoanBase):
 
 class LoanListResponse(BaseModel):
     items: list[LoanResponse]
-    total: int
+    total: Optional[int] = None
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
 
 class LoanSummary(BaseModel):
     id: int
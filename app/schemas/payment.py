@@ -0,0 +1,27 @@
+from pydantic import BaseModel, Field
+from datetime import date
+from decimal import Decimal
+
+from app.config import settings
+
+class PaymentCreate(BaseModel):
+    loan_id: int
+    reference: str = Field(..., min_length=1, max_length=100)
+    payment_date: date
+    amount: Decimal = Field(..., gt=0, decimal_places=2)
+
+class PaymentBulkRequest(BaseModel):
+    payments: list[PaymentCreate] = Field(..., min_length=1, max_length=settings.PAYMENT_BULK_MAX_ITEMS)
+
+class PaymentIngestionResult(BaseModel):
+    received: int
+    duplicates: int
+    rejected: int
+    applied: int
+    partially_applied: int
+    unapplied: int
+    installments_paid: int
+    installments_partial: int
+    loans_affected: int
+    chunks: int
+    duration_ms: float
@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import date
+from decimal import Decimal
+
+class PortfolioLoanSummary(BaseModel):
+    loan_id: int
+    name: str
+    type: str
+    status: str
+    outstanding_balance: Decimal
+    next_payment_number: Optional[int] = None
+    next_due_date: Optional[date] = None
+    next_due_amount: Optional[Decimal] = None
+    overdue_payments: int
+    overdue_amount: Decimal
+    accrued_penalties: Decimal
+
+class PortfolioSummary(BaseModel):
+    loans: list[PortfolioLoanSummary]
+    total_loans: int
+    total_outstanding_balance: Decimal
+    total_overdue_payments: int
+    total_overdue_amount: Decimal
+    total_accrued_penalties: Decimal
+    next_due_date: Optional[date] = None
+    as_of: date
@@ -0,0 +1,52 @@
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional
+from datetime import date
+from decimal import Decimal
+
+from app.config import settings
+from app.schemas.loan import LoanCreate
+
+class PrepaymentLumpSum(BaseModel):
+    payment_number: int = Field(..., ge=1)
+    amount: Decimal = Field(..., gt=0)
+
+class PrepaymentRecurring(BaseModel):
+    amount: Decimal = Field(..., gt=0)
+    start_payment_number: int = Field(default=1, ge=1)
+    end_payment_number: Optional[int] = Field(default=None, ge=1)
+    every: int = Field(default=1, ge=1)
+
+class PrepaymentScenario(BaseModel):
+    name: Optional[str] = Field(None, max_length=255)
+    strategy: str = Field(default="reduce_term")
+    lump_sums: list[PrepaymentLumpSum] = Field(default_factory=list)
+    recurring: list[PrepaymentRecurring] = Field(default_factory=list)
+    
+    @field_validator("strategy")
+    @classmethod
+    def validate_strategy(cls, v: str) -> str:
+        allowed = ["reduce_term", "reduce_payment"]
+        if v not in allowed:
+            raise ValueError(f"Strategy must be one of: {allowed}")
+        return v
+
+class PrepaymentRequest(BaseModel):
+    loan: LoanCreate
+    scenarios: list[PrepaymentScenario] = Field(..., min_length=1, max_length=settings.PREPAYMENT_MAX_SCENARIOS)
+
+class PrepaymentScenarioResult(BaseModel):
+    name: Optional[str] = None
+    strategy: Optional[str] = None
+    payoff_payment_number: int
+    payoff_date: date
+    payments_saved: int
+    total_to_pay: Decimal
+    total_interest: Decimal
+    total_extra: Decimal
+    interest_saved: Decimal
+    monthly_payment: Decimal
+    final_monthly_payment: Decimal
+
+class PrepaymentComparison(BaseModel):
+    base: PrepaymentScenarioResult
+    scenarios: list[PrepaymentScenarioResult]
@@ -0,0 +1,43 @@
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Optional
+from datetime import datetime, date
+from decimal import Decimal
+
+class RateIndexCreate(BaseModel):
+    code: str = Field(..., min_length=1, max_length=50)
+    name: str = Field(..., min_length=1, max_length=255)
+
+class RateIndexResponse(BaseModel):
+    id: int
+    code: str
+    name: str
+    created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
+
+class RateIndexValueCreate(BaseModel):
+    effective_date: date
+    value: Decimal = Field(..., ge=-100, le=100)
+    reprice: bool = True
+
+class RateIndexValueResponse(BaseModel):
+    id: int
+    rate_index_id: int
+    effective_date: date
+    value: Decimal
+    created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
+
+class RepricingResult(BaseModel):
+    rate_index_id: int
+    as_of: date
+    index_value: Optional[Decimal] = None
+    loans_repriced: int
+    installments_written: int
+    installments_deleted: int
+    rates_clamped: int
+    skipped_stale: int
+    failed: int
+    chunks: int
+    duration_ms: float
@@ -0,0 +1,42 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import date
+from decimal import Decimal
+
+from app.config import settings
+from app.schemas.loan import LoanCreate
+
+class SimulationSummary(BaseModel):
+    monthly_payment: Decimal
+    total_payments: int
+    total_to_pay: Decimal
+    total_principal: Decimal
+    total_interest: Decimal
+    total_insurance: Decimal
+    start_date: date
+    first_payment_date: Optional[date] = None
+    last_payment_date: Optional[date] = None
+
+class SimulationScheduleItem(BaseModel):
+    payment_number: int
+    due_date: date
+    scheduled_payment: Decimal
+    scheduled_principal: Decimal
+    scheduled_interest: Decimal
+    insurance_amount: Decimal
+    remaining_balance: Decimal
+    is_grace_period: bool
+
+class SimulationResponse(BaseModel):
+    summary: SimulationSummary
+    items: list[SimulationScheduleItem]
+
+class SimulationBatchRequest(BaseModel):
+    items: list[LoanCreate] = Field(..., min_length=1, max_length=settings.SIMULATION_BATCH_MAX_ITEMS)
+    include_schedule: bool = True
+
+class SimulationBatchResult(BaseModel):
+    index: int
+    summary: Optional[SimulationSummary] = None
+    items: Optional[list[SimulationScheduleItem]] = None
+    error: Optional[str] = None
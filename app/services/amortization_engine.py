@@ -0,0 +1,213 @@
+from decimal import Decimal, ROUND_HALF_UP
+from datetime import date
+from typing import List, Dict, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from app.services.calculation_service import CalculationService
+from app.services.payment_calendar import PaymentCalendar
+
+CENT = Decimal("0.01")
+
+
+class AmortizationColumns:
+    def __init__(
+        self,
+        due_date: List[date],
+        scheduled_payment: List[int],
+        scheduled_principal: List[int],
+        scheduled_interest: List[int],
+        insurance_amount: List[int],
+        remaining_balance: List[int],
+        is_grace_period: List[bool],
+        first_payment_number: int = 1
+    ):
+        self.payment_number = tuple(range(first_payment_number, first_payment_number + len(due_date)))
+        self.due_date = tuple(due_date)
+        self.scheduled_payment = tuple(scheduled_payment)
+        self.scheduled_principal = tuple(scheduled_principal)
+        self.scheduled_interest = tuple(scheduled_interest)
+        self.insurance_amount = tuple(insurance_amount)
+        self.remaining_balance = tuple(remaining_balance)
+        self.is_grace_period = tuple(is_grace_period)
+
+    def __len__(self) -> int:
+        return len(self.payment_number)
+
+    def with_dates(self, due_date: List[date]) -> "AmortizationColumns":
+        return AmortizationColumns(
+            due_date=due_date,
+            scheduled_payment=self.scheduled_payment,
+            scheduled_principal=self.scheduled_principal,
+            scheduled_interest=self.scheduled_interest,
+            insurance_amount=self.insurance_amount,
+            remaining_balance=self.remaining_balance,
+            is_grace_period=self.is_grace_period,
+            first_payment_number=self.payment_number[0] if self.payment_number else 1
+        )
+
+    def to_rows(self) -> List[Dict]:
+        return [
+            {
+                "payment_number": number,
+                "due_date": due_date,
+                "scheduled_payment": payment / 100,
+                "scheduled_principal": principal / 100,
+                "scheduled_interest": interest / 100,
+                "insurance_amount": insurance / 100,
+                "remaining_balance": max(balance, 0) / 100,
+                "is_grace_period": grace
+            }
+            for number, due_date, payment, principal, interest, insurance, balance, grace in zip(
+                self.payment_number,
+                self.due_date,
+                self.scheduled_payment,
+                self.scheduled_principal,
+                self.scheduled_interest,
+                self.insurance_amount,
+                self.remaining_balance,
+                self.is_grace_period
+            )
+        ]
+
+    def totals(self) -> Dict[str, Decimal]:
+        return {
+            "total_to_pay": Decimal(sum(self.scheduled_payment)).scaleb(-2),
+            "total_principal": Decimal(sum(self.scheduled_principal)).scaleb(-2),
+            "total_interest": Decimal(sum(self.scheduled_interest)).scaleb(-2),
+            "total_insurance": Decimal(sum(self.insurance_amount)).scaleb(-2)
+        }
+
+    def as_arrays(self) -> Dict:
+        if np is None:
+            raise RuntimeError("NumPy is not installed")
+        return {
+            "payment_number": np.asarray(self.payment_number, dtype=np.int32),
+            "due_date": np.asarray(self.due_date, dtype="datetime64[D]"),
+            "scheduled_payment": np.asarray(self.scheduled_payment, dtype=np.int64),
+            "scheduled_principal": np.asarray(self.scheduled_principal, dtype=np.int64),
+            "scheduled_interest": np.asarray(self.scheduled_interest, dtype=np.int64),
+            "insurance_amount": np.asarray(self.insurance_amount, dtype=np.int64),
+            "remaining_balance": np.maximum(np.asarray(self.remaining_balance, dtype=np.int64), 0),
+            "is_grace_period": np.asarray(self.is_grace_period, dtype=bool)
+        }
+
+
+class AmortizationEngine:
+    @staticmethod
+    def supports(principal: Decimal, insurance_monthly: Decimal = Decimal("0")) -> bool:
+        return all(
+            Decimal(str(amount)) == Decimal(str(amount)).quantize(CENT)
+            for amount in (principal, insurance_monthly)
+        )
+
+    @staticmethod
+    def generate(
+        principal: Decimal,
+        annual_rate: Decimal,
+        months: int,
+        start_date: date,
+        payment_day: int = 1,
+        payment_frequency: str = "monthly",
+        insurance_monthly: Decimal = Decimal("0"),
+        grace_period_months: int = 0,
+        interest_calculation_method: str = "30/360",
+        first_payment_number: int = 1
+    ) -> AmortizationColumns:
+        balance = AmortizationEngine._to_cents(principal, "principal")
+        insurance = AmortizationEngine._to_cents(insurance_monthly, "insurance_monthly")
+        base_payment = AmortizationEngine._to_cents(
+            CalculationService._calculate_base_payment(principal, annual_rate, months),
+            "base payment"
+        )
+
+        rate_num, period_den, period_rate, per_day = AmortizationEngine.interest_terms(
+            annual_rate, interest_calculation_method
+        )
+
+        payments = []
+        principals = []
+        interests = []
+        balances = []
+        grace_flags = []
+
+        due_dates = PaymentCalendar.due_dates(start_date, payment_day, payment_frequency, months)
+        period_days = PaymentCalendar.day_counts(start_date, due_dates, interest_calculation_method)
+
+        for i, days in enumerate(period_days, start=1):
+            numerator = balance * rate_num * days if per_day else balance * rate_num
+
+            # Exact half-cent ties are the only place the 28-digit Decimal path can round
+            # differently from the exact rational value, so they are recomputed with Decimal.
+            interest, tie = AmortizationEngine._round_half_up(numerator, period_den)
+            if tie:
+                interest = AmortizationEngine._decimal_interest(balance, period_rate, days, per_day)
+
+            grace = i <= grace_period_months
+            if grace:
+                principal_payment = 0
+                total_payment = interest + insurance
+            else:
+                principal_payment = base_payment - interest
+                total_payment = base_payment + insurance
+
+            if i == months:
+                principal_payment = balance
+                total_payment = balance + interest + insurance
+
+            balance -= principal_payment
+
+            payments.append(total_payment)
+            principals.append(principal_payment)
+            interests.append(interest)
+            balances.append(balance)
+            grace_flags.append(grace)
+
+        return AmortizationColumns(
+            due_date=due_dates,
+            scheduled_payment=payments,
+            scheduled_principal=principals,
+            scheduled_interest=interests,
+            insurance_amount=[insurance] * months,
+            remaining_balance=balances,
+            is_grace_period=grace_flags,
+            first_payment_number=first_payment_number
+        )
+
+    @staticmethod
+    def interest_terms(annual_rate: Decimal, interest_calculation_method: str) -> Tuple[int, int, Decimal, bool]:
+        # Interest for a period is balance_cents * rate_num * days / period_den, rounded half-up;
+        # period_rate is the Decimal rate the original loop used, kept for tie-breaking.
+        rate = Decimal(str(annual_rate))
+        rate_num, rate_den = rate.as_integer_ratio()
+        if interest_calculation_method == "30/360":
+            return rate_num, rate_den * 1200, rate / 100 / 12, False
+        if interest_calculation_method == "actual/365":
+            return rate_num, rate_den * 36500, rate / 100 / 365, True
+        return rate_num, rate_den * 36000, rate / 100 / 360, True
+
+    @staticmethod
+    def _to_cents(amount: Decimal, field: str) -> int:
+        value = Decimal(str(amount))
+        if value != value.quantize(CENT):
+            raise ValueError(f"{field} must be expressed in whole cents")
+        return int(value.scaleb(2))
+
+    @staticmethod
+    def _round_half_up(numerator: int, denominator: int) -> Tuple[int, bool]:
+        quotient, remainder = divmod(abs(numerator), denominator)
+        twice = remainder * 2
+        tie = twice == denominator
+        if twice >= denominator:
+            quotient += 1
+        return (-quotient if numerator < 0 else quotient), tie
+
+    @staticmethod
+    def _decimal_interest(balance: int, period_rate: Decimal, days: int, per_day: bool) -> int:
+        amount = Decimal(balance).scaleb(-2) * period_rate
+        if per_day:
+            amount = amount * days
+        return int(amount.quantize(CENT, ROUND_HALF_UP).scaleb(2))
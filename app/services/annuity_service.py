@@ -0,0 +1,32 @@
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Tuple
+
+from app.services.cache import annuity_cache
+
+CENT = Decimal("0.01")
+
+
+class AnnuityService:
+    # The factor is kept as the (num, den) pair of P * (r * (1 + r) ** n) / ((1 + r) ** n - 1)
+    # rather than a single ratio, so P * num / den rounds exactly like the original expression.
+
+    @staticmethod
+    def factor(annual_rate: Decimal, months: int) -> Tuple[Decimal, Decimal]:
+        key = (Decimal(str(annual_rate)), months)
+        cached = annuity_cache.get(key)
+        if cached is not None:
+            return cached
+
+        r = key[0] / 100 / 12
+        if r == 0:
+            factor = (Decimal(1), Decimal(months))
+        else:
+            growth = (1 + r) ** months
+            factor = (r * growth, growth - 1)
+        annuity_cache.set(key, factor)
+        return factor
+
+    @staticmethod
+    def payment(principal: Decimal, annual_rate: Decimal, months: int) -> Decimal:
+        num, den = AnnuityService.factor(annual_rate, months)
+        return (Decimal(str(principal)) * num / den).quantize(CENT, ROUND_HALF_UP)
@@ -1,7 +1,11 @@
 from decimal import Decimal, ROUND_HALF_UP
-from datetime import date, timedelta
-from typing import List, Dict
-from dateutil.relativedelta import relativedelta
+from datetime import date
+from typing import List, Dict, Tuple
+
+from app.metrics import schedule_generation
+from app.services.cache import schedule_cache, payment_cache, annuity_cache
+from app.services.annuity_service import AnnuityService
+from app.services.payment_calendar import PaymentCalendar
 
 class CalculationService:
     
@@ -12,9 +16,16 @@ class CalculationService:
         months: int,
         insurance_monthly: Decimal = Decimal("0")
     ) -> Decimal:
+        key = (Decimal(str(principal)), Decimal(str(annual_rate)), months, Decimal(str(insurance_monthly)))
+        cached = payment_cache.get(key)
+        if cached is not None:
+            return cached
+        
         base_payment = CalculationService._calculate_base_payment(principal, annual_rate, months)
         total_payment = base_payment + Decimal(str(insurance_monthly))
-        return total_payment.quantize(Decimal('0.01'), ROUND_HALF_UP)
+        total_payment = total_payment.quantize(Decimal('0.01'), ROUND_HALF_UP)
+        payment_cache.set(key, total_payment)
+        return total_payment
     
     @staticmethod
     def generate_amortization_schedule(
@@ -27,6 +38,38 @@ class CalculationService:
         insurance_monthly: Decimal = Decimal("0"),
         grace_period_months: int = 0,
         interest_calculation_method: str = "30/360"
+    ) -> List[Dict]:
+        from app.services.amortization_engine import AmortizationEngine
+        if not AmortizationEngine.supports(principal, insurance_monthly):
+            with schedule_generation.time(path="decimal"):
+                return CalculationService._generate_amortization_schedule_decimal(
+                    principal, annual_rate, months, start_date, payment_day, payment_frequency,
+                    insurance_monthly, grace_period_months, interest_calculation_method
+                )
+        
+        return CalculationService.generate_amortization_columns(
+            principal=principal,
+            annual_rate=annual_rate,
+            months=months,
+            start_date=start_date,
+            payment_day=payment_day,
+            payment_frequency=payment_frequency,
+            insurance_monthly=insurance_monthly,
+            grace_period_months=grace_period_months,
+            interest_calculation_method=interest_calculation_method
+        ).to_rows()
+    
+    @staticmethod
+    def _generate_amortization_schedule_decimal(
+        principal: Decimal,
+        annual_rate: Decimal,
+        months: int,
+        start_date: date,
+        payment_day: int = 1,
+        payment_frequency: str = "monthly",
+        insurance_monthly: Decimal = Decimal("0"),
+        grace_period_months: int = 0,
+        interest_calculation_method: str = "30/360"
     ) -> List[Dict]:
         monthly_rate = Decimal(str(annual_rate)) / 100 / 12
         base_payment = CalculationService._calculate_base_payment(principal, annual_rate, months)
@@ -35,23 +78,10 @@ class CalculationService:
         balance = Decimal(str(principal))
         schedule = []
         
-        current_date = CalculationService._get_first_payment_date(start_date, payment_day, payment_frequency)
+        due_dates = PaymentCalendar.due_dates(start_date, payment_day, payment_frequency, months)
+        period_days = PaymentCalendar.day_counts(start_date, due_dates, interest_calculation_method)
         
-        for i in range(1, months + 1):
-            if i == 1:
-                days_in_period = CalculationService._calculate_days_in_period(
-                    start_date, 
-                    current_date, 
-                    interest_calculation_method
-                )
-            else:
-                prev_date = CalculationService._get_previous_payment_date(current_date, payment_frequency, payment_day)
-                days_in_period = CalculationService._calculate_days_in_period(
-                    prev_date,
-                    current_date,
-                    interest_calculation_method
-                )
-            
+        for i, (current_date, days_in_period) in enumerate(zip(due_dates, period_days), start=1):
             if interest_calculation_method == "30/360":
                 interest = (balance * monthly_rate).quantize(Decimal('0.01'), ROUND_HALF_UP)
             elif interest_calculation_method == "actual/365":
@@ -84,11 +114,133 @@ class CalculationService:
                 "remaining_balance": float(max(balance, 0)),
                 "is_grace_period": i <= grace_period_months
             })
-            
-            current_date = CalculationService._get_next_payment_date(current_date, payment_frequency, payment_day)
         
         return schedule
     
+    @staticmethod
+    def generate_amortization_columns(
+        principal: Decimal,
+        annual_rate: Decimal,
+        months: int,
+        start_date: date,
+        payment_day: int = 1,
+        payment_frequency: str = "monthly",
+        insurance_monthly: Decimal = Decimal("0"),
+        grace_period_months: int = 0,
+        interest_calculation_method: str = "30/360"
+    ):
+        from app.services.amortization_engine import AmortizationEngine
+        key = CalculationService._schedule_cache_key(
+            principal, annual_rate, months, start_date, payment_day, payment_frequency,
+            insurance_monthly, grace_period_months, interest_calculation_method
+        )
+        columns = schedule_cache.get(key)
+        if columns is None:
+            with schedule_generation.time(path="engine"):
+                columns = AmortizationEngine.generate(
+                    principal=principal,
+                    annual_rate=annual_rate,
+                    months=months,
+                    start_date=start_date,
+                    payment_day=payment_day,
+                    payment_frequency=payment_frequency,
+                    insurance_monthly=insurance_monthly,
+                    grace_period_months=grace_period_months,
+                    interest_calculation_method=interest_calculation_method
+                )
+            schedule_cache.set(key, columns)
+            return columns
+        
+        with schedule_generation.time(path="cached"):
+            due_dates = CalculationService._generate_payment_dates(start_date, payment_day, payment_frequency, months)
+            return columns.with_dates(due_dates)
+    
+    @staticmethod
+    def generate_remaining_schedule(
+        opening_balance: Decimal,
+        annual_rate: Decimal,
+        months: int,
+        first_payment_number: int,
+        previous_due_date: date,
+        payment_day: int = 1,
+        payment_frequency: str = "monthly",
+        insurance_monthly: Decimal = Decimal("0"),
+        grace_period_months: int = 0,
+        interest_calculation_method: str = "30/360"
+    ):
+        from app.services.amortization_engine import AmortizationEngine, AmortizationColumns
+        if first_payment_number <= 1:
+            return CalculationService.generate_amortization_columns(
+                principal=opening_balance,
+                annual_rate=annual_rate,
+                months=months,
+                start_date=previous_due_date,
+                payment_day=payment_day,
+                payment_frequency=payment_frequency,
+                insurance_monthly=insurance_monthly,
+                grace_period_months=grace_period_months,
+                interest_calculation_method=interest_calculation_method
+            )
+        
+        remaining_months = months - first_payment_number + 1
+        if remaining_months <= 0:
+            return AmortizationColumns([], [], [], [], [], [], [], first_payment_number=first_payment_number)
+        
+        with schedule_generation.time(path="remaining"):
+            return AmortizationEngine.generate(
+                principal=opening_balance,
+                annual_rate=annual_rate,
+                months=remaining_months,
+                start_date=previous_due_date,
+                payment_day=payment_day,
+                payment_frequency=payment_frequency,
+                insurance_monthly=insurance_monthly,
+                grace_period_months=max(grace_period_months - first_payment_number + 1, 0),
+                interest_calculation_method=interest_calculation_method,
+                first_payment_number=first_payment_number
+            )
+    
+    @staticmethod
+    def cache_stats() -> Dict[str, Dict]:
+        return {
+            "schedule": schedule_cache.stats(),
+            "payment": payment_cache.stats(),
+            "annuity": annuity_cache.stats()
+        }
+    
+    @staticmethod
+    def _schedule_cache_key(
+        principal: Decimal,
+        annual_rate: Decimal,
+        months: int,
+        start_date: date,
+        payment_day: int,
+        payment_frequency: str,
+        insurance_monthly: Decimal,
+        grace_period_months: int,
+        interest_calculation_method: str
+    ) -> Tuple:
+        # Amounts only depend on start_date through the day counts of actual/365 and
+        # actual/360 monthly schedules; everything else is shared across start dates.
+        day_count_anchor = None
+        if interest_calculation_method != "30/360" and payment_frequency == "monthly":
+            day_count_anchor = start_date
+        return (
+            Decimal(str(principal)),
+            Decimal(str(annual_rate)),
+            months,
+            payment_frequency,
+            payment_day if payment_frequency == "monthly" else None,
+            Decimal(str(insurance_monthly)),
+            grace_period_months,
+            interest_calculation_method,
+            day_count_anchor
+        )
+    
+    @staticmethod
+    def _generate_payment_dates(start_date: date, payment_day: int, frequency: str, count: int) -> List[date]:
+        return PaymentCalendar.due_dates(start_date, payment_day, frequency, count)
+    
     @staticmethod
     def calculate_late_payment_penalty(
         scheduled_payment: Decimal,
@@ -104,15 +256,7 @@ class CalculationService:
     
     @staticmethod
     def _calculate_base_payment(principal: Decimal, annual_rate: Decimal, months: int) -> Decimal:
-        P = Decimal(str(principal))
-        r = Decimal(str(annual_rate)) / 100 / 12
-        n = months
-        
-        if r == 0:
-            return (P / n).quantize(Decimal('0.01'), ROUND_HALF_UP)
-        
-        payment = P * (r * (1 + r) ** n) / ((1 + r) ** n - 1)
-        return payment.quantize(Decimal('0.01'), ROUND_HALF_UP)
+        return AnnuityService.payment(principal, annual_rate, months)
     
     @staticmethod
     def _calculate_days_in_period(start: date, end: date, method: str) -> int:
@@ -123,42 +267,12 @@ class CalculationService:
     
     @staticmethod
     def _get_first_payment_date(start_date: date, payment_day: int, frequency: str) -> date:
-        if frequency == "monthly":
-            next_month = start_date + relativedelta(months=1)
-            try:
-                return next_month.replace(day=payment_day)
-            except ValueError:
-                return next_month.replace(day=1) + relativedelta(months=1) - timedelta(days=1)
-        elif frequency == "biweekly":
-            return start_date + timedelta(days=15)
-        elif frequency == "weekly":
-            return start_date + timedelta(days=7)
-        return start_date + relativedelta(months=1)
+        return PaymentCalendar.next_due_date(start_date, frequency, payment_day)
     
     @staticmethod
     def _get_next_payment_date(current_date: date, frequency: str, payment_day: int) -> date:
-        if frequency == "monthly":
-            next_date = current_date + relativedelta(months=1)
-            try:
-                return next_date.replace(day=payment_day)
-            except ValueError:
-                return next_date.replace(day=1) + relativedelta(months=1) - timedelta(days=1)
-        elif frequency == "biweekly":
-            return current_date + timedelta(days=15)
-        elif frequency == "weekly":
-            return current_date + timedelta(days=7)
-        return current_date + relativedelta(months=1)
+        return PaymentCalendar.next_due_date(current_date, frequency, payment_day)
     
     @staticmethod
     def _get_previous_payment_date(current_date: date, frequency: str, payment_day: int) -> date:
-        if frequency == "monthly":
-            prev_date = current_date - relativedelta(months=1)
-            try:
-                return prev_date.replace(day=payment_day)
-            except ValueError:
-                return prev_date.replace(day=1) + relativedelta(months=1) - timedelta(days=1)
-        elif frequency == "biweekly":
-            return current_date - timedelta(days=15)
-        elif frequency == "weekly":
-            return current_date - timedelta(days=7)
-        return current_date - relativedelta(months=1)
\ No newline at end of file
+        return PaymentCalendar.previous_due_date(current_date, frequency, payment_day)
\ No newline at end of file
@@ -0,0 +1,104 @@
+import csv
+import io
+import json
+from datetime import date
+from typing import Iterable, Iterator, Tuple, Dict
+
+EXPORT_COLUMNS = [
+    "id",
+    "loan_id",
+    "payment_number",
+    "due_date",
+    "scheduled_payment",
+    "scheduled_principal",
+    "scheduled_interest",
+    "insurance_amount",
+    "remaining_balance",
+    "status",
+    "is_overdue",
+    "days_overdue"
+]
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv"
+}
+
+class ExportService:
+    
+    @staticmethod
+    def schedule_record(row: Tuple, today: date) -> Dict:
+        id, loan_id, payment_number, due_date, payment, principal, interest, insurance, balance, status = row
+        is_overdue = status not in ("paid", "cancelled") and due_date < today
+        return {
+            "id": id,
+            "loan_id": loan_id,
+            "payment_number": payment_number,
+            "due_date": due_date.isoformat(),
+            "scheduled_payment": str(payment),
+            "scheduled_principal": str(principal),
+            "scheduled_interest": str(interest),
+            "insurance_amount": str(insurance),
+            "remaining_balance": str(balance),
+            "status": status,
+            "is_overdue": is_overdue,
+            "days_overdue": (today - due_date).days if is_overdue else 0
+        }
+    
+    @staticmethod
+    def response_record(row: Tuple, today: date) -> Dict:
+        # Same fields and values as AmortizationScheduleResponse, including its computed
+        # fields, without per-row model validation or repeated date.today() calls.
+        id, loan_id, payment_number, due_date, payment, principal, interest, insurance, balance, status = row
+        is_overdue = status not in ("paid", "cancelled") and due_date < today
+        if status != "paid" and today < due_date:
+            accrued_interest = "0"
+        else:
+            accrued_interest = str(interest)
+        return {
+            "payment_number": payment_number,
+            "due_date": due_date,
+            "scheduled_payment": str(payment),
+            "scheduled_principal": str(principal),
+            "scheduled_interest": str(interest),
+            "remaining_balance": str(balance),
+            "status": status,
+            "id": id,
+            "loan_id": loan_id,
+            "is_overdue": is_overdue,
+            "days_overdue": (today - due_date).days if is_overdue else 0,
+            "accrued_interest_to_date": accrued_interest
+        }
+    
+    @staticmethod
+    def stream(rows: Iterable[Tuple], export_format: str, today: date) -> Iterator[str]:
+        if export_format == "csv":
+            return ExportService.iter_csv(rows, today)
+        return ExportService.iter_ndjson(rows, today)
+    
+    @staticmethod
+    def iter_ndjson(rows: Iterable[Tuple], today: date, flush_every: int = 500) -> Iterator[str]:
+        buffer = []
+        for row in rows:
+            buffer.append(json.dumps(ExportService.schedule_record(row, today), separators=(",", ":")))
+            if len(buffer) >= flush_every:
+                yield "\n".join(buffer) + "\n"
+                buffer = []
+        if buffer:
+            yield "\n".join(buffer) + "\n"
+    
+    @staticmethod
+    def iter_csv(rows: Iterable[Tuple], today: date, flush_every: int = 500) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+        writer.writeheader()
+        pending = 0
+        for row in rows:
+            writer.writerow(ExportService.schedule_record(row, today))
+            pending += 1
+            if pending >= flush_every:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+        yield buffer.getvalue()
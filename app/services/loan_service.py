@@ -3,11 +3,13 @@ from decimal import Decimal
 from datetime import date
 
 from app.models.loan import Loan
-from app.models.amortization_schedule import AmortizationSchedule
 from app.schemas.loan import LoanCreate, LoanUpdate, LoanResponse, LoanListResponse, LoanSummary
 from app.repositories.loan_repository import LoanRepository
 from app.repositories.amortization_repository import AmortizationRepository
+from app.repositories.pagination import encode_cursor, decode_cursor
 from app.services.calculation_service import CalculationService
+from app.services.response_cache import response_cache
+from app.services.schedule_regeneration_service import ScheduleRegenerationService
 
 class LoanService:
     def __init__(
@@ -36,7 +38,15 @@ class LoanService:
             payment_frequency=loan_data.payment_frequency,
             origination_fee=loan_data.origination_fee,
             insurance_monthly=loan_data.insurance_monthly,
+            installment_amount=self.calc_service.calculate_monthly_payment(
+                principal=Decimal(str(loan_data.principal)),
+                annual_rate=Decimal(str(loan_data.annual_rate)),
+                months=loan_data.months,
+                insurance_monthly=Decimal(str(loan_data.insurance_monthly))
+            ),
             rate_type=loan_data.rate_type,
+            rate_index_id=loan_data.rate_index_id,
+            rate_margin=loan_data.rate_margin,
             interest_calculation_method=loan_data.interest_calculation_method,
             grace_period_months=loan_data.grace_period_months,
             late_payment_penalty_rate=loan_data.late_payment_penalty_rate
@@ -57,23 +67,23 @@ class LoanService:
                 interest_calculation_method=created_loan.interest_calculation_method
             )
             
-            schedules = [
-                AmortizationSchedule(
-                    loan_id=created_loan.id,
-                    payment_number=item["payment_number"],
-                    due_date=item["due_date"],
-                    scheduled_payment=item["scheduled_payment"],
-                    scheduled_principal=item["scheduled_principal"],
-                    scheduled_interest=item["scheduled_interest"],
-                    insurance_amount=item["insurance_amount"],
-                    remaining_balance=item["remaining_balance"],
-                    is_grace_period=item["is_grace_period"],
-                    status="pending"
-                )
+            rows = [
+                {
+                    "loan_id": created_loan.id,
+                    "payment_number": item["payment_number"],
+                    "due_date": item["due_date"],
+                    "scheduled_payment": item["scheduled_payment"],
+                    "scheduled_principal": item["scheduled_principal"],
+                    "scheduled_interest": item["scheduled_interest"],
+                    "insurance_amount": item["insurance_amount"],
+                    "remaining_balance": item["remaining_balance"],
+                    "is_grace_period": item["is_grace_period"],
+                    "status": "pending"
+                }
                 for item in schedule_data
             ]
             
-            self.amortization_repo.create_batch(schedules)
+            self.amortization_repo.bulk_create(rows)
         
         return self._to_response(created_loan)
     
@@ -85,16 +95,43 @@ class LoanService:
             return None
         return self._to_response(loan)
     
-    def get_all_loans(self, skip: int = 0, limit: int = 100, user_id: Optional[int] = None) -> LoanListResponse:
-        if user_id:
-            loans = self.loan_repo.get_by_user(user_id)
-            total = self.loan_repo.count_by_user(user_id)
-        else:
-            loans = self.loan_repo.get_all(skip=skip, limit=limit)
-            total = self.loan_repo.count_total()
-        if user_id:
-            loans = loans[skip:skip + limit]
-        return LoanListResponse(items=[self._to_response(loan) for loan in loans], total=total, skip=skip, limit=limit)
+    def get_loan_validators(self, loan_id: int, user_id: Optional[int] = None):
+        validators = self.loan_repo.get_cache_validators(loan_id)
+        if not validators:
+            return None
+        if user_id is not None and validators.user_id != user_id:
+            return None
+        return validators
+    
+    def get_all_loans(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        user_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True
+    ) -> LoanListResponse:
+        after = decode_cursor(cursor) if cursor else None
+        loans = self.loan_repo.get_page(limit + 1, user_id=user_id, after=after, skip=0 if after else skip)
+        
+        next_cursor = None
+        if len(loans) > limit:
+            loans = loans[:limit]
+            next_cursor = encode_cursor(loans[-1].created_at, loans[-1].id)
+        
+        total = None
+        if include_total:
+            if user_id:
+                total = self.loan_repo.count_by_user(user_id)
+            else:
+                total = self.loan_repo.count_total()
+        return LoanListResponse(
+            items=[self._to_response(loan) for loan in loans],
+            total=total,
+            skip=skip,
+            limit=limit,
+            next_cursor=next_cursor
+        )
     
     def update_loan(self, loan_id: int, loan_data: LoanUpdate, user_id: Optional[int] = None) -> Optional[LoanResponse]:
         existing_loan = self.loan_repo.get_by_id(loan_id)
@@ -103,9 +140,18 @@ class LoanService:
         if user_id is not None and existing_loan.user_id != user_id:
             return None
         update_data = loan_data.model_dump(exclude_unset=True)
-        updated_loan = self.loan_repo.update(loan_id, update_data)
-        if not updated_loan:
-            return None
+        
+        current_terms = ScheduleRegenerationService.schedule_terms(existing_loan)
+        new_terms = ScheduleRegenerationService.schedule_terms(existing_loan, update_data)
+        if new_terms != current_terms:
+            diff = ScheduleRegenerationService(self.amortization_repo).regenerate(loan_id, new_terms)
+            if not diff.is_empty:
+                update_data["schedule_version"] = existing_loan.schedule_version + 1
+            
+            update_data["installment_amount"] = diff.installment_amount
+        
+        updated_loan = self.loan_repo.apply_update(existing_loan, update_data)
+        response_cache.invalidate_loan(loan_id)
         return self._to_response(updated_loan)
     
     def delete_loan(self, loan_id: int, user_id: Optional[int] = None, hard: bool = False) -> bool:
@@ -115,17 +161,23 @@ class LoanService:
         if user_id is not None and loan.user_id != user_id:
             return False
         if hard:
-            return self.loan_repo.delete(loan_id)
+            deleted = self.loan_repo.delete_loan(loan)
         else:
-            return self.loan_repo.soft_delete(loan_id)
+            deleted = self.loan_repo.mark_deleted(loan)
+        if deleted:
+            response_cache.invalidate_loan(loan_id)
+        return deleted
     
-    def restore_loan(self, loan_id: int, user_id: Optional[int] = None) -> bool:
+    def restore_loan(self, loan_id: int, user_id: Optional[int] = None) -> Optional[LoanResponse]:
         loan = self.loan_repo.get_by_id(loan_id, include_deleted=True)
         if not loan:
-            return False
+            return None
         if user_id is not None and loan.user_id != user_id:
-            return False
-        return self.loan_repo.restore(loan_id)
+            return None
+        if not self.loan_repo.mark_restored(loan):
+            return None
+        response_cache.invalidate_loan(loan_id)
+        return self._to_response(loan)
     
     def get_user_loans(self, user_id: int, include_deleted: bool = False) -> List[LoanSummary]:
         loans = self.loan_repo.get_by_user(user_id, include_deleted)
@@ -153,6 +205,8 @@ class LoanService:
             origination_fee=loan.origination_fee,
             insurance_monthly=loan.insurance_monthly,
             rate_type=loan.rate_type,
+            rate_index_id=loan.rate_index_id,
+            rate_margin=loan.rate_margin,
             interest_calculation_method=loan.interest_calculation_method,
             grace_period_months=loan.grace_period_months,
             late_payment_penalty_rate=loan.late_payment_penalty_rate,
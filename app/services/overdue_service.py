@@ -0,0 +1,52 @@
+import asyncio
+import time
+from datetime import date
+from typing import Dict, Optional
+
+from app.config import settings
+from app.database import session_scope
+from app.repositories.amortization_repository import AmortizationRepository
+
+last_sweep: Optional[Dict] = None
+
+class OverdueSweepService:
+    def __init__(self, amortization_repository: AmortizationRepository):
+        self.amortization_repo = amortization_repository
+    
+    def sweep(self, today: Optional[date] = None, chunk_size: Optional[int] = None) -> Dict:
+        global last_sweep
+        today = today or date.today()
+        chunk_size = chunk_size or settings.OVERDUE_SWEEP_CHUNK_SIZE
+        
+        started = time.perf_counter()
+        updated = 0
+        chunks = 0
+        while True:
+            count = self.amortization_repo.mark_overdue_chunk(today, chunk_size)
+            if count <= 0:
+                break
+            updated += count
+            chunks += 1
+            if count < chunk_size:
+                break
+        
+        last_sweep = {
+            "as_of": today,
+            "updated": updated,
+            "chunks": chunks,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+        print(f"⏰ Overdue sweep ({today}): {updated} installments in {chunks} chunks, {last_sweep['duration_ms']} ms")
+        return last_sweep
+
+def run_overdue_sweep(today: Optional[date] = None, chunk_size: Optional[int] = None) -> Dict:
+    with session_scope() as db:
+        return OverdueSweepService(AmortizationRepository(db)).sweep(today=today, chunk_size=chunk_size)
+
+async def overdue_sweep_loop(interval_minutes: int) -> None:
+    while True:
+        try:
+            await asyncio.to_thread(run_overdue_sweep)
+        except Exception as e:
+            print(f"❌ Overdue sweep failed: {e}")
+        await asyncio.sleep(interval_minutes * 60)
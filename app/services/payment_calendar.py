@@ -0,0 +1,76 @@
+from calendar import isleap
+from datetime import date, timedelta
+from typing import List
+
+MONTH_DAYS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+FIXED_STEP_DAYS = {"biweekly": 15, "weekly": 7}
+
+
+class PaymentCalendar:
+    # Due dates follow the original relativedelta rules: monthly dates land on payment_day,
+    # clamped to the month end; biweekly/weekly dates are fixed steps from the start date.
+    # Whole series are built in one pass instead of chaining one relativedelta per installment.
+
+    @staticmethod
+    def days_in_month(year: int, month: int) -> int:
+        if month == 2 and isleap(year):
+            return 29
+        return MONTH_DAYS[month - 1]
+
+    @staticmethod
+    def monthly_date(anchor: date, months_ahead: int, payment_day: int) -> date:
+        year, month = divmod(anchor.year * 12 + anchor.month - 1 + months_ahead, 12)
+        month += 1
+        return date(year, month, min(payment_day, PaymentCalendar.days_in_month(year, month)))
+
+    @staticmethod
+    def due_dates(anchor: date, payment_day: int, frequency: str, count: int) -> List[date]:
+        if frequency == "monthly":
+            year, month = anchor.year, anchor.month
+            dates = []
+            for _ in range(count):
+                if month == 12:
+                    year, month = year + 1, 1
+                else:
+                    month += 1
+                dates.append(date(year, month, min(payment_day, PaymentCalendar.days_in_month(year, month))))
+            return dates
+        if frequency in FIXED_STEP_DAYS:
+            step = FIXED_STEP_DAYS[frequency]
+            ordinal = anchor.toordinal()
+            return [date.fromordinal(ordinal + step * k) for k in range(1, count + 1)]
+
+        dates = []
+        current = anchor
+        for _ in range(count):
+            current = PaymentCalendar._add_month_clamped(current, 1)
+            dates.append(current)
+        return dates
+
+    @staticmethod
+    def next_due_date(current: date, frequency: str, payment_day: int) -> date:
+        if frequency == "monthly":
+            return PaymentCalendar.monthly_date(current, 1, payment_day)
+        if frequency in FIXED_STEP_DAYS:
+            return current + timedelta(days=FIXED_STEP_DAYS[frequency])
+        return PaymentCalendar._add_month_clamped(current, 1)
+
+    @staticmethod
+    def previous_due_date(current: date, frequency: str, payment_day: int) -> date:
+        if frequency == "monthly":
+            return PaymentCalendar.monthly_date(current, -1, payment_day)
+        if frequency in FIXED_STEP_DAYS:
+            return current - timedelta(days=FIXED_STEP_DAYS[frequency])
+        return PaymentCalendar._add_month_clamped(current, -1)
+
+    @staticmethod
+    def day_counts(anchor: date, due_dates: List[date], method: str) -> List[int]:
+        if method == "30/360":
+            return [30] * len(due_dates)
+        ordinals = [anchor.toordinal()] + [due_date.toordinal() for due_date in due_dates]
+        return [end - start for start, end in zip(ordinals, ordinals[1:])]
+
+    @staticmethod
+    def _add_month_clamped(current: date, months: int) -> date:
+        return PaymentCalendar.monthly_date(current, months, current.day)
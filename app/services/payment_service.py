@@ -0,0 +1,183 @@
+import csv
+import time
+import uuid
+from collections import deque
+from decimal import Decimal, ROUND_HALF_UP
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from pydantic import ValidationError
+
+from app.config import settings
+from app.database import session_scope
+from app.repositories.amortization_repository import AmortizationRepository
+from app.repositories.loan_repository import LoanRepository
+from app.repositories.payment_repository import PaymentRepository
+from app.schemas.payment import PaymentCreate
+from app.services.response_cache import response_cache
+
+RESULT_KEYS = {"applied": "applied", "partial": "partially_applied", "unapplied": "unapplied"}
+
+class PaymentService:
+    def __init__(
+        self,
+        payment_repository: PaymentRepository,
+        amortization_repository: AmortizationRepository,
+        loan_repository: LoanRepository
+    ):
+        self.payment_repo = payment_repository
+        self.amortization_repo = amortization_repository
+        self.loan_repo = loan_repository
+    
+    def ingest(self, payments: Iterable[Dict], chunk_size: Optional[int] = None, user_id: Optional[int] = None) -> Dict:
+        # With user_id, payments for loans the user does not own are rejected like unknown ones.
+        chunk_size = chunk_size or settings.PAYMENT_INGEST_CHUNK_SIZE
+        
+        started = time.perf_counter()
+        result = {
+            "received": 0,
+            "duplicates": 0,
+            "rejected": 0,
+            "applied": 0,
+            "partially_applied": 0,
+            "unapplied": 0,
+            "installments_paid": 0,
+            "installments_partial": 0,
+            "loans_affected": 0,
+            "chunks": 0
+        }
+        
+        affected_loans = set()
+        payments = iter(payments)
+        while True:
+            chunk = list(islice(payments, chunk_size))
+            if not chunk:
+                break
+            affected_loans.update(self._ingest_chunk(chunk, result, user_id))
+            result["chunks"] += 1
+        
+        result["loans_affected"] = len(affected_loans)
+        
+        result["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        print(
+            f"🏦 Payment ingestion: {result['received']} received, {result['applied']} applied, "
+            f"{result['duplicates']} duplicates, {result['rejected']} rejected, {result['duration_ms']} ms"
+        )
+        return result
+    
+    def _ingest_chunk(self, chunk: List[Dict], result: Dict, user_id: Optional[int] = None) -> List[int]:
+        result["received"] += len(chunk)
+        # Loans first, then their unpaid installments: the same order repricing locks in.
+        known_loans = self.loan_repo.get_existing_ids(
+            list({payment["loan_id"] for payment in chunk}),
+            user_id=user_id,
+            for_update=True
+        )
+        
+        ingestion_id = uuid.uuid4().hex
+        rows = [
+            {
+                "loan_id": payment["loan_id"],
+                "reference": payment["reference"],
+                "payment_date": payment["payment_date"],
+                "amount": payment["amount"],
+                "applied_amount": Decimal("0"),
+                "status": "received",
+                "ingestion_id": ingestion_id
+            }
+            for payment in chunk if payment["loan_id"] in known_loans
+        ]
+        result["rejected"] += len(chunk) - len(rows)
+        
+        self.payment_repo.stage(rows)
+        staged = self.payment_repo.get_staged(ingestion_id)
+        result["duplicates"] += len(rows) - len(staged)
+        if not staged:
+            return []
+        
+        self.amortization_repo.lock_unpaid(sorted({loan_id for _, loan_id, _ in staged}))
+        queues = {}
+        for id, loan_id, payment_number, scheduled_payment, paid_amount, status in \
+                self.payment_repo.get_allocation_targets(ingestion_id):
+            queues.setdefault(loan_id, deque()).append(
+                [id, loan_id, PaymentService._cents(scheduled_payment), PaymentService._cents(paid_amount), status]
+            )
+        
+        # Each loan's payments are applied in date order, oldest unpaid installment first;
+        # an amount larger than the installment spills over into the next one.
+        touched = {}
+        payment_updates = []
+        for payment_id, loan_id, amount in staged:
+            remaining = PaymentService._cents(amount)
+            queue = queues.get(loan_id, ())
+            first_installment_id = None
+            while remaining > 0 and queue:
+                installment = queue[0]
+                take = min(remaining, installment[2] - installment[3])
+                installment[3] += take
+                remaining -= take
+                touched[installment[0]] = installment
+                if first_installment_id is None:
+                    first_installment_id = installment[0]
+                if installment[3] >= installment[2]:
+                    queue.popleft()
+            
+            applied = PaymentService._cents(amount) - remaining
+            if remaining == 0:
+                status = "applied"
+            elif applied > 0:
+                status = "partial"
+            else:
+                status = "unapplied"
+            result[RESULT_KEYS[status]] += 1
+            payment_updates.append({
+                "id": payment_id,
+                "amortization_schedule_id": first_installment_id,
+                "applied_amount": Decimal(applied).scaleb(-2),
+                "status": status
+            })
+        
+        schedule_updates = []
+        for id, _, due, paid, status in touched.values():
+            if paid >= due:
+                status = "paid"
+                result["installments_paid"] += 1
+            else:
+                # A partly covered installment that is already past due stays overdue.
+                status = "overdue" if status == "overdue" else "partial"
+                result["installments_partial"] += 1
+            schedule_updates.append({"id": id, "paid_amount": Decimal(paid).scaleb(-2), "status": status})
+        
+        loan_ids = sorted({installment[1] for installment in touched.values()})
+        self.amortization_repo.apply_payments(schedule_updates, loan_ids)
+        self.payment_repo.bulk_update(payment_updates)
+        for loan_id in loan_ids:
+            response_cache.invalidate_loan(loan_id)
+        return loan_ids
+    
+    @staticmethod
+    def _cents(amount) -> int:
+        return int((Decimal(str(amount)) * 100).to_integral_value(ROUND_HALF_UP))
+
+def read_payment_file(path: str, result: Dict) -> Iterator[Dict]:
+    # Expects a header with loan_id, reference, payment_date and amount; malformed lines are
+    # reported and counted as rejected instead of aborting the whole file.
+    with open(path, newline="", encoding="utf-8") as handle:
+        for line_number, record in enumerate(csv.DictReader(handle), start=2):
+            try:
+                yield PaymentCreate.model_validate(record).model_dump()
+            except ValidationError as e:
+                print(f"⚠️ Skipping line {line_number}: {e.error_count()} invalid field(s)")
+                result["rejected"] += 1
+
+def run_payment_ingestion(path: str, chunk_size: Optional[int] = None) -> Dict:
+    skipped = {"rejected": 0}
+    with session_scope() as db:
+        result = PaymentService(
+            PaymentRepository(db),
+            AmortizationRepository(db),
+            LoanRepository(db)
+        ).ingest(read_payment_file(path, skipped), chunk_size=chunk_size)
+    result["received"] += skipped["rejected"]
+    result["rejected"] += skipped["rejected"]
+    return result
@@ -0,0 +1,101 @@
+import time
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from app.config import settings
+from app.database import session_scope
+from app.repositories.amortization_repository import AmortizationRepository
+from app.services.calculation_service import CalculationService
+
+RATE_SCALE = 10 ** 4
+INT64_SAFE = 2 ** 62
+
+class PenaltyService:
+    def __init__(self, amortization_repository: AmortizationRepository):
+        self.amortization_repo = amortization_repository
+    
+    def accrue(self, today: Optional[date] = None, chunk_size: Optional[int] = None, persist: bool = True) -> Dict:
+        today = today or date.today()
+        chunk_size = chunk_size or settings.PENALTY_CHUNK_SIZE
+        
+        started = time.perf_counter()
+        installments = 0
+        chunks = 0
+        total_penalty = Decimal("0")
+        after_id = 0
+        while True:
+            rows = self.amortization_repo.get_penalty_candidates(today, after_id, chunk_size)
+            if not rows:
+                break
+            after_id = rows[-1][0]
+            penalties = PenaltyService.compute_penalties(
+                [row[1] for row in rows],
+                [(today - row[2]).days for row in rows],
+                [row[3] for row in rows]
+            )
+            if persist:
+                self.amortization_repo.bulk_update_penalties([
+                    {"id": row[0], "accrued_penalty": penalty, "penalty_as_of": today}
+                    for row, penalty in zip(rows, penalties)
+                ])
+            installments += len(rows)
+            chunks += 1
+            total_penalty += sum(penalties, Decimal("0"))
+            if len(rows) < chunk_size:
+                break
+        
+        result = {
+            "as_of": today,
+            "installments": installments,
+            "chunks": chunks,
+            "total_penalty": total_penalty,
+            "persisted": persist,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+        print(f"💸 Penalty accrual ({today}): {installments} installments, total {total_penalty}, {result['duration_ms']} ms")
+        return result
+    
+    @staticmethod
+    def compute_penalties(
+        scheduled_payments: Sequence[Decimal],
+        days_overdue: Sequence[int],
+        penalty_rates: Sequence[Decimal]
+    ) -> List[Decimal]:
+        # Same result as calculate_late_payment_penalty per row: payment is in cents and the
+        # rate in 1/10000 percent, so payment * rate / 100 * days is an exact integer ratio
+        # that can be rounded half up without Decimal.
+        payments = [Decimal(str(p)) for p in scheduled_payments]
+        rates = [Decimal(str(r)) for r in penalty_rates]
+        if not all(p == p.quantize(Decimal("0.01")) for p in payments) or \
+                not all(r == r.quantize(Decimal("0.0001")) for r in rates):
+            return [
+                CalculationService.calculate_late_payment_penalty(p, d, r)
+                for p, d, r in zip(payments, days_overdue, rates)
+            ]
+        
+        cents = [int(p.scaleb(2)) for p in payments]
+        units = [int(r.scaleb(4)) for r in rates]
+        days = [max(d, 0) for d in days_overdue]
+        denominator = 100 * RATE_SCALE
+        
+        if np is not None and cents and max(map(abs, cents)) * max(units) * max(days) < INT64_SAFE // 2:
+            numerators = np.asarray(cents, dtype=np.int64) * np.asarray(units, dtype=np.int64) * np.asarray(days, dtype=np.int64)
+            rounded = (np.abs(numerators) * 2 + denominator) // (2 * denominator) * np.sign(numerators)
+            return [Decimal(int(value)).scaleb(-2) for value in rounded]
+        
+        penalties = []
+        for c, u, d in zip(cents, units, days):
+            numerator = c * u * d
+            value = (abs(numerator) * 2 + denominator) // (2 * denominator)
+            penalties.append(Decimal(-value if numerator < 0 else value).scaleb(-2))
+        return penalties
+
+def run_penalty_accrual(today: Optional[date] = None, chunk_size: Optional[int] = None, persist: bool = True) -> Dict:
+    with session_scope() as db:
+        return PenaltyService(AmortizationRepository(db)).accrue(today=today, chunk_size=chunk_size, persist=persist)
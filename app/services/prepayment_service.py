@@ -0,0 +1,230 @@
+from decimal import Decimal, ROUND_HALF_UP
+from functools import partial
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from app.schemas.loan import LoanBase
+from app.schemas.prepayment import PrepaymentScenario, PrepaymentScenarioResult, PrepaymentComparison
+from app.services.annuity_service import AnnuityService
+from app.services.amortization_engine import AmortizationEngine, AmortizationColumns
+from app.services.calculation_service import CalculationService
+from app.services.payment_calendar import PaymentCalendar
+from app.services.simulation_service import SimulationService
+from app.strategies import ExtraPaymentStrategy, RecurringExtraPayment, ReduceTermStrategy, PREPAYMENT_STRATEGIES
+
+CENT = Decimal("0.01")
+INT64_SAFE = 2 ** 62
+
+# (payoff_payment_number, total_paid, total_interest, total_extra, final_installment), all in cents
+Outcome = Tuple[int, int, int, int, int]
+
+class PrepaymentService:
+    
+    @staticmethod
+    def compare(terms: LoanBase, scenarios: List[PrepaymentScenario]) -> PrepaymentComparison:
+        base = SimulationService.simulate(terms)
+        months = len(base)
+        extras = [[0] * months] + [
+            ExtraPaymentStrategy(
+                lump_sums=[(lump_sum.payment_number, lump_sum.amount) for lump_sum in scenario.lump_sums],
+                recurring=[
+                    RecurringExtraPayment(extra.amount, extra.start_payment_number, extra.end_payment_number, extra.every)
+                    for extra in scenario.recurring
+                ]
+            ).extra_payments(months)
+            for scenario in scenarios
+        ]
+        strategies = [ReduceTermStrategy] + [PREPAYMENT_STRATEGIES[scenario.strategy] for scenario in scenarios]
+        
+        outcomes = PrepaymentService.evaluate(
+            principal=terms.principal.quantize(CENT, ROUND_HALF_UP),
+            annual_rate=terms.annual_rate,
+            interest_calculation_method=terms.interest_calculation_method,
+            start_date=SimulationService._start_date(terms),
+            base=base,
+            extras=extras,
+            strategies=strategies
+        )
+        
+        base_outcome = outcomes[0]
+        return PrepaymentComparison(
+            base=PrepaymentService._result(None, None, base, base_outcome, base_outcome),
+            scenarios=[
+                PrepaymentService._result(scenario.name, scenario.strategy, base, outcome, base_outcome)
+                for scenario, outcome in zip(scenarios, outcomes[1:])
+            ]
+        )
+    
+    @staticmethod
+    def evaluate(
+        principal: Decimal,
+        annual_rate: Decimal,
+        interest_calculation_method: str,
+        start_date,
+        base: AmortizationColumns,
+        extras: Sequence[Sequence[int]],
+        strategies: Sequence
+    ) -> List[Outcome]:
+        months = len(base)
+        balance = AmortizationEngine._to_cents(principal, "principal")
+        base_payment = AmortizationEngine._to_cents(
+            CalculationService._calculate_base_payment(principal, annual_rate, months),
+            "base payment"
+        )
+        rate_num, period_den, period_rate, per_day = AmortizationEngine.interest_terms(
+            annual_rate, interest_calculation_method
+        )
+        if per_day:
+            days = PaymentCalendar.day_counts(start_date, list(base.due_date), interest_calculation_method)
+        else:
+            days = [1] * months
+        
+        inputs = {
+            "months": months,
+            "balance": balance,
+            "base_payment": base_payment,
+            "insurance": base.insurance_amount[0] if months else 0,
+            "grace": base.is_grace_period,
+            "days": days,
+            "rate_num": rate_num,
+            "period_den": period_den,
+            "period_rate": period_rate,
+            "per_day": per_day,
+            "factor": partial(AnnuityService.factor, annual_rate)
+        }
+        if np is not None and balance * 2 * rate_num * max(days, default=1) < INT64_SAFE:
+            return PrepaymentService._evaluate_vectorized(inputs, extras, strategies)
+        return [PrepaymentService._evaluate_one(inputs, row, strategy) for row, strategy in zip(extras, strategies)]
+    
+    @staticmethod
+    def _evaluate_one(inputs: Dict, extras: Sequence[int], strategy) -> Outcome:
+        months = inputs["months"]
+        balance = inputs["balance"]
+        installment = inputs["base_payment"]
+        insurance = inputs["insurance"]
+        paid = interest_total = extra_total = 0
+        payoff = months
+        prepaid = False
+        for t in range(months):
+            interest = PrepaymentService._interest(inputs, balance, inputs["days"][t])
+            principal_payment = 0 if inputs["grace"][t] else installment - interest
+            # Until the first extra the loan follows the contractual schedule exactly as
+            # AmortizationEngine builds it, overshoot on short periods included; once
+            # something was prepaid it ends as soon as the balance is covered.
+            if t == months - 1 or (prepaid and principal_payment >= balance):
+                principal_payment = balance
+            balance -= principal_payment
+            extra = min(extras[t], balance) if balance > 0 else 0
+            balance -= extra
+            paid += principal_payment + interest + insurance + extra
+            interest_total += interest
+            extra_total += extra
+            prepaid = prepaid or extra > 0
+            if prepaid and balance <= 0:
+                payoff = t + 1
+                break
+            if extra and strategy.reamortizes:
+                remaining = months - t - 1
+                installment = strategy.next_installment(installment, balance, remaining, inputs["factor"](remaining))
+        return payoff, paid, interest_total, extra_total, installment
+    
+    @staticmethod
+    def _evaluate_vectorized(inputs: Dict, extras: Sequence[Sequence[int]], strategies: Sequence) -> List[Outcome]:
+        # One pass over the shared base schedule, advancing every scenario at once; only the
+        # rare half-cent ties and re-amortizations drop to per-scenario Python.
+        months = inputs["months"]
+        count = len(extras)
+        extra_matrix = np.asarray(extras, dtype=np.int64).reshape(count, months)
+        reamortizes = np.asarray([strategy.reamortizes for strategy in strategies], dtype=bool)
+        balance = np.full(count, inputs["balance"], dtype=np.int64)
+        installment = np.full(count, inputs["base_payment"], dtype=np.int64)
+        insurance = inputs["insurance"]
+        rate_num = inputs["rate_num"]
+        period_den = inputs["period_den"]
+        paid = np.zeros(count, dtype=np.int64)
+        interest_total = np.zeros(count, dtype=np.int64)
+        extra_total = np.zeros(count, dtype=np.int64)
+        payoff = np.full(count, months, dtype=np.int64)
+        active = np.ones(count, dtype=bool)
+        prepaid = np.zeros(count, dtype=bool)
+        
+        for t in range(months):
+            if not active.any():
+                break
+            days = inputs["days"][t]
+            # Half-up on the magnitude, like AmortizationEngine._round_half_up, because an
+            # overshooting schedule can carry a negative balance.
+            numerator = balance * (rate_num * days)
+            quotient, remainder = np.divmod(np.abs(numerator), period_den)
+            twice = remainder * 2
+            interest = np.sign(numerator) * (quotient + (twice >= period_den))
+            for i in np.flatnonzero(active & (twice == period_den)):
+                interest[i] = AmortizationEngine._decimal_interest(
+                    int(balance[i]), inputs["period_rate"], days, inputs["per_day"]
+                )
+            
+            if inputs["grace"][t]:
+                principal_payment = np.zeros(count, dtype=np.int64)
+            else:
+                principal_payment = installment - interest
+            if t == months - 1:
+                principal_payment = balance.copy()
+            else:
+                principal_payment = np.where(prepaid & (principal_payment >= balance), balance, principal_payment)
+            
+            balance -= principal_payment
+            extra = np.where(balance > 0, np.minimum(extra_matrix[:, t], balance), 0)
+            balance -= extra
+            paid += np.where(active, principal_payment + interest + insurance + extra, 0)
+            interest_total += np.where(active, interest, 0)
+            extra_total += np.where(active, extra, 0)
+            
+            prepaid |= extra > 0
+            settled = active & prepaid & (balance <= 0)
+            payoff[settled] = t + 1
+            active &= ~settled
+            
+            remaining = months - t - 1
+            for i in np.flatnonzero(active & reamortizes & (extra > 0)):
+                installment[i] = strategies[i].next_installment(
+                    int(installment[i]), int(balance[i]), remaining, inputs["factor"](remaining)
+                )
+        
+        return [
+            (int(payoff[i]), int(paid[i]), int(interest_total[i]), int(extra_total[i]), int(installment[i]))
+            for i in range(count)
+        ]
+    
+    @staticmethod
+    def _interest(inputs: Dict, balance: int, days: int) -> int:
+        interest, tie = AmortizationEngine._round_half_up(balance * inputs["rate_num"] * days, inputs["period_den"])
+        if tie:
+            interest = AmortizationEngine._decimal_interest(balance, inputs["period_rate"], days, inputs["per_day"])
+        return interest
+    
+    @staticmethod
+    def _result(name, strategy, base: AmortizationColumns, outcome: Outcome, base_outcome: Outcome) -> PrepaymentScenarioResult:
+        payoff, paid, interest, extra, installment = outcome
+        insurance = base.insurance_amount[0] if len(base) else 0
+        money = PrepaymentService._money
+        return PrepaymentScenarioResult(
+            name=name,
+            strategy=strategy,
+            payoff_payment_number=payoff,
+            payoff_date=base.due_date[payoff - 1],
+            payments_saved=base_outcome[0] - payoff,
+            total_to_pay=money(paid),
+            total_interest=money(interest),
+            total_extra=money(extra),
+            interest_saved=money(base_outcome[2] - interest),
+            monthly_payment=money(base_outcome[4] + insurance),
+            final_monthly_payment=money(installment + insurance)
+        )
+    
+    @staticmethod
+    def _money(cents: int) -> Decimal:
+        return Decimal(cents).scaleb(-2)
@@ -0,0 +1,157 @@
+import logging
+import time
+from collections import namedtuple
+from concurrent.futures import as_completed
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.database import session_scope
+from app.repositories.loan_repository import LoanRepository
+from app.repositories.amortization_repository import AmortizationRepository
+from app.repositories.rate_index_repository import RateIndexRepository
+from app.services.response_cache import response_cache
+from app.services.schedule_regeneration_service import ScheduleRegenerationService, ScheduleDiff
+from app.services.simulation_service import get_executor
+
+RATE_QUANTUM = Decimal("0.0001")
+
+logger = logging.getLogger(__name__)
+
+ScheduleRow = namedtuple("ScheduleRow", [
+    "id",
+    "loan_id",
+    "payment_number",
+    "due_date",
+    "scheduled_payment",
+    "scheduled_principal",
+    "scheduled_interest",
+    "insurance_amount",
+    "remaining_balance",
+    "status",
+    "is_grace_period"
+])
+
+def reprice_chunk(items: List[Tuple[int, List[ScheduleRow], Dict]]) -> List[Tuple[int, Optional[ScheduleDiff], Optional[str]]]:
+    results = []
+    for loan_id, rows, terms in items:
+        try:
+            results.append((loan_id, ScheduleRegenerationService.plan(loan_id, rows, terms), None))
+        except (ValueError, ArithmeticError) as e:
+            results.append((loan_id, None, str(e)))
+    return results
+
+class RepricingService:
+    def __init__(
+        self,
+        loan_repository: LoanRepository,
+        amortization_repository: AmortizationRepository,
+        rate_index_repository: RateIndexRepository
+    ):
+        self.loan_repo = loan_repository
+        self.amortization_repo = amortization_repository
+        self.rate_index_repo = rate_index_repository
+    
+    def reprice(self, rate_index_id: int, as_of: Optional[date] = None, chunk_size: Optional[int] = None) -> Dict:
+        as_of = as_of or date.today()
+        chunk_size = chunk_size or settings.REPRICE_CHUNK_SIZE
+        
+        started = time.perf_counter()
+        result = {
+            "rate_index_id": rate_index_id,
+            "as_of": as_of,
+            "index_value": None,
+            "loans_repriced": 0,
+            "installments_written": 0,
+            "installments_deleted": 0,
+            "rates_clamped": 0,
+            "skipped_stale": 0,
+            "failed": 0,
+            "chunks": 0
+        }
+        
+        index_value = self.rate_index_repo.get_value_as_of(rate_index_id, as_of)
+        if index_value is not None:
+            result["index_value"] = index_value.value
+            after_id = 0
+            while True:
+                loans = self.loan_repo.get_repricing_candidates(rate_index_id, index_value.value, after_id, chunk_size)
+                if not loans:
+                    break
+                after_id = loans[-1].id
+                self._reprice_loans(loans, Decimal(str(index_value.value)), result)
+                result["chunks"] += 1
+                if len(loans) < chunk_size:
+                    break
+        
+        result["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        logger.info(
+            "Repricing index %s (%s): %s loans, %s installments, %s clamped, %s stale, %s failed, %s ms",
+            rate_index_id, as_of, result["loans_repriced"], result["installments_written"],
+            result["rates_clamped"], result["skipped_stale"], result["failed"], result["duration_ms"]
+        )
+        return result
+    
+    def _reprice_loans(self, loans: List[Tuple], index_value: Decimal, result: Dict) -> None:
+        states = self.amortization_repo.get_schedule_state_for_loans([loan.id for loan in loans])
+        rates = {}
+        work = []
+        for loan in loans:
+            rates[loan.id] = Decimal(str(loan.target_rate)).quantize(RATE_QUANTUM)
+            if rates[loan.id] != (index_value + Decimal(str(loan.rate_margin))).quantize(RATE_QUANTUM):
+                result["rates_clamped"] += 1
+            terms = ScheduleRegenerationService.schedule_terms(loan, {"annual_rate": rates[loan.id]})
+            rows = ScheduleRegenerationService.pending_tail(states[loan.id])
+            work.append((loan.id, [ScheduleRow(*row) for row in rows], terms))
+        
+        executor = get_executor()
+        size = settings.REPRICE_WORKER_BATCH
+        futures = [executor.submit(reprice_chunk, work[start:start + size]) for start in range(0, len(work), size)]
+        
+        diffs = {}
+        for future in as_completed(futures):
+            for loan_id, diff, error in future.result():
+                if error is not None:
+                    logger.error("Repricing loan %s failed: %s", loan_id, error)
+                    result["failed"] += 1
+                    continue
+                diffs[loan_id] = diff
+        
+        # The plans were built from schedules read before the workers ran; a loan whose
+        # version moved since (edit, payment, overdue sweep) is left for the next run.
+        versions = {loan.id: loan.schedule_version for loan in loans}
+        claimed = self.loan_repo.claim_versions({loan_id: versions[loan_id] for loan_id in diffs})
+        result["skipped_stale"] += len(diffs) - len(claimed)
+        
+        upserts = []
+        delete_ids = []
+        for loan_id in claimed:
+            upserts.extend(diffs[loan_id].upsert_rows(loan_id))
+            delete_ids.extend(diffs[loan_id].delete_ids)
+        
+        now = datetime.utcnow()
+        self.amortization_repo.upsert_schedule(upserts, delete_ids)
+        self.loan_repo.bulk_update_rates([
+            {
+                "id": loan_id,
+                "annual_rate": rates[loan_id],
+                "installment_amount": diffs[loan_id].installment_amount,
+                "updated_at": now
+            }
+            for loan_id in claimed
+        ])
+        for loan_id in claimed:
+            response_cache.invalidate_loan(loan_id)
+        
+        result["loans_repriced"] += len(claimed)
+        result["installments_written"] += len(upserts)
+        result["installments_deleted"] += len(delete_ids)
+
+def run_repricing(rate_index_id: int, as_of: Optional[date] = None, chunk_size: Optional[int] = None) -> Dict:
+    with session_scope() as db:
+        return RepricingService(
+            LoanRepository(db),
+            AmortizationRepository(db),
+            RateIndexRepository(db)
+        ).reprice(rate_index_id, as_of=as_of, chunk_size=chunk_size)
@@ -0,0 +1,131 @@
+import hashlib
+import time
+from typing import Optional, Protocol
+from urllib.parse import urlparse
+
+from app.config import settings
+from app.metrics import REGISTRY
+from app.services.cache import LRUCache
+
+
+class ICacheBackend(Protocol):
+    def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        ...
+
+    def delete_prefix(self, prefix: str) -> None:
+        ...
+
+
+class NullCacheBackend:
+    def get(self, key: str) -> Optional[bytes]:
+        return None
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        pass
+
+    def delete_prefix(self, prefix: str) -> None:
+        pass
+
+
+class MemoryCacheBackend:
+    def __init__(self, maxsize: int):
+        self.entries = LRUCache(maxsize=maxsize)
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self.entries.delete(key)
+            return None
+        return value
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        self.entries.set(key, (time.monotonic() + ttl, value))
+
+    def delete_prefix(self, prefix: str) -> None:
+        for key in self.entries.keys():
+            if key.startswith(prefix):
+                self.entries.delete(key)
+
+
+class RedisCacheBackend:
+    def __init__(self, url: str, namespace: str = "meloan:"):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.namespace = namespace
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.namespace + key)
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        self.client.set(self.namespace + key, value, ex=ttl)
+
+    def delete_prefix(self, prefix: str) -> None:
+        keys = list(self.client.scan_iter(match=self.namespace + prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+class ResponseCache:
+    def __init__(self, backend: ICacheBackend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def loan_key(loan_id: int, *parts: str) -> str:
+        return f"loan:{loan_id}:" + ":".join(parts)
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        self.backend.set(key, value, self.ttl)
+
+    def invalidate_loan(self, loan_id: int) -> None:
+        self.backend.delete_prefix(f"loan:{loan_id}:")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.blake2b(":".join(str(part) for part in parts).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def create_backend(url: str) -> ICacheBackend:
+    scheme = urlparse(url).scheme
+    if scheme == "memory":
+        return MemoryCacheBackend(maxsize=settings.RESPONSE_CACHE_SIZE)
+    if scheme in ("redis", "rediss", "unix"):
+        return RedisCacheBackend(url)
+    return NullCacheBackend()
+
+
+response_cache = ResponseCache(create_backend(settings.RESPONSE_CACHE_URL), ttl=settings.RESPONSE_CACHE_TTL)
+REGISTRY.register_cache("response", response_cache.stats)
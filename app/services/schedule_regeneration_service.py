@@ -0,0 +1,179 @@
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.repositories.amortization_repository import AmortizationRepository, PENDING_STATUSES
+from app.services.calculation_service import CalculationService
+
+CENT = Decimal("0.01")
+
+SCHEDULE_FIELDS = (
+    "principal",
+    "annual_rate",
+    "months",
+    "start_date",
+    "payment_day",
+    "payment_frequency",
+    "insurance_monthly",
+    "grace_period_months",
+    "interest_calculation_method"
+)
+
+AMOUNT_FIELDS = (
+    "scheduled_payment",
+    "scheduled_principal",
+    "scheduled_interest",
+    "insurance_amount",
+    "remaining_balance"
+)
+
+class ScheduleDiff:
+    # Rows are kept as (payment_number, values) tuples in integer cents so the diff stays
+    # cheap to build, compare and ship between processes; dicts are only built for the write.
+    def __init__(
+        self,
+        updates: List[Tuple],
+        inserts: List[Tuple],
+        delete_ids: List[int],
+        first_payment_number: int,
+        installment_amount: Optional[Decimal] = None
+    ):
+        self.updates = updates
+        self.inserts = inserts
+        self.delete_ids = delete_ids
+        self.first_payment_number = first_payment_number
+        self.installment_amount = installment_amount
+    
+    @property
+    def is_empty(self) -> bool:
+        return not (self.updates or self.inserts or self.delete_ids)
+    
+    def update_rows(self) -> List[Dict]:
+        return [{"id": id, **ScheduleDiff._values(values)} for id, _, values in self.updates]
+    
+    def insert_rows(self, loan_id: int) -> List[Dict]:
+        return [
+            {"loan_id": loan_id, "payment_number": number, "status": "pending", **ScheduleDiff._values(values)}
+            for number, values in self.inserts
+        ]
+    
+    def upsert_rows(self, loan_id: int) -> List[Dict]:
+        return self.insert_rows(loan_id) + [
+            {"loan_id": loan_id, "payment_number": number, "status": "pending", **ScheduleDiff._values(values)}
+            for _, number, values in self.updates
+        ]
+    
+    @staticmethod
+    def _values(values: Tuple) -> Dict:
+        due_date, payment, principal, interest, insurance, balance, grace = values
+        return {
+            "due_date": due_date,
+            "scheduled_payment": Decimal(payment).scaleb(-2),
+            "scheduled_principal": Decimal(principal).scaleb(-2),
+            "scheduled_interest": Decimal(interest).scaleb(-2),
+            "insurance_amount": Decimal(insurance).scaleb(-2),
+            "remaining_balance": Decimal(balance).scaleb(-2),
+            "is_grace_period": grace
+        }
+
+class ScheduleRegenerationService:
+    def __init__(self, amortization_repository: AmortizationRepository):
+        self.amortization_repo = amortization_repository
+    
+    @staticmethod
+    def schedule_terms(loan, changes: Optional[Dict] = None) -> Dict:
+        terms = {field: getattr(loan, field) for field in SCHEDULE_FIELDS}
+        if changes:
+            terms.update({
+                field: value for field, value in changes.items()
+                if field in SCHEDULE_FIELDS and value is not None
+            })
+        return terms
+    
+    def regenerate(self, loan_id: int, terms: Dict) -> ScheduleDiff:
+        rows = self.amortization_repo.get_schedule_state(loan_id)
+        diff = ScheduleRegenerationService.plan(loan_id, rows, terms)
+        if not diff.is_empty:
+            self.amortization_repo.apply_diff(diff.update_rows(), diff.insert_rows(loan_id), diff.delete_ids)
+        return diff
+    
+    @staticmethod
+    def pending_tail(rows: Sequence[Tuple]) -> Sequence[Tuple]:
+        # plan() only needs the last settled row (for the opening balance) and what follows it.
+        first_unpaid = ScheduleRegenerationService._first_unpaid(rows)
+        return rows[max(first_unpaid - 1, 0):]
+    
+    @staticmethod
+    def plan(loan_id: int, rows: Sequence[Tuple], terms: Dict) -> ScheduleDiff:
+        first_unpaid = ScheduleRegenerationService._first_unpaid(rows)
+        if first_unpaid < len(rows):
+            first_payment_number = rows[first_unpaid].payment_number
+        else:
+            first_payment_number = rows[-1].payment_number + 1 if rows else 1
+        
+        if first_unpaid > 0:
+            previous = rows[first_unpaid - 1]
+            opening_balance = Decimal(str(previous.remaining_balance))
+            previous_due_date = previous.due_date
+        else:
+            opening_balance = Decimal(str(terms["principal"])).quantize(CENT, ROUND_HALF_UP)
+            previous_due_date = terms["start_date"]
+        
+        annual_rate = Decimal(str(terms["annual_rate"]))
+        insurance_monthly = Decimal(str(terms["insurance_monthly"])).quantize(CENT, ROUND_HALF_UP)
+        if previous_due_date is None or opening_balance <= 0:
+            return ScheduleDiff([], [], [], first_payment_number, CalculationService.calculate_monthly_payment(
+                Decimal(str(terms["principal"])), annual_rate, terms["months"], insurance_monthly
+            ))
+        
+        columns = CalculationService.generate_remaining_schedule(
+            opening_balance=opening_balance,
+            annual_rate=annual_rate,
+            months=terms["months"],
+            first_payment_number=first_payment_number,
+            previous_due_date=previous_due_date,
+            payment_day=terms["payment_day"],
+            payment_frequency=terms["payment_frequency"],
+            insurance_monthly=insurance_monthly,
+            grace_period_months=terms["grace_period_months"],
+            interest_calculation_method=terms["interest_calculation_method"]
+        )
+        
+        existing = {row.payment_number: row for row in rows[first_unpaid:]}
+        updates = []
+        inserts = []
+        for number, due_date, payment, principal, interest, insurance, balance, grace in zip(
+            columns.payment_number,
+            columns.due_date,
+            columns.scheduled_payment,
+            columns.scheduled_principal,
+            columns.scheduled_interest,
+            columns.insurance_amount,
+            columns.remaining_balance,
+            columns.is_grace_period
+        ):
+            values = (due_date, payment, principal, interest, insurance, max(balance, 0), grace)
+            row = existing.pop(number, None)
+            if row is None:
+                inserts.append((number, values))
+            elif ScheduleRegenerationService._row_values(row) != values:
+                updates.append((row.id, number, values))
+        
+        delete_ids = [row.id for row in existing.values()]
+        # The stored installment follows the schedule actually due: once payments are settled
+        # the tail is re-amortized over the remaining term, so the installment is too.
+        installment_amount = CalculationService.calculate_monthly_payment(
+            opening_balance, annual_rate, max(len(columns), 1), insurance_monthly
+        )
+        return ScheduleDiff(updates, inserts, delete_ids, first_payment_number, installment_amount)
+    
+    @staticmethod
+    def _first_unpaid(rows: Sequence[Tuple]) -> int:
+        return next((index for index, row in enumerate(rows) if row.status in PENDING_STATUSES), len(rows))
+    
+    @staticmethod
+    def _row_values(row: Tuple) -> Tuple:
+        return (
+            row.due_date,
+            *(int(Decimal(str(getattr(row, field))).scaleb(2)) for field in AMOUNT_FIELDS),
+            bool(row.is_grace_period)
+        )
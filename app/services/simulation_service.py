@@ -0,0 +1,147 @@
+import asyncio
+import json
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal, ROUND_HALF_UP
+from datetime import date
+from typing import AsyncIterator, Iterator, Dict, List, Optional, Tuple
+
+from app.config import settings
+
+from app.schemas.loan import LoanBase
+from app.schemas.simulation import SimulationSummary
+from app.services.calculation_service import CalculationService
+from app.services.amortization_engine import AmortizationColumns
+
+CENT = Decimal("0.01")
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.SIMULATION_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+def shutdown_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+def simulate_chunk(chunk: List[Tuple[int, LoanBase]], include_schedule: bool) -> List[str]:
+    lines = []
+    for index, terms in chunk:
+        try:
+            columns = SimulationService.simulate(terms)
+            result = {"index": index, "summary": SimulationService.summarize(terms, columns).model_dump(mode="json")}
+            if include_schedule:
+                result["items"] = list(SimulationService.schedule_items(columns))
+        except (ValueError, ArithmeticError) as e:
+            result = {"index": index, "error": str(e)}
+        lines.append(json.dumps(result, separators=(",", ":")))
+    return lines
+
+class SimulationService:
+    
+    @staticmethod
+    def simulate(terms: LoanBase) -> AmortizationColumns:
+        return CalculationService.generate_amortization_columns(
+            principal=terms.principal.quantize(CENT, ROUND_HALF_UP),
+            annual_rate=terms.annual_rate,
+            months=terms.months,
+            start_date=SimulationService._start_date(terms),
+            payment_day=terms.payment_day,
+            payment_frequency=terms.payment_frequency,
+            insurance_monthly=terms.insurance_monthly.quantize(CENT, ROUND_HALF_UP),
+            grace_period_months=terms.grace_period_months,
+            interest_calculation_method=terms.interest_calculation_method
+        )
+    
+    @staticmethod
+    def summarize(terms: LoanBase, columns: AmortizationColumns) -> SimulationSummary:
+        totals = columns.totals()
+        return SimulationSummary(
+            monthly_payment=CalculationService.calculate_monthly_payment(
+                terms.principal.quantize(CENT, ROUND_HALF_UP),
+                terms.annual_rate,
+                terms.months,
+                terms.insurance_monthly.quantize(CENT, ROUND_HALF_UP)
+            ),
+            total_payments=len(columns),
+            total_to_pay=totals["total_to_pay"],
+            total_principal=totals["total_principal"],
+            total_interest=totals["total_interest"],
+            total_insurance=totals["total_insurance"],
+            start_date=SimulationService._start_date(terms),
+            first_payment_date=columns.due_date[0] if len(columns) else None,
+            last_payment_date=columns.due_date[-1] if len(columns) else None
+        )
+    
+    @staticmethod
+    def schedule_items(columns: AmortizationColumns) -> Iterator[Dict]:
+        money = SimulationService._money
+        for number, due_date, payment, principal, interest, insurance, balance, grace in zip(
+            columns.payment_number,
+            columns.due_date,
+            columns.scheduled_payment,
+            columns.scheduled_principal,
+            columns.scheduled_interest,
+            columns.insurance_amount,
+            columns.remaining_balance,
+            columns.is_grace_period
+        ):
+            yield {
+                "payment_number": number,
+                "due_date": due_date.isoformat(),
+                "scheduled_payment": money(payment),
+                "scheduled_principal": money(principal),
+                "scheduled_interest": money(interest),
+                "insurance_amount": money(insurance),
+                "remaining_balance": money(max(balance, 0)),
+                "is_grace_period": grace
+            }
+    
+    @staticmethod
+    def iter_json(terms: LoanBase) -> Iterator[str]:
+        columns = SimulationService.simulate(terms)
+        summary = SimulationService.summarize(terms, columns)
+        yield '{"summary":' + summary.model_dump_json() + ',"items":['
+        separator = ""
+        for item in SimulationService.schedule_items(columns):
+            yield separator + json.dumps(item, separators=(",", ":"))
+            separator = ","
+        yield "]}"
+    
+    @staticmethod
+    async def iter_batch_ndjson(items: List[LoanBase], include_schedule: bool = True) -> AsyncIterator[str]:
+        loop = asyncio.get_running_loop()
+        executor = get_executor()
+        size = settings.SIMULATION_CHUNK_SIZE
+        indexed = list(enumerate(items))
+        futures = [
+            loop.run_in_executor(executor, simulate_chunk, indexed[start:start + size], include_schedule)
+            for start in range(0, len(indexed), size)
+        ]
+        try:
+            for future in asyncio.as_completed(futures):
+                for line in await future:
+                    yield line + "\n"
+        finally:
+            for future in futures:
+                future.cancel()
+    
+    @staticmethod
+    def _start_date(terms: LoanBase) -> date:
+        return terms.start_date or date.today()
+    
+    @staticmethod
+    def _money(cents: int) -> str:
+        return str(Decimal(cents).scaleb(-2))
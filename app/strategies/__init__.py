@@ -0,0 +1,14 @@
+from app.strategies.extra_payment_strategy import ExtraPaymentStrategy, RecurringExtraPayment
+from app.strategies.reduce_term_strategy import ReduceTermStrategy
+from app.strategies.reduce_payment_strategy import ReducePaymentStrategy
+
+PREPAYMENT_STRATEGIES = {
+    ReduceTermStrategy.name: ReduceTermStrategy,
+    ReducePaymentStrategy.name: ReducePaymentStrategy
+}
+
+__all__ = [
+    "ExtraPaymentStrategy", "RecurringExtraPayment",
+    "ReduceTermStrategy", "ReducePaymentStrategy",
+    "PREPAYMENT_STRATEGIES"
+]
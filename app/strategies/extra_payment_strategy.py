@@ -0,0 +1,39 @@
+from decimal import Decimal, ROUND_HALF_UP
+from typing import List, Optional, Sequence, Tuple
+
+CENT = Decimal("0.01")
+
+
+class RecurringExtraPayment:
+    def __init__(self, amount: Decimal, start_payment_number: int = 1, end_payment_number: Optional[int] = None, every: int = 1):
+        self.amount = amount
+        self.start_payment_number = start_payment_number
+        self.end_payment_number = end_payment_number
+        self.every = every
+
+
+class ExtraPaymentStrategy:
+    def __init__(
+        self,
+        lump_sums: Sequence[Tuple[int, Decimal]] = (),
+        recurring: Sequence[RecurringExtraPayment] = ()
+    ):
+        self.lump_sums = list(lump_sums)
+        self.recurring = list(recurring)
+
+    def extra_payments(self, months: int) -> List[int]:
+        extras = [0] * months
+        for payment_number, amount in self.lump_sums:
+            if not 1 <= payment_number <= months:
+                raise ValueError(f"Lump sum payment #{payment_number} is outside the loan term (1-{months})")
+            extras[payment_number - 1] += ExtraPaymentStrategy._to_cents(amount)
+        for extra in self.recurring:
+            end = min(extra.end_payment_number or months, months)
+            cents = ExtraPaymentStrategy._to_cents(extra.amount)
+            for payment_number in range(extra.start_payment_number, end + 1, extra.every):
+                extras[payment_number - 1] += cents
+        return extras
+
+    @staticmethod
+    def _to_cents(amount: Decimal) -> int:
+        return int(Decimal(str(amount)).quantize(CENT, ROUND_HALF_UP).scaleb(2))
@@ -0,0 +1,17 @@
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Tuple
+
+CENT = Decimal("0.01")
+
+
+class ReducePaymentStrategy:
+    name = "reduce_payment"
+    reamortizes = True
+
+    @staticmethod
+    def next_installment(installment: int, balance: int, remaining_months: int, factor: Tuple[Decimal, Decimal]) -> int:
+        # Same order of operations as CalculationService._calculate_base_payment (P * num / den),
+        # so a re-amortized installment matches a fresh schedule for the remaining balance.
+        num, den = factor
+        payment = Decimal(balance).scaleb(-2) * num / den
+        return int(payment.quantize(CENT, ROUND_HALF_UP).scaleb(2))
@@ -0,0 +1,11 @@
+from decimal import Decimal
+from typing import Tuple
+
+
+class ReduceTermStrategy:
+    name = "reduce_term"
+    reamortizes = False
+
+    @staticmethod
+    def next_installment(installment: int, balance: int, remaining_months: int, factor: Tuple[Decimal, Decimal]) -> int:
+        return installment
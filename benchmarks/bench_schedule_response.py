@@ -0,0 +1,82 @@
+import time
+import tracemalloc
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+from app.schemas.amortization import AmortizationScheduleResponse, AmortizationScheduleListResponse
+from app.services.calculation_service import CalculationService
+from app.services.export_service import ExportService
+
+ROUNDS = 200
+CENT = Decimal("0.01")
+
+def build_rows(loan_id: int = 1):
+    schedule = CalculationService.generate_amortization_schedule(
+        principal=Decimal("250000.00"),
+        annual_rate=Decimal("6.5"),
+        months=600,
+        start_date=date(2024, 1, 15),
+        payment_day=15
+    )
+    rows = []
+    for id, item in enumerate(schedule, start=1):
+        rows.append((
+            id,
+            loan_id,
+            item["payment_number"],
+            item["due_date"],
+            Decimal(str(item["scheduled_payment"])).quantize(CENT),
+            Decimal(str(item["scheduled_principal"])).quantize(CENT),
+            Decimal(str(item["scheduled_interest"])).quantize(CENT),
+            Decimal(str(item["insurance_amount"])).quantize(CENT),
+            Decimal(str(item["remaining_balance"])).quantize(CENT),
+            "paid" if id <= 24 else "pending"
+        ))
+    return rows
+
+def as_objects(rows):
+    fields = ["id", "loan_id", "payment_number", "due_date", "scheduled_payment", "scheduled_principal",
+              "scheduled_interest", "insurance_amount", "remaining_balance", "status"]
+    return [SimpleNamespace(**dict(zip(fields, row))) for row in rows]
+
+def pydantic_path(objects, loan_id: int = 1) -> bytes:
+    return AmortizationScheduleListResponse(
+        items=[AmortizationScheduleResponse.model_validate(o) for o in objects],
+        total=len(objects),
+        loan_id=loan_id
+    ).model_dump_json().encode()
+
+def lean_path(rows, loan_id: int = 1) -> bytes:
+    today = date.today()
+    return ORJSONResponse({
+        "items": [ExportService.response_record(row, today) for row in rows],
+        "total": len(rows),
+        "loan_id": loan_id
+    }).body
+
+def measure(name, fn, arg):
+    fn(arg)
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn(arg)
+    elapsed_ms = (time.perf_counter() - started) * 1000 / ROUNDS
+    
+    tracemalloc.start()
+    fn(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<10} {elapsed_ms:8.3f} ms/response {peak / 1024:10.1f} KiB peak")
+    return elapsed_ms
+
+if __name__ == "__main__":
+    rows = build_rows()
+    objects = as_objects(rows)
+    assert orjson.loads(pydantic_path(objects)) == orjson.loads(lean_path(rows))
+    print(f"600-row schedule response, {ROUNDS} rounds")
+    baseline = measure("pydantic", pydantic_path, objects)
+    lean = measure("lean", lean_path, rows)
+    print(f"speedup    {baseline / lean:8.2f}x")
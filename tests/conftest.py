@@ -0,0 +1,145 @@
+import os
+
+# The app reads its settings at import time, so point it at a throwaway SQLite file first.
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+
+from contextlib import contextmanager
+from datetime import date
+from decimal import Decimal
+from typing import Iterator, List
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.database import create_tables, drop_tables, session_scope
+from app.main import app
+from app.models.amortization_schedule import AmortizationSchedule
+from app.models.loan import Loan
+from app.services.response_cache import response_cache
+
+LOAN = {
+    "name": "Casa",
+    "type": "mortgage",
+    "total_amount": "150000",
+    "down_payment": "30000",
+    "principal": "120000",
+    "annual_rate": "7.5",
+    "months": 24,
+    "start_date": "2025-01-31",
+    "payment_day": 31,
+    "status": "active"
+}
+
+# payment_number, due_date, status; every installment is 100.00 = 90.00 principal + 10.00 interest.
+SCHEDULE = [
+    (1, date(2025, 3, 1), "paid"),
+    (2, date(2025, 4, 1), "overdue"),
+    (3, date(2025, 5, 1), "partial"),
+    (4, date(2025, 7, 1), "pending")
+]
+
+
+class QueryRecorder:
+    # Listens on every engine and thread, so requests served through TestClient are counted too.
+    def __init__(self):
+        self.statements: List[str] = []
+
+    def __enter__(self) -> "QueryRecorder":
+        event.listen(Engine, "after_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(Engine, "after_cursor_execute", self._record)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.statements.append(statement)
+
+
+@pytest.fixture(autouse=True)
+def database():
+    drop_tables()
+    create_tables()
+    # SQLite reuses ids of dropped rows, so cached responses would outlive their loans.
+    response_cache.backend.delete_prefix("")
+    yield
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def db():
+    with session_scope() as db:
+        yield db
+
+
+@pytest.fixture
+def create_loan(client):
+    def create(**overrides) -> dict:
+        response = client.post("/api/loans/", json={**LOAN, **overrides})
+        assert response.status_code == 201, response.text
+        return response.json()
+
+    return create
+
+
+@pytest.fixture
+def add_loan(db):
+    """Inserts a loan and its schedule straight through the ORM, bypassing the API."""
+    def add(user_id: int = 1, schedule=SCHEDULE, **fields) -> Loan:
+        loan = Loan(
+            user_id=user_id,
+            name=fields.pop("name", "Coche"),
+            type="auto",
+            status=fields.pop("status", "active"),
+            total_amount=Decimal("360"),
+            principal=Decimal("360"),
+            annual_rate=Decimal("12"),
+            months=len(schedule),
+            late_payment_penalty_rate=Decimal("0.1"),
+            **fields
+        )
+        loan.amortization_schedule = [
+            AmortizationSchedule(
+                payment_number=number,
+                due_date=due_date,
+                scheduled_payment=Decimal("100.00"),
+                scheduled_principal=Decimal("90.00"),
+                scheduled_interest=Decimal("10.00"),
+                remaining_balance=Decimal(360 - 90 * number),
+                status=status
+            )
+            for number, due_date, status in schedule
+        ]
+        db.add(loan)
+        db.commit()
+        return loan
+
+    return add
+
+
+@pytest.fixture
+def query_budget():
+    """Fails the test when the block runs more SQL statements than allowed:
+
+        with query_budget(2):
+            client.get("/api/loans/1")
+    """
+    @contextmanager
+    def budget(max_queries: int) -> Iterator[QueryRecorder]:
+        with QueryRecorder() as recorder:
+            yield recorder
+        if recorder.count > max_queries:
+            listing = "\n".join(f"  {index}. {' '.join(statement.split())}" for index, statement in enumerate(recorder.statements, 1))
+            pytest.fail(f"{recorder.count} queries, budget is {max_queries}:\n{listing}", pytrace=False)
+
+    return budget
@@ -0,0 +1,58 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from app.services.amortization_engine import AmortizationEngine
+from app.services.calculation_service import CalculationService
+
+METHODS = ["30/360", "actual/365", "actual/360"]
+FREQUENCIES = ["monthly", "biweekly", "weekly"]
+
+
+def random_terms(seed: int, method: str, frequency: str, grace_period_months: int) -> dict:
+    rng = random.Random(seed)
+    months = rng.randint(max(grace_period_months + 1, 1), 360)
+    return {
+        "principal": Decimal(rng.randint(100000, 50000000)) / 100,
+        "annual_rate": Decimal(rng.randint(1, 3000)) / 100,
+        "months": months,
+        "start_date": date(2000, 1, 1) + timedelta(days=rng.randint(0, 12000)),
+        "payment_day": rng.randint(1, 31),
+        "payment_frequency": frequency,
+        "insurance_monthly": Decimal(rng.randint(0, 5000)) / 100,
+        "grace_period_months": grace_period_months,
+        "interest_calculation_method": method
+    }
+
+
+@pytest.mark.parametrize("grace_period_months", [0, 3])
+@pytest.mark.parametrize("frequency", FREQUENCIES)
+@pytest.mark.parametrize("method", METHODS)
+def test_engine_matches_decimal_path(method, frequency, grace_period_months):
+    for seed in range(40):
+        terms = random_terms(seed, method, frequency, grace_period_months)
+        expected = CalculationService._generate_amortization_schedule_decimal(**terms)
+        assert AmortizationEngine.generate(**terms).to_rows() == expected, terms
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_engine_matches_decimal_path_on_half_cent_ties(method):
+    # 0.005 of interest per cent of balance at 6% 30/360 lands exactly on half cents.
+    terms = {
+        "principal": Decimal("1234.50"),
+        "annual_rate": Decimal("6"),
+        "months": 24,
+        "start_date": date(2024, 1, 31),
+        "payment_day": 31,
+        "interest_calculation_method": method
+    }
+    expected = CalculationService._generate_amortization_schedule_decimal(**terms)
+    assert AmortizationEngine.generate(**terms).to_rows() == expected
+
+
+def test_engine_rejects_fractional_cents():
+    assert not AmortizationEngine.supports(Decimal("1000.001"))
+    with pytest.raises(ValueError):
+        AmortizationEngine.generate(Decimal("1000.001"), Decimal("5"), 12, date(2024, 1, 1))
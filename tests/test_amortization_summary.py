@@ -0,0 +1,31 @@
+from decimal import Decimal
+
+from app.repositories.amortization_repository import AmortizationRepository
+
+
+def test_schedule_summary_is_one_statement(db, add_loan, query_budget):
+    loan_id = add_loan().id
+    repo = AmortizationRepository(db)
+
+    with query_budget(1):
+        summary = repo.get_summary(loan_id)
+
+    assert summary == {
+        "total_payments": 4,
+        "total_to_pay": Decimal("400.00"),
+        "total_interest": Decimal("40.00"),
+        "total_principal": Decimal("360.00"),
+        "payments_made": 1,
+        "amount_paid": Decimal("100.00"),
+        "payments_pending": 3,
+        "amount_pending": Decimal("300.00")
+    }
+
+
+def test_schedule_summary_of_empty_schedule(db, add_loan):
+    loan = add_loan(schedule=[])
+
+    summary = AmortizationRepository(db).get_summary(loan.id)
+
+    assert summary["total_payments"] == 0
+    assert summary["total_to_pay"] == Decimal("0")
@@ -0,0 +1,39 @@
+import asyncio
+import inspect
+import time
+
+import httpx
+
+from app.main import app
+from app.routes import amortization, loans
+from app.services.loan_service import LoanService
+
+DELAY = 0.2
+REQUESTS = 10
+
+
+def test_loan_and_amortization_handlers_are_sync():
+    # Sync handlers run in the threadpool; an async one would block the loop on every query.
+    for router in (loans.router, amortization.router):
+        for route in router.routes:
+            assert not inspect.iscoroutinefunction(route.endpoint), route.path
+
+
+def test_blocking_handlers_run_concurrently(monkeypatch):
+    def slow_active_loans(self, user_id):
+        time.sleep(DELAY)
+        return []
+
+    monkeypatch.setattr(LoanService, "get_active_user_loans", slow_active_loans)
+
+    async def burst() -> float:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            started = time.perf_counter()
+            responses = await asyncio.gather(*(client.get("/api/loans/active") for _ in range(REQUESTS)))
+            elapsed = time.perf_counter() - started
+        assert all(response.status_code == 200 for response in responses)
+        return elapsed
+
+    # One request at a time would take REQUESTS * DELAY = 2s.
+    assert asyncio.run(burst()) < REQUESTS * DELAY / 2
@@ -0,0 +1,54 @@
+import pytest
+
+from app.repositories.pagination import InvalidCursor, decode_cursor
+from app.services.loan_service import LoanService
+
+
+def walk(client, limit: int) -> list:
+    ids = []
+    params = {"limit": limit, "include_total": False}
+    while True:
+        page = client.get("/api/loans/", params=params).json()
+        ids.extend(loan["id"] for loan in page["items"])
+        if not page["next_cursor"]:
+            return ids
+        params["cursor"] = page["next_cursor"]
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 7, 50])
+def test_cursor_walk_returns_every_loan_once(client, create_loan, limit):
+    # Loans created within the same second share created_at; only the id breaks the tie.
+    created = [create_loan(name=f"Préstamo {number}")["id"] for number in range(7)]
+
+    assert walk(client, limit) == sorted(created)
+
+
+def test_cursor_walk_skips_loans_deleted_mid_walk(client, create_loan):
+    created = [create_loan()["id"] for _ in range(5)]
+    first = client.get("/api/loans/", params={"limit": 2}).json()
+    client.delete(f"/api/loans/{first['items'][-1]['id']}")
+    client.delete(f"/api/loans/{created[3]}")
+
+    rest = client.get("/api/loans/", params={"limit": 50, "cursor": first["next_cursor"]}).json()
+
+    assert [loan["id"] for loan in rest["items"]] == [created[2], created[4]]
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "WzFd", "eyJhIjoxfQ", "WyJub3BlIiwxXQ"])
+def test_invalid_cursor_is_rejected(client, cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
+
+    response = client.get("/api/loans/", params={"cursor": cursor})
+
+    assert response.status_code == 400
+
+
+def test_other_value_errors_are_not_reported_as_bad_cursors(client, monkeypatch):
+    def broken(self, **kwargs):
+        raise ValueError("bug in the listing")
+
+    monkeypatch.setattr(LoanService, "get_all_loans", broken)
+
+    with pytest.raises(ValueError, match="bug in the listing"):
+        client.get("/api/loans/")
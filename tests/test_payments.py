@@ -0,0 +1,62 @@
+from decimal import Decimal
+
+from app.models.loan import Loan
+
+
+def post_payments(client, *payments) -> dict:
+    response = client.post("/api/payments/bulk", json={"payments": list(payments)})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def payment(loan_id: int, reference: str, amount: str) -> dict:
+    return {"loan_id": loan_id, "reference": reference, "payment_date": "2025-02-28", "amount": amount}
+
+
+def test_payments_are_applied_oldest_installment_first(client, create_loan):
+    loan = create_loan()
+    installment = Decimal(str(loan["monthly_payment"]))
+
+    result = post_payments(client, payment(loan["id"], "TRX-1", str(installment + 100)))
+
+    assert result["applied"] == 1
+    assert result["installments_paid"] == 1
+    assert result["installments_partial"] == 1
+    items = client.get(f"/api/loans/{loan['id']}/amortization/").json()["items"]
+    assert [item["status"] for item in items[:3]] == ["paid", "partial", "pending"]
+
+
+def test_replayed_references_are_duplicates(client, create_loan):
+    loan = create_loan()
+    post_payments(client, payment(loan["id"], "TRX-1", "100"))
+
+    result = post_payments(client, payment(loan["id"], "TRX-1", "100"))
+
+    assert result["duplicates"] == 1
+    assert result["applied"] == 0
+
+
+def test_payments_for_other_users_loans_are_rejected(client, create_loan, db):
+    own = create_loan()
+    foreign = Loan(
+        user_id=2,
+        name="Ajeno",
+        type="personal",
+        total_amount=Decimal("1000"),
+        principal=Decimal("1000"),
+        annual_rate=Decimal("10"),
+        months=12
+    )
+    db.add(foreign)
+    db.commit()
+
+    result = post_payments(
+        client,
+        payment(foreign.id, "TRX-FOREIGN", "100"),
+        payment(own["id"], "TRX-OWN", "100"),
+        payment(999999, "TRX-UNKNOWN", "100")
+    )
+
+    assert result["rejected"] == 2
+    assert result["applied"] == 1
+    assert result["loans_affected"] == 1
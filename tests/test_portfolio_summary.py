@@ -0,0 +1,44 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.repositories.loan_repository import LoanRepository
+
+TODAY = date(2025, 6, 15)
+
+
+@pytest.mark.parametrize("extra_loans", [0, 5])
+def test_portfolio_summary_is_one_statement(db, add_loan, query_budget, extra_loans):
+    for _ in range(extra_loans):
+        add_loan()
+    repo = LoanRepository(db)
+
+    with query_budget(1) as recorder:
+        repo.get_portfolio_summary(1, TODAY)
+
+    assert recorder.count == 1
+
+
+def test_portfolio_summary_totals(db, add_loan):
+    loan = add_loan()
+    empty = add_loan(schedule=[], name="Sin cuotas")
+    add_loan(user_id=2)
+    add_loan(status="closed")
+    add_loan(is_deleted=True)
+
+    rows = LoanRepository(db).get_portfolio_summary(1, TODAY)
+
+    assert [row["loan_id"] for row in rows] == [loan.id, empty.id]
+    first, second = rows
+    assert first["outstanding_balance"] == Decimal("270.00")
+    assert first["next_payment_number"] == 2
+    assert first["next_due_date"] == date(2025, 4, 1)
+    assert first["next_due_amount"] == Decimal("100.00")
+    assert first["overdue_payments"] == 2
+    assert first["overdue_amount"] == Decimal("200.00")
+    # 100.00 * 0.1% per day: 75 days late on #2, 45 days late on #3.
+    assert first["accrued_penalties"] == Decimal("12.00")
+    assert second["outstanding_balance"] == Decimal("0")
+    assert second["next_payment_number"] is None
+    assert second["overdue_payments"] == 0
@@ -0,0 +1,221 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from app.schemas.loan import LoanBase
+from app.schemas.prepayment import PrepaymentScenario, PrepaymentLumpSum, PrepaymentRecurring
+from app.services import prepayment_service
+from app.services.prepayment_service import PrepaymentService
+from app.services.simulation_service import SimulationService
+
+METHODS = ["30/360", "actual/365", "actual/360"]
+FREQUENCIES = ["monthly", "biweekly", "weekly"]
+STRATEGIES = ["reduce_term", "reduce_payment"]
+
+
+def loan_terms(**overrides) -> LoanBase:
+    terms = {
+        "name": "Auto",
+        "type": "auto",
+        "total_amount": Decimal("20000"),
+        "principal": Decimal("20000"),
+        "annual_rate": Decimal("8"),
+        "months": 60,
+        "start_date": date(2025, 1, 15),
+        "payment_day": 15
+    }
+    terms.update(overrides)
+    if "principal" in overrides and "total_amount" not in overrides:
+        terms["total_amount"] = terms["principal"]
+    return LoanBase(**terms)
+
+
+def random_terms(seed: int, method: str, frequency: str) -> LoanBase:
+    rng = random.Random(seed)
+    principal = Decimal(rng.randint(100000, 50000000)) / 100
+    months = rng.randint(2, 360)
+    return loan_terms(
+        principal=principal,
+        annual_rate=Decimal(rng.randint(1, 3000)) / 100,
+        months=months,
+        start_date=date(2000, 1, 1) + timedelta(days=rng.randint(0, 12000)),
+        payment_day=rng.randint(1, 31),
+        payment_frequency=frequency,
+        insurance_monthly=Decimal(rng.randint(0, 5000)) / 100,
+        grace_period_months=rng.choice([0, 0, min(3, months - 1)]),
+        interest_calculation_method=method
+    )
+
+
+@pytest.mark.parametrize("frequency", FREQUENCIES)
+@pytest.mark.parametrize("method", METHODS)
+def test_empty_scenario_matches_simulated_schedule(method, frequency):
+    for seed in range(25):
+        terms = random_terms(seed, method, frequency)
+        totals = SimulationService.simulate(terms).totals()
+        comparison = PrepaymentService.compare(
+            terms, [PrepaymentScenario(strategy=strategy) for strategy in STRATEGIES]
+        )
+        for result in [comparison.base] + comparison.scenarios:
+            assert result.payoff_payment_number == terms.months, terms
+            assert result.payments_saved == 0, terms
+            assert result.total_to_pay == totals["total_to_pay"], terms
+            assert result.total_interest == totals["total_interest"], terms
+            assert result.interest_saved == 0, terms
+
+
+def test_review_example_base_matches_simulation():
+    terms = loan_terms(payment_frequency="biweekly", interest_calculation_method="actual/365")
+    comparison = PrepaymentService.compare(terms, [PrepaymentScenario()])
+
+    assert comparison.base.payoff_payment_number == 60
+    assert comparison.base.total_to_pay == SimulationService.simulate(terms).totals()["total_to_pay"]
+    assert comparison.scenarios[0].payments_saved == 0
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_reduce_term_shortens_and_reduce_payment_lowers_installment(method):
+    terms = loan_terms(interest_calculation_method=method)
+    lump_sum = [PrepaymentLumpSum(payment_number=12, amount=Decimal("5000"))]
+    comparison = PrepaymentService.compare(terms, [
+        PrepaymentScenario(name="term", strategy="reduce_term", lump_sums=lump_sum),
+        PrepaymentScenario(name="payment", strategy="reduce_payment", lump_sums=lump_sum)
+    ])
+    base = comparison.base
+    term, payment = comparison.scenarios
+
+    assert term.payoff_payment_number < base.payoff_payment_number
+    assert term.payments_saved == base.payoff_payment_number - term.payoff_payment_number
+    assert term.final_monthly_payment == base.monthly_payment
+
+    assert payment.payoff_payment_number == base.payoff_payment_number
+    assert payment.payments_saved == 0
+    assert payment.final_monthly_payment < base.monthly_payment
+
+    for result in (term, payment):
+        assert result.total_extra == Decimal("5000.00")
+        assert result.interest_saved == base.total_interest - result.total_interest
+        assert Decimal("0") < result.interest_saved
+    assert payment.interest_saved < term.interest_saved
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_recurring_and_lump_sum_extras_conserve_principal(strategy):
+    terms = loan_terms(
+        insurance_monthly=Decimal("12.50"),
+        payment_frequency="biweekly",
+        interest_calculation_method="actual/360"
+    )
+    comparison = PrepaymentService.compare(terms, [
+        PrepaymentScenario(
+            strategy=strategy,
+            lump_sums=[PrepaymentLumpSum(payment_number=3, amount=Decimal("1000"))],
+            recurring=[PrepaymentRecurring(amount=Decimal("150"), start_payment_number=6, every=2)]
+        )
+    ])
+    result = comparison.scenarios[0]
+    insurance = SimulationService.simulate(terms).insurance_amount[0]
+
+    assert Decimal("1000") < result.total_extra
+    assert result.total_interest < comparison.base.total_interest
+    assert result.total_to_pay == (
+        terms.principal + result.total_interest + Decimal(insurance * result.payoff_payment_number).scaleb(-2)
+    )
+
+
+def test_extra_covering_the_balance_ends_the_loan():
+    terms = loan_terms(months=24)
+    comparison = PrepaymentService.compare(terms, [
+        PrepaymentScenario(lump_sums=[PrepaymentLumpSum(payment_number=5, amount=Decimal("100000"))])
+    ])
+    result = comparison.scenarios[0]
+
+    assert result.payoff_payment_number == 5
+    assert result.payments_saved == 19
+    assert result.total_extra < terms.principal
+
+
+@pytest.mark.parametrize("frequency", FREQUENCIES)
+@pytest.mark.parametrize("method", METHODS)
+def test_vectorized_matches_python_path(monkeypatch, method, frequency):
+    if prepayment_service.np is None:
+        pytest.skip("NumPy is not installed")
+
+    rng = random.Random(7)
+    for seed in range(10):
+        terms = random_terms(seed, method, frequency)
+        scenarios = [PrepaymentScenario()] + [
+            PrepaymentScenario(
+                strategy=rng.choice(STRATEGIES),
+                lump_sums=[
+                    PrepaymentLumpSum(
+                        payment_number=rng.randint(1, terms.months),
+                        amount=Decimal(rng.randint(100, int(terms.principal * 100) // 4)) / 100
+                    )
+                ],
+                recurring=[
+                    PrepaymentRecurring(
+                        amount=Decimal(rng.randint(100, 100000)) / 100,
+                        start_payment_number=rng.randint(1, terms.months),
+                        every=rng.randint(1, 6)
+                    )
+                ]
+            )
+            for _ in range(8)
+        ]
+        vectorized = PrepaymentService.compare(terms, scenarios)
+        with monkeypatch.context() as patch:
+            patch.setattr(prepayment_service, "np", None)
+            pure = PrepaymentService.compare(terms, scenarios)
+        assert vectorized == pure, terms
+
+
+def test_prepayments_endpoint(client):
+    loan = {
+        "name": "Auto",
+        "type": "auto",
+        "total_amount": "20000",
+        "principal": "20000",
+        "annual_rate": "8",
+        "months": 60,
+        "start_date": "2025-01-15",
+        "payment_day": 15,
+        "payment_frequency": "biweekly",
+        "interest_calculation_method": "actual/365"
+    }
+    response = client.post("/api/simulate/prepayments", json={
+        "loan": loan,
+        "scenarios": [
+            {"name": "Bono", "lump_sums": [{"payment_number": 10, "amount": "3000"}]},
+            {"name": "Cuota", "strategy": "reduce_payment", "lump_sums": [{"payment_number": 10, "amount": "3000"}]}
+        ]
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    totals = SimulationService.simulate(LoanBase(**loan)).totals()
+    assert Decimal(body["base"]["total_to_pay"]) == totals["total_to_pay"]
+    assert body["base"]["payments_saved"] == 0
+    assert [scenario["name"] for scenario in body["scenarios"]] == ["Bono", "Cuota"]
+    term, payment = body["scenarios"]
+    assert term["payments_saved"] == 60 - term["payoff_payment_number"]
+    assert payment["payments_saved"] < term["payments_saved"]
+    assert Decimal(payment["final_monthly_payment"]) < Decimal(body["base"]["monthly_payment"])
+
+
+def test_prepayments_endpoint_rejects_extra_outside_term(client):
+    response = client.post("/api/simulate/prepayments", json={
+        "loan": {
+            "name": "Auto",
+            "type": "auto",
+            "total_amount": "20000",
+            "principal": "20000",
+            "annual_rate": "8",
+            "months": 12
+        },
+        "scenarios": [{"lump_sums": [{"payment_number": 13, "amount": "100"}]}]
+    })
+
+    assert response.status_code == 400
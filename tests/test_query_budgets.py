@@ -0,0 +1,61 @@
+import pytest
+
+# Budgets are for a cold response cache; they must not grow with the number of loans.
+READ_BUDGETS = [
+    ("/api/loans/", 2),
+    ("/api/loans/?include_total=false", 1),
+    ("/api/loans/active", 1),
+    ("/api/loans/{loan_id}", 2),
+    ("/api/loans/{loan_id}/amortization/", 2),
+    ("/api/loans/{loan_id}/amortization/summary", 2),
+    ("/api/loans/{loan_id}/amortization/pending", 2),
+    ("/api/portfolio/summary", 1),
+    ("/api/exports/amortization?format=ndjson", 1),
+    ("/api/exports/amortization?format=csv", 1)
+]
+
+
+@pytest.mark.parametrize("loans", [1, 10])
+@pytest.mark.parametrize("path, budget", READ_BUDGETS)
+def test_read_endpoint_budget(client, create_loan, query_budget, path, budget, loans):
+    loan_id = [create_loan()["id"] for _ in range(loans)][0]
+
+    with query_budget(budget):
+        response = client.get(path.format(loan_id=loan_id))
+
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("path", ["/api/loans/{loan_id}", "/api/loans/{loan_id}/amortization/"])
+def test_conditional_get_budget(client, create_loan, query_budget, path):
+    path = path.format(loan_id=create_loan()["id"])
+    etag = client.get(path).headers["etag"]
+
+    with query_budget(1):
+        response = client.get(path, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize("method, path, body, budget", [
+    ("patch", "/api/loans/{loan_id}", {"name": "Piso"}, 3),
+    ("patch", "/api/loans/{loan_id}", {"annual_rate": "6"}, 5),
+    ("delete", "/api/loans/{loan_id}", None, 2)
+])
+def test_write_endpoint_budget(client, create_loan, query_budget, method, path, body, budget):
+    loan_id = create_loan()["id"]
+
+    with query_budget(budget):
+        response = client.request(method, path.format(loan_id=loan_id), json=body)
+
+    assert response.status_code < 300
+
+
+def test_restore_budget(client, create_loan, query_budget):
+    loan_id = create_loan()["id"]
+    client.delete(f"/api/loans/{loan_id}")
+
+    with query_budget(3):
+        response = client.post(f"/api/loans/{loan_id}/restore")
+
+    assert response.status_code == 200
@@ -0,0 +1,89 @@
+from datetime import date, timedelta
+from typing import Callable, List
+
+import pytest
+from sqlalchemy import event
+
+from app.repositories.amortization_repository import AmortizationRepository
+from app.repositories.loan_repository import LoanRepository
+
+# 36 monthly installments, the first 20 paid, so status filters have something to skip.
+SCHEDULE = [
+    (number, date(2023, 1, 1) + timedelta(days=30 * (number - 1)), "paid" if number <= 20 else "pending")
+    for number in range(1, 37)
+]
+
+
+@pytest.fixture
+def seeded(add_loan):
+    loans = [add_loan(user_id=user_id, schedule=SCHEDULE) for user_id in range(1, 5) for _ in range(10)]
+    return loans[0].id
+
+
+def query_plans(db, call: Callable) -> List[str]:
+    """Runs call, then EXPLAINs every SELECT it issued with the parameters it bound."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    connection = db.connection()
+    if connection.dialect.name == "postgresql":
+        # Seeded tables are tiny; without this PostgreSQL would rightly prefer a seq scan.
+        connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        prefix = "EXPLAIN "
+    else:
+        prefix = "EXPLAIN QUERY PLAN "
+    return [
+        "\n".join(str(row[-1]) for row in connection.exec_driver_sql(prefix + statement, parameters))
+        for statement, parameters in statements
+    ]
+
+
+def test_payment_number_lookup_uses_its_unique_index(db, seeded):
+    repo = AmortizationRepository(db)
+
+    plans = query_plans(db, lambda: repo.get_by_payment_number(seeded, 5))
+
+    assert "ix_amortization_schedule_loan_id_payment_number" in plans[0]
+
+
+@pytest.mark.parametrize("method", ["get_pending", "get_overdue"])
+def test_pending_and_overdue_use_the_status_index(db, seeded, method):
+    repo = AmortizationRepository(db)
+
+    plans = query_plans(db, lambda: getattr(repo, method)(seeded))
+
+    assert "ix_amortization_schedule_loan_id_status_due_date" in plans[0]
+
+
+def test_overdue_sweep_uses_the_partial_unpaid_index(db, seeded):
+    repo = AmortizationRepository(db)
+
+    plans = query_plans(db, lambda: repo.mark_overdue_chunk(date(2025, 6, 15), 100))
+
+    assert "ix_amortization_schedule_unpaid_due_date" in plans[0]
+
+
+def test_active_loan_listing_uses_the_user_status_index(db, seeded):
+    repo = LoanRepository(db)
+
+    plans = query_plans(db, lambda: repo.get_active_by_user(2))
+
+    assert "ix_loans_user_id_is_deleted_status" in plans[0]
+
+
+def test_keyset_page_walks_the_user_creation_index(db, seeded):
+    repo = LoanRepository(db)
+
+    plans = query_plans(db, lambda: repo.get_page(10, user_id=2))
+
+    assert "ix_loans_user_id_created_at_id" in plans[0]
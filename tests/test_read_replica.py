@@ -0,0 +1,92 @@
+import time
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import database
+from app.dependencies import get_current_user
+from app.main import app
+from app.models.loan import Loan
+
+WINDOW_SECONDS = 0.5
+
+
+@pytest.fixture
+def replica(tmp_path, monkeypatch):
+    """Points reads at a second SQLite file that never receives the primary's writes,
+    so every response shows which database served it."""
+    url = f"sqlite:///{tmp_path / 'replica.db'}"
+    replica_engine = create_engine(url, **database.engine_options(url))
+    database.Base.metadata.create_all(bind=replica_engine)
+    monkeypatch.setattr(database, "replica_engine", replica_engine)
+    monkeypatch.setattr(
+        database, "ReadSessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    )
+    monkeypatch.setattr(database, "recent_writes", database.RecentWrites(WINDOW_SECONDS))
+
+    with sessionmaker(bind=replica_engine)() as db:
+        for user_id in (1, 2):
+            db.add(Loan(
+                user_id=user_id,
+                name=f"Réplica {user_id}",
+                type="auto",
+                status="active",
+                total_amount=Decimal("1000"),
+                principal=Decimal("1000"),
+                annual_rate=Decimal("5"),
+                months=12
+            ))
+        db.commit()
+    yield replica_engine
+    replica_engine.dispose()
+
+
+@pytest.fixture
+def as_user():
+    def switch(user_id: int) -> None:
+        class User:
+            id = user_id
+            email = f"user{user_id}@example.com"
+        app.dependency_overrides[get_current_user] = lambda: User()
+
+    yield switch
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def loan_names(client) -> list:
+    response = client.get("/api/loans/")
+    assert response.status_code == 200, response.text
+    return [loan["name"] for loan in response.json()["items"]]
+
+
+def test_get_routes_read_from_the_replica(client, replica):
+    assert loan_names(client) == ["Réplica 1"]
+    assert [loan["name"] for loan in client.get("/api/loans/active").json()] == ["Réplica 1"]
+
+
+def test_writer_reads_the_primary_until_the_window_passes(client, replica, create_loan):
+    create_loan(name="Recién creado")
+
+    assert loan_names(client) == ["Recién creado"]
+
+    time.sleep(WINDOW_SECONDS + 0.1)
+    assert loan_names(client) == ["Réplica 1"]
+
+
+def test_other_users_keep_reading_the_replica(client, replica, create_loan, as_user):
+    create_loan(name="Recién creado")
+
+    as_user(2)
+    assert loan_names(client) == ["Réplica 2"]
+
+    as_user(1)
+    assert loan_names(client) == ["Recién creado"]
+
+
+def test_without_replica_reads_use_the_primary(client, create_loan):
+    create_loan(name="Primario")
+
+    assert database.replica_engine is database.engine
+    assert loan_names(client) == ["Primario"]
@@ -0,0 +1,134 @@
+from concurrent.futures import Future
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import update
+
+from app.config import settings
+from app.database import session_scope
+from app.models.amortization_schedule import AmortizationSchedule
+from app.models.loan import Loan
+from app.services import repricing_service
+
+
+class InlineExecutor:
+    # Runs worker batches in-process; before_submit lets a test change the database
+    # while the plans are "in flight".
+    def __init__(self, before_submit=None):
+        self.before_submit = before_submit
+
+    def submit(self, fn, *args):
+        if self.before_submit is not None:
+            self.before_submit()
+            self.before_submit = None
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+@pytest.fixture(autouse=True)
+def rate_admin(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_ADMIN_ENABLED", True)
+
+
+@pytest.fixture
+def rate_index(client):
+    index = client.post("/api/rates/indexes", json={"code": "EURIBOR12M", "name": "Euríbor 12 meses"}).json()
+
+    def publish(value: str) -> int:
+        response = client.post(
+            f"/api/rates/indexes/{index['id']}/values",
+            json={"effective_date": "2025-01-01", "value": value, "reprice": False}
+        )
+        assert response.status_code == 201, response.text
+        return index["id"]
+
+    return publish
+
+
+def reprice(client, index_id: int, monkeypatch, before_submit=None) -> dict:
+    monkeypatch.setattr(repricing_service, "get_executor", lambda: InlineExecutor(before_submit))
+    response = client.post(f"/api/rates/indexes/{index_id}/reprice", params={"as_of": "2025-06-01"})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def variable_loan(create_loan, index_id: int, margin: str) -> dict:
+    return create_loan(rate_type="variable", rate_index_id=index_id, rate_margin=margin)
+
+
+def test_reprice_applies_index_plus_margin(client, create_loan, rate_index, monkeypatch):
+    index_id = rate_index("3.25")
+    loan = variable_loan(create_loan, index_id, "1.5")
+
+    result = reprice(client, index_id, monkeypatch)
+
+    assert result["loans_repriced"] == 1
+    assert Decimal(client.get(f"/api/loans/{loan['id']}").json()["annual_rate"]) == Decimal("4.75")
+    assert reprice(client, index_id, monkeypatch)["loans_repriced"] == 0
+
+
+def test_negative_rate_is_clamped_and_not_reselected(client, create_loan, rate_index, monkeypatch):
+    index_id = rate_index("-3")
+    loan = variable_loan(create_loan, index_id, "1")
+
+    result = reprice(client, index_id, monkeypatch)
+
+    assert result["loans_repriced"] == 1
+    assert result["rates_clamped"] == 1
+    response = client.get(f"/api/loans/{loan['id']}")
+    assert response.status_code == 200
+    assert Decimal(response.json()["annual_rate"]) == Decimal("0.0001")
+    assert reprice(client, index_id, monkeypatch)["loans_repriced"] == 0
+
+
+def test_loan_changed_while_repricing_is_skipped(client, create_loan, rate_index, monkeypatch):
+    index_id = rate_index("5")
+    loan = variable_loan(create_loan, index_id, "1")
+
+    def pay_first_installment():
+        # Same writes as payment ingestion: settle a row and bump the loan's version.
+        with session_scope() as db:
+            db.execute(
+                update(AmortizationSchedule)
+                .where(AmortizationSchedule.loan_id == loan["id"], AmortizationSchedule.payment_number == 1)
+                .values(status="paid", paid_amount=AmortizationSchedule.scheduled_payment)
+            )
+            db.execute(update(Loan).where(Loan.id == loan["id"]).values(schedule_version=Loan.schedule_version + 1))
+            db.commit()
+
+    before = client.get(f"/api/loans/{loan['id']}/amortization/").json()["items"]
+    result = reprice(client, index_id, monkeypatch, before_submit=pay_first_installment)
+
+    assert result["loans_repriced"] == 0
+    assert result["skipped_stale"] == 1
+    after = client.get(f"/api/loans/{loan['id']}/amortization/").json()["items"]
+    assert after[0]["status"] == "paid"
+    assert [row["scheduled_payment"] for row in after] == [row["scheduled_payment"] for row in before]
+    assert Decimal(client.get(f"/api/loans/{loan['id']}").json()["annual_rate"]) == Decimal("7.5")
+
+    result = reprice(client, index_id, monkeypatch)
+    assert result["loans_repriced"] == 1
+    after = client.get(f"/api/loans/{loan['id']}/amortization/").json()["items"]
+    # The settled installment keeps its amounts; only the tail is re-amortized at 6%.
+    amounts = ("scheduled_payment", "scheduled_interest", "remaining_balance")
+    assert [after[0][key] for key in amounts] == [before[0][key] for key in amounts]
+    assert after[1]["scheduled_interest"] < before[1]["scheduled_interest"]
+
+
+def test_rate_writes_are_forbidden_unless_enabled(client, rate_index, monkeypatch):
+    index_id = rate_index("3")
+    monkeypatch.setattr(settings, "RATE_ADMIN_ENABLED", False)
+
+    writes = [
+        client.post("/api/rates/indexes", json={"code": "SOFR", "name": "SOFR"}),
+        client.post(
+            f"/api/rates/indexes/{index_id}/values",
+            json={"effective_date": "2025-02-01", "value": "4", "reprice": False}
+        ),
+        client.post(f"/api/rates/indexes/{index_id}/reprice")
+    ]
+
+    assert [response.status_code for response in writes] == [403, 403, 403]
+    assert [index["code"] for index in client.get("/api/rates/indexes").json()] == ["EURIBOR12M"]
+    assert len(client.get(f"/api/rates/indexes/{index_id}/values").json()) == 1
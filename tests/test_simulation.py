@@ -0,0 +1,177 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.config import settings
+from app.services import simulation_service
+from app.services.calculation_service import CalculationService
+
+TERMS = [
+    {"principal": "120000", "annual_rate": "7.5", "months": 24, "start_date": "2025-01-31", "payment_day": 31},
+    {
+        "principal": "20000",
+        "annual_rate": "8",
+        "months": 60,
+        "start_date": "2025-01-15",
+        "payment_day": 15,
+        "payment_frequency": "biweekly",
+        "interest_calculation_method": "actual/365",
+        "insurance_monthly": "12.5"
+    },
+    {
+        "principal": "35000.55",
+        "annual_rate": "11.25",
+        "months": 36,
+        "start_date": "2024-02-29",
+        "payment_day": 29,
+        "payment_frequency": "weekly",
+        "interest_calculation_method": "actual/360",
+        "grace_period_months": 3
+    }
+]
+
+# Due dates run past year 9999, so the engine fails for this item only.
+OUT_OF_RANGE = {"principal": "1000", "annual_rate": "5", "months": 600, "start_date": "9999-06-01"}
+
+
+def loan(**terms) -> dict:
+    return {"name": "Simulación", "type": "personal", "total_amount": terms["principal"], **terms}
+
+
+def expected_schedule(terms: dict) -> list:
+    return CalculationService.generate_amortization_schedule(
+        principal=Decimal(terms["principal"]),
+        annual_rate=Decimal(terms["annual_rate"]),
+        months=terms["months"],
+        start_date=date.fromisoformat(terms["start_date"]),
+        payment_day=terms["payment_day"],
+        payment_frequency=terms.get("payment_frequency", "monthly"),
+        insurance_monthly=Decimal(terms.get("insurance_monthly", "0")),
+        grace_period_months=terms.get("grace_period_months", 0),
+        interest_calculation_method=terms.get("interest_calculation_method", "30/360")
+    )
+
+
+def assert_matches_calculation_service(terms: dict, summary: dict, items=None) -> None:
+    rows = expected_schedule(terms)
+
+    def total(key: str) -> Decimal:
+        return sum((Decimal(str(row[key])) for row in rows), Decimal("0"))
+
+    assert summary["total_payments"] == len(rows)
+    assert Decimal(summary["total_to_pay"]) == total("scheduled_payment")
+    assert Decimal(summary["total_principal"]) == total("scheduled_principal")
+    assert Decimal(summary["total_interest"]) == total("scheduled_interest")
+    assert Decimal(summary["total_insurance"]) == total("insurance_amount")
+    assert Decimal(summary["monthly_payment"]) == CalculationService.calculate_monthly_payment(
+        Decimal(terms["principal"]),
+        Decimal(terms["annual_rate"]),
+        terms["months"],
+        Decimal(terms.get("insurance_monthly", "0"))
+    )
+    assert summary["last_payment_date"] == rows[-1]["due_date"].isoformat()
+    if items is not None:
+        assert [
+            (item["payment_number"], item["due_date"], Decimal(item["scheduled_payment"]), Decimal(item["scheduled_interest"]))
+            for item in items
+        ] == [
+            (row["payment_number"], row["due_date"].isoformat(), Decimal(str(row["scheduled_payment"])), Decimal(str(row["scheduled_interest"])))
+            for row in rows
+        ]
+
+
+def batch_lines(response) -> list:
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    return sorted(lines, key=lambda line: line["index"])
+
+
+@pytest.fixture
+def thread_pool(monkeypatch):
+    # Same fan-out and chunking as the process pool, without spawning interpreters.
+    executor = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(simulation_service, "get_executor", lambda: executor)
+    monkeypatch.setattr(settings, "SIMULATION_CHUNK_SIZE", 2)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+@pytest.mark.parametrize("terms", TERMS)
+def test_simulate_streams_the_calculation_service_schedule(client, terms):
+    response = client.post("/api/simulate", json=loan(**terms))
+
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("application/json")
+    body = response.json()
+    assert_matches_calculation_service(terms, body["summary"], body["items"])
+
+
+def test_simulate_rejects_invalid_terms(client):
+    response = client.post("/api/simulate", json=loan(**{**TERMS[0], "months": 0}))
+
+    assert response.status_code == 422
+
+
+def test_batch_streams_one_line_per_item(client, thread_pool):
+    items = [loan(**terms) for terms in TERMS * 2]
+
+    lines = batch_lines(client.post("/api/simulate/batch", json={"items": items}))
+
+    assert [line["index"] for line in lines] == list(range(len(items)))
+    for line, terms in zip(lines, TERMS * 2):
+        assert "error" not in line
+        assert_matches_calculation_service(terms, line["summary"], line["items"])
+
+
+def test_batch_can_omit_schedules(client, thread_pool):
+    lines = batch_lines(client.post(
+        "/api/simulate/batch",
+        json={"items": [loan(**terms) for terms in TERMS], "include_schedule": False}
+    ))
+
+    assert all("items" not in line for line in lines)
+    for line, terms in zip(lines, TERMS):
+        assert_matches_calculation_service(terms, line["summary"])
+
+
+def test_batch_reports_errors_per_item(client, thread_pool):
+    items = [loan(**TERMS[0]), loan(**OUT_OF_RANGE), loan(**TERMS[1])]
+
+    lines = batch_lines(client.post("/api/simulate/batch", json={"items": items}))
+
+    assert [sorted(line) for line in lines] == [
+        ["index", "items", "summary"],
+        ["error", "index"],
+        ["index", "items", "summary"]
+    ]
+    assert "out of range" in lines[1]["error"]
+    assert_matches_calculation_service(TERMS[1], lines[2]["summary"], lines[2]["items"])
+
+
+def test_batch_enforces_the_item_limit(client, thread_pool):
+    item = loan(**{**TERMS[0], "months": 1})
+
+    too_many = client.post("/api/simulate/batch", json={"items": [item] * (settings.SIMULATION_BATCH_MAX_ITEMS + 1)})
+    empty = client.post("/api/simulate/batch", json={"items": []})
+
+    assert too_many.status_code == 422
+    assert empty.status_code == 422
+
+
+def test_batch_runs_on_the_spawned_process_pool(client, monkeypatch):
+    monkeypatch.setattr(settings, "SIMULATION_WORKERS", 1)
+    simulation_service.shutdown_executor()
+    try:
+        lines = batch_lines(client.post(
+            "/api/simulate/batch",
+            json={"items": [loan(**TERMS[1]), loan(**OUT_OF_RANGE)], "include_schedule": False}
+        ))
+    finally:
+        simulation_service.shutdown_executor()
+
+    assert_matches_calculation_service(TERMS[1], lines[0]["summary"])
+    assert "error" in lines[1]